@@ -1,14 +1,36 @@
+import time
+_BASLANGIC = time.perf_counter()
+
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from PIL import Image, ImageTk
 import numpy as np
-import tensorflow as tf
-from tensorflow.keras.models import load_model
+import io
 import os
+import argparse
+from onisleme import goruntu_onisle
+from arka_plan import ArkaPlanIscisi
+from coklu_siniflandirma import CokluSiniflandirmaPenceresi
+from cikarim import (arka_uc_olustur, arka_uc_argumanlari, arka_uc_secenekleri, bagimliliklari_yukle, onbellek_eki,
+                     sinif_isimleri_yukle)
+from model_paketi import varsayilan_model
+from tahmin_onbellegi import icerik_ozeti, onbellek_ac
+import olcum
+
+# Keras (.h5, hızlı .npz) veya TFLite (.tflite) modeli kullanılabilir
+MODEL_PATH = os.environ.get("PIRINC_MODEL") or varsayilan_model()
+
+# Tahmin önbelleği (SQLite dosyası); boşsa kapalı. Toplu araç ve sunucu aynı dosyayı kullanabilir
+CACHE_PATH = os.environ.get("PIRINC_ONBELLEK", "")
 
 class PirincSiniflandirmaApp:
-    def __init__(self, root):
+    def __init__(self, root, model_path=MODEL_PATH, measure_startup=False, backend_options=None):
         self.root = root
+        self.model_path = model_path
+        # Topluluk, test zamanı artırma ve kademe seçenekleri (cikarim.arka_uc_secenekleri, opsiyonel)
+        self.backend_options = dict(backend_options or {})
+        self.measure_startup = measure_startup
+        self.startup_times = {}
         self.root.title("Pirinç Sınıflandırma Uygulaması")
         self.root.geometry("850x600")
         self.root.configure(bg="#FFFFFF")
@@ -25,22 +47,45 @@ class PirincSiniflandirmaApp:
         self.frame_bg_color = "#F9F9F9"  # Çerçeve arka planı
         self.text_color = "#333333"  # Metin rengi
         
-        # Model yükleme
+        # Sınıf isimlerini yükle (model arka planda yüklenir; paketteyse yalnızca başlık okunur)
         try:
-            self.model = load_model("pirinc_model.h5")
-            self.sinif_isimleri = np.load('sinif_isimleri.npy', allow_pickle=True)
+            self.sinif_isimleri = sinif_isimleri_yukle(self.model_path)
             print(f"Sınıf isimleri: {self.sinif_isimleri}")
         except Exception as e:
             messagebox.showerror("Hata", f"Model yüklenirken hata oluştu: {e}")
             self.root.destroy()
             return
         
-        # Arayüz oluştur
-        self.create_interface()
-        
         # Değişkenler
+        self.model = None
+        self.model_ready = False
+        self.prediction_cache = None
         self.current_image = None
         self.current_image_path = None
+        self.current_image_hash = None
+        self.load_job = None
+        self.classify_job = None
+        self.multi_window = None
+        
+        # Arayüz oluştur
+        self.create_interface()
+        if self.measure_startup:
+            self.root.bind("<Map>", self.on_window_mapped, add="+")
+        
+        # Pencerenin TensorFlow yüklenmeden önce çizilmesini sağla
+        self.root.update_idletasks()
+        
+        # Model işlemleri ve görüntü çözme ana iş parçacığını bloklamaması için ayrı işçilerde çalışır
+        self.model_worker = ArkaPlanIscisi(self.root)
+        self.image_worker = ArkaPlanIscisi(self.root)
+        
+        # Modeli yükle ve ilk tahmini arka planda yaparak ısıt
+        self.status_var.set("Model yükleniyor...")
+        self.model_worker.gonder(
+            self.load_and_warm_up_model,
+            basarili=self.on_model_ready,
+            hata=self.on_model_error
+        )
         
     def create_interface(self):
         # Başlık çubuğu
@@ -139,6 +184,49 @@ class PirincSiniflandirmaApp:
         )
         self.classify_button.pack(side="left")
         
+        # İptal butonu
+        self.cancel_button = tk.Button(
+            self.button_frame,
+            text="✕ İptal",
+            command=self.cancel_classification,
+            font=("Arial", 12),
+            bg="#9E9E9E",
+            fg="white",
+            relief="flat",
+            padx=15,
+            pady=8,
+            cursor="hand2",
+            state="disabled"
+        )
+        self.cancel_button.pack(side="left", padx=(10, 0))
+        
+        # Çoklu görüntü butonu
+        self.multi_button = tk.Button(
+            self.button_frame,
+            text="⊞ Çoklu",
+            command=self.open_multi_window,
+            font=("Arial", 12),
+            bg=self.secondary_button_color,
+            fg="white",
+            relief="flat",
+            padx=15,
+            pady=8,
+            cursor="hand2"
+        )
+        self.multi_button.pack(side="left", padx=(10, 0))
+        
+        # Durum etiketi
+        self.status_var = tk.StringVar()
+        self.status_label = tk.Label(
+            self.left_panel,
+            textvariable=self.status_var,
+            font=("Arial", 9),
+            bg=self.frame_bg_color,
+            fg="#757575",
+            anchor="w"
+        )
+        self.status_label.pack(fill="x", padx=20, pady=(0, 10), anchor="w")
+        
         # Sağ panel (sonuçlar)
         self.right_panel = tk.Frame(
             self.content_frame, 
@@ -241,13 +329,64 @@ class PirincSiniflandirmaApp:
             )
             bar.place(x=0, y=0, width=0, height=20)
     
-    def display_image(self, img):
-        """Görüntüyü göster"""
-        if isinstance(img, np.ndarray):  # NumPy array ise PIL Image'a dönüştür
-            img = Image.fromarray(img)
-        
-        # Görüntüyü etiketin boyutuna uyacak şekilde yeniden boyutlandır
-        w, h = img.size
+    def load_and_warm_up_model(self):
+        """TensorFlow'u içe aktar, modeli yükle ve grafiğin oluşması için boş bir tahmin yap (işçi iş parçacığında)"""
+        times = {}
+        start = time.perf_counter()
+        bagimliliklari_yukle(self.model_path)
+        times["import"] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        self.model = arka_uc_olustur(self.model_path, hizli_onbellek=True, **self.backend_options)
+        times["load"] = time.perf_counter() - start
+        
+        # Küçük girdili model varyantları için ön işleme boyutu modelden alınır
+        self.IMG_HEIGHT, self.IMG_WIDTH = self.model.girdi_boyutu
+        
+        start = time.perf_counter()
+        self.model.tahmin(np.zeros((1, self.IMG_HEIGHT, self.IMG_WIDTH, 3), dtype=np.float32))
+        times["first_predict"] = time.perf_counter() - start
+        
+        # Önbellek kayıtları model sürümüne bağlı olduğu için model yüklendikten sonra açılır
+        self.prediction_cache = onbellek_ac(
+            CACHE_PATH, self.model_path, ek=onbellek_eki(self.model)
+        )
+        return times
+    
+    def on_window_mapped(self, event):
+        """Pencerenin ilk görünme zamanını kaydet"""
+        if event.widget is self.root and "window" not in self.startup_times:
+            self.startup_times["window"] = time.perf_counter() - _BASLANGIC
+    
+    def on_model_ready(self, times):
+        """Model hazır olduğunda arayüzü güncelle"""
+        self.model_ready = True
+        if self.classify_job is None:
+            self.status_var.set("Model hazır")
+        
+        if self.measure_startup:
+            self.startup_times.update(times)
+            self.startup_times["ready"] = time.perf_counter() - _BASLANGIC
+            self.print_startup_times()
+            self.root.destroy()
+    
+    def print_startup_times(self):
+        """Başlangıç süresi dökümünü yazdır"""
+        t = self.startup_times
+        print("\nBaşlangıç süresi dökümü:")
+        print(f"  Pencere görünür:        {t.get('window', float('nan')):.3f} sn (süreç başından)")
+        print(f"  Kütüphane içe aktarma:  {t['import']:.3f} sn")
+        print(f"  Model yükleme:          {t['load']:.3f} sn ({self.model_path})")
+        print(f"  İlk tahmin:             {t['first_predict']:.3f} sn")
+        print(f"  Hazır:                  {t['ready']:.3f} sn (süreç başından)")
+    
+    def on_model_error(self, e):
+        """Model yüklenemezse kullanıcıyı bilgilendir ve uygulamayı kapat"""
+        messagebox.showerror("Hata", f"Model yüklenirken hata oluştu: {e}")
+        self.root.destroy()
+    
+    def get_frame_size(self):
+        """Görüntü çerçevesinin boyutunu döndür"""
         frame_width = self.image_frame.winfo_width()
         frame_height = self.image_frame.winfo_height()
         
@@ -256,16 +395,31 @@ class PirincSiniflandirmaApp:
             self.root.update()
             frame_width = self.image_frame.winfo_width()
             frame_height = self.image_frame.winfo_height()
-        
-        # Görüntü boyutunu çerçeveye sığacak şekilde hesapla
+        return frame_width, frame_height
+    
+    @staticmethod
+    def resize_for_display(img, frame_width, frame_height):
+        """Görüntüyü çerçeveye sığacak şekilde yeniden boyutlandır"""
+        w, h = img.size
         scale = min(frame_width/w, frame_height/h)
-        new_size = (int(w*scale), int(h*scale))
-        
-        img_resized = img.resize(new_size, Image.LANCZOS)
+        new_size = (max(1, int(w*scale)), max(1, int(h*scale)))
+        return img.resize(new_size, Image.LANCZOS)
+    
+    def show_resized_image(self, img_resized):
+        """Boyutlandırılmış görüntüyü etikette göster"""
         img_tk = ImageTk.PhotoImage(img_resized)
         
         self.image_label.configure(image=img_tk)
         self.image_label.image = img_tk  # Referansı tut
+    
+    def display_image(self, img):
+        """Görüntüyü göster"""
+        if isinstance(img, np.ndarray):  # NumPy array ise PIL Image'a dönüştür
+            img = Image.fromarray(img)
+        
+        # Görüntüyü etiketin boyutuna uyacak şekilde yeniden boyutlandır
+        frame_width, frame_height = self.get_frame_size()
+        self.show_resized_image(self.resize_for_display(img, frame_width, frame_height))
         
     def load_image(self):
         """Görüntü yükleme işlevi"""
@@ -278,76 +432,161 @@ class PirincSiniflandirmaApp:
         )
         
         if file_path:
-            try:
-                # Görüntüyü yükle
-                self.current_image = Image.open(file_path)
-                self.current_image_path = file_path
-                
-                # Dosya adını göster
-                file_name = os.path.basename(file_path)
-                self.file_path_var.set(f"Seçilen dosya: {file_name}")
-                
-                # Görüntüyü göster
-                self.display_image(self.current_image)
-                
-                # Sınıflandırma butonunu etkinleştir
-                self.classify_button.configure(state="normal")
-                
-                # Sonucu sıfırla
-                self.result_var.set("Sonuç: -")
-                
-                # Varsayılan çubukları göster
-                self.display_default_bars()
-                    
-            except Exception as e:
-                messagebox.showerror("Hata", f"Görüntü yüklenirken hata oluştu: {e}")
+            self.open_image_path(file_path)
+    
+    def open_image_path(self, file_path, predictions=None):
+        """Görüntüyü arka planda yükle; varsa önceden hesaplanmış tahmini göster"""
+        # Önceki yükleme ve sınıflandırma sonuçları artık geçersiz
+        self.image_worker.iptal(self.load_job)
+        self.cancel_classification()
+        
+        # Görüntü arka planda çözülüp boyutlandırılır
+        frame_width, frame_height = self.get_frame_size()
+        self.status_var.set("Görüntü yükleniyor...")
+        self.load_job = self.image_worker.gonder(
+            self.decode_image, file_path, frame_width, frame_height,
+            basarili=lambda result: self.on_image_loaded(result, predictions),
+            hata=self.on_image_error
+        )
+    
+    def decode_image(self, file_path, frame_width, frame_height):
+        """Görüntüyü çöz ve gösterim için boyutlandır (işçi iş parçacığında)"""
+        with olcum.bolum("goruntu.oku"):
+            with open(file_path, "rb") as f:
+                data = f.read()
+        with olcum.bolum("goruntu.coz"):
+            img = Image.open(io.BytesIO(data))
+            img.load()
+        with olcum.bolum("goruntu.gosterim_boyutlandir"):
+            img_resized = self.resize_for_display(img, frame_width, frame_height)
+        return file_path, img, img_resized, icerik_ozeti(data)
+    
+    def on_image_loaded(self, result, predictions=None):
+        """Çözülen görüntüyü göster"""
+        file_path, img, img_resized, image_hash = result
+        self.load_job = None
+        
+        # Görüntüyü yükle
+        self.current_image = img
+        self.current_image_path = file_path
+        self.current_image_hash = image_hash
+        
+        # Dosya adını göster
+        file_name = os.path.basename(file_path)
+        self.file_path_var.set(f"Seçilen dosya: {file_name}")
+        
+        # Görüntüyü göster
+        self.show_resized_image(img_resized)
+        
+        # Sınıflandırma butonunu etkinleştir
+        self.classify_button.configure(state="normal")
+        
+        # Sonucu sıfırla
+        self.result_var.set("Sonuç: -")
+        self.status_var.set("Model hazır" if self.model_ready else "Model yükleniyor...")
+        
+        # Varsayılan çubukları göster
+        self.display_default_bars()
+        
+        if predictions is not None:
+            self.show_result(predictions)
+    
+    def on_image_error(self, e):
+        """Görüntü yüklenemezse hata göster"""
+        self.load_job = None
+        self.status_var.set("")
+        messagebox.showerror("Hata", f"Görüntü yüklenirken hata oluştu: {e}")
     
     def preprocess_image(self, img):
         """Görüntüyü modelin beklediği formata dönüştür"""
-        img_resized = img.resize((self.IMG_WIDTH, self.IMG_HEIGHT))
-        img_array = np.array(img_resized)
-        
-        # RGB olduğundan emin ol
-        if len(img_array.shape) == 2:  # Gri tonlamalı ise
-            img_array = np.stack((img_array,) * 3, axis=-1)
-        elif img_array.shape[2] == 4:  # RGBA formatı ise
-            img_array = img_array[:, :, :3]
-            
-        # Normalize et
-        img_array = img_array / 255.0
+        img_array = np.empty((1, self.IMG_HEIGHT, self.IMG_WIDTH, 3), dtype=np.float32)
         
-        # Batch boyutu ekle
-        img_array = np.expand_dims(img_array, axis=0)
+        # Batch tamponuna doğrudan yaz
+        goruntu_onisle(img, self.IMG_WIDTH, self.IMG_HEIGHT, out=img_array[0])
         return img_array
     
+    def predict_image(self, img, image_hash=None):
+        """Görüntüyü ön işle ve tahmin yap (işçi iş parçacığında)"""
+        # Aynı görüntü daha önce sınıflandırıldıysa sonuç önbellekten gelir
+        if self.prediction_cache is not None and image_hash is not None:
+            cached = self.prediction_cache.al(image_hash)
+            if cached is not None:
+                olcum.sayac("onbellek.isabet")
+                return cached
+            olcum.sayac("onbellek.iskalama")
+        
+        # Görüntüyü ön işle
+        processed_image = self.preprocess_image(img)
+        
+        # Tahmin yap
+        with olcum.bolum("tahmin"):
+            predictions = self.model.tahmin(processed_image)[0]
+        if self.prediction_cache is not None and image_hash is not None:
+            self.prediction_cache.koy(image_hash, predictions)
+        return predictions
+    
     def classify_image(self):
         """Görüntüyü sınıflandır"""
         if self.current_image is None:
             messagebox.showwarning("Uyarı", "Lütfen önce bir görüntü yükleyin")
             return
         
-        try:
-            # Görüntüyü ön işle
-            processed_image = self.preprocess_image(self.current_image)
-            
-            # Tahmin yap
-            predictions = self.model.predict(processed_image, verbose=0)[0]
-            
-            # En yüksek olasılığa sahip sınıfı bul
-            predicted_class_index = np.argmax(predictions)
-            predicted_class = self.sinif_isimleri[predicted_class_index]
-            confidence = predictions[predicted_class_index] * 100
-            
-            # Sonuç etiketini güncelle
-            self.result_var.set(f"Sonuç: {predicted_class} ({confidence:.2f}%)")
-            
-            # Olasılık çubuklarını göster
-            self.show_probability_bars(predictions)
-            
-        except Exception as e:
-            messagebox.showerror("Hata", f"Sınıflandırma sırasında hata oluştu: {e}")
-            import traceback
-            print(traceback.format_exc())
+        # Model henüz yükleniyorsa görev kuyrukta modelin hazır olmasını bekler
+        self.status_var.set("Sınıflandırılıyor..." if self.model_ready else "Model yükleniyor, ardından sınıflandırılacak...")
+        self.classify_button.configure(state="disabled")
+        self.cancel_button.configure(state="normal")
+        self.classify_job = self.model_worker.gonder(
+            self.predict_image, self.current_image, self.current_image_hash,
+            basarili=self.on_classification_done,
+            hata=self.on_classification_error
+        )
+    
+    def cancel_classification(self):
+        """Devam eden sınıflandırmayı iptal et"""
+        if self.classify_job is None:
+            return
+        self.model_worker.iptal(self.classify_job)
+        self.classify_job = None
+        self.cancel_button.configure(state="disabled")
+        if self.current_image is not None:
+            self.classify_button.configure(state="normal")
+        self.status_var.set("Sınıflandırma iptal edildi")
+    
+    def on_classification_done(self, predictions):
+        """Tahmin sonuçlarını göster"""
+        self.classify_job = None
+        self.cancel_button.configure(state="disabled")
+        self.classify_button.configure(state="normal")
+        self.status_var.set("Model hazır")
+        self.show_result(predictions)
+    
+    def show_result(self, predictions):
+        """Tahmin edilen sınıfı ve olasılık çubuklarını göster"""
+        # En yüksek olasılığa sahip sınıfı bul
+        predicted_class_index = np.argmax(predictions)
+        predicted_class = self.sinif_isimleri[predicted_class_index]
+        confidence = predictions[predicted_class_index] * 100
+        
+        # Sonuç etiketini güncelle
+        self.result_var.set(f"Sonuç: {predicted_class} ({confidence:.2f}%)")
+        
+        # Olasılık çubuklarını göster
+        self.show_probability_bars(predictions)
+    
+    def open_multi_window(self):
+        """Çoklu görüntü penceresini aç"""
+        if self.multi_window is None:
+            self.multi_window = CokluSiniflandirmaPenceresi(self)
+        else:
+            self.multi_window.window.lift()
+    
+    def on_classification_error(self, e):
+        """Sınıflandırma hatasını göster"""
+        self.classify_job = None
+        self.cancel_button.configure(state="disabled")
+        self.classify_button.configure(state="normal")
+        self.status_var.set("")
+        messagebox.showerror("Hata", f"Sınıflandırma sırasında hata oluştu: {e}")
     
     def show_probability_bars(self, predictions):
         """Olasılık çubuklarını göster"""
@@ -408,6 +647,20 @@ class PirincSiniflandirmaApp:
 
 # Ana program
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pirinç sınıflandırma arayüzü")
+    parser.add_argument("--model", default=MODEL_PATH, help="Model paketi (.pirinc), Keras (.h5, hızlı .npz) veya TFLite (.tflite) modeli")
+    parser.add_argument("--baslangic-olcumu", action="store_true",
+                        help="Başlangıç süresi dökümünü yazdırıp çık")
+    parser.add_argument("--olcum", metavar="IZ_DOSYASI",
+                        help="Okuma, çözme, ön işleme ve tahmin sürelerini Chrome trace olarak kaydet")
+    arka_uc_argumanlari(parser)
+    args = parser.parse_args()
+    if args.olcum:
+        olcum.etkinlestir(args.olcum)
+    
     root = tk.Tk()
-    app = PirincSiniflandirmaApp(root)
+    app = PirincSiniflandirmaApp(
+        root, model_path=args.model, measure_startup=args.baslangic_olcumu,
+        backend_options=arka_uc_secenekleri(args)
+    )
     root.mainloop()
\ No newline at end of file
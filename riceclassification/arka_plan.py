@@ -0,0 +1,70 @@
+import queue
+import itertools
+import threading
+import traceback
+import tkinter as tk
+
+
+class ArkaPlanIscisi:
+    """Görevleri ayrı bir iş parçacığında sırayla çalıştırıp sonuçları Tk ana döngüsüne ileten işçi"""
+
+    def __init__(self, root, aralik=30):
+        self.root = root
+        self.aralik = aralik
+        self.gorevler = queue.Queue()
+        self.sonuclar = queue.Queue()
+        self._iptal_edilenler = set()
+        self._kilit = threading.Lock()
+        self._sayac = itertools.count(1)
+
+        self.is_parcacigi = threading.Thread(target=self._calis, daemon=True)
+        self.is_parcacigi.start()
+        self.root.after(self.aralik, self._kontrol_et)
+
+    def gonder(self, fonksiyon, *args, basarili=None, hata=None):
+        """Görevi kuyruğa ekle; geri çağırımlar ana iş parçacığında çalışır"""
+        is_id = next(self._sayac)
+        self.gorevler.put((is_id, fonksiyon, args, basarili, hata))
+        return is_id
+
+    def iptal(self, is_id):
+        """Görevi iptal et; başlamadıysa çalıştırılmaz, bittiyse sonucu yok sayılır"""
+        if is_id is not None:
+            with self._kilit:
+                self._iptal_edilenler.add(is_id)
+
+    def iptal_edildi_mi(self, is_id):
+        with self._kilit:
+            return is_id in self._iptal_edilenler
+
+    def _calis(self):
+        while True:
+            is_id, fonksiyon, args, basarili, hata = self.gorevler.get()
+            if self.iptal_edildi_mi(is_id):
+                with self._kilit:
+                    self._iptal_edilenler.discard(is_id)
+                continue
+            try:
+                sonuc = fonksiyon(*args)
+                self.sonuclar.put((is_id, basarili, sonuc))
+            except Exception as e:
+                print(traceback.format_exc())
+                self.sonuclar.put((is_id, hata, e))
+
+    def _kontrol_et(self):
+        """Biten görevlerin sonuçlarını root.after ile düzenli olarak işle"""
+        try:
+            while True:
+                is_id, geri_cagirim, deger = self.sonuclar.get_nowait()
+                if self.iptal_edildi_mi(is_id):
+                    with self._kilit:
+                        self._iptal_edilenler.discard(is_id)
+                elif geri_cagirim is not None:
+                    geri_cagirim(deger)
+        except queue.Empty:
+            pass
+        try:
+            self.root.after(self.aralik, self._kontrol_et)
+        except tk.TclError:
+            # Pencere kapatıldı
+            pass
@@ -0,0 +1,275 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from toplu_siniflandirma import sirali_hazirla
+from model_paketi import ModelPaketi, paketle, paket_yolu, paket_mi, varsayilan_model, PAKET_UZANTISI
+
+# Sabit değişkenler - model_egitimi.py ile aynı olmalı
+MODEL_PATH = varsayilan_model()
+SINIF_DOSYASI = "sinif_isimleri.npy"
+DATASET_PATH = "Rice_Image_Dataset"
+BATCH_SIZE = 32
+
+# Yeni veri az olduğu için tam eğitimden düşük öğrenme oranı ve az epoch yeterlidir
+OGRENME_ORANI = 1e-4
+EPOCHS = 3
+
+
+class BellekVeriSeti:
+    """Çözülmüş görüntüleri veri_onbellegi.OnbellekSequence'e verilebilecek biçimde tutar"""
+
+    def __init__(self, goruntuler, etiketler, sinif_isimleri):
+        self.goruntuler = goruntuler
+        self.etiketler = etiketler
+        self.class_indices = {sinif: i for i, sinif in enumerate(sinif_isimleri)}
+
+
+def siniflari_birlestir(eski_siniflar, yeni_siniflar):
+    """Eski sınıfların sırasını (çıkış indekslerini) koruyarak yeni sınıfları sona ekle"""
+    eklenen = [s for s in yeni_siniflar if s not in eski_siniflar]
+    return list(eski_siniflar) + eklenen, eklenen
+
+
+def cikisi_buyut(model, sinif_sayisi, seed=0):
+    """Çıkış katmanını sinif_sayisi'na büyüt; eski sınıfların ağırlıkları korunur"""
+    import tensorflow as tf
+
+    eski = model.layers[-1]
+    cekirdek, sapma = eski.get_weights()
+    if sinif_sayisi == cekirdek.shape[1]:
+        return model
+    govde = tf.keras.Model(model.inputs, model.layers[-2].output)
+    cikis = tf.keras.layers.Dense(sinif_sayisi, activation='softmax', dtype='float32', name="cikis")
+    yeni_model = tf.keras.Model(govde.inputs, cikis(govde.output))
+
+    # Yeni sütunlar eski sütunlarla aynı ölçekte rastgele, sapmaları eski sınıfların ortalaması
+    rng = np.random.default_rng(seed)
+    eklenen = sinif_sayisi - cekirdek.shape[1]
+    yeni_cekirdek = rng.normal(0, cekirdek.std(), (cekirdek.shape[0], eklenen)).astype(cekirdek.dtype)
+    cikis.set_weights([
+        np.concatenate([cekirdek, yeni_cekirdek], axis=1),
+        np.concatenate([sapma, np.full(eklenen, sapma.mean(), dtype=sapma.dtype)]),
+    ])
+    return yeni_model
+
+
+def _ornekle(rng, yollar, etiketler, indeksler, adet):
+    """Verilen indekslerden sınıflara eşit paylaştırılmış en fazla adet örnek seç"""
+    siniflar = np.unique(etiketler[indeksler])
+    siniflar = siniflar[siniflar >= 0]
+    if adet <= 0 or len(siniflar) == 0:
+        return [], []
+    sinif_basina = -(-adet // len(siniflar))
+    secilen = []
+    for sinif in siniflar:
+        aday = indeksler[etiketler[indeksler] == sinif]
+        secilen.extend(rng.choice(aday, size=min(sinif_basina, len(aday)), replace=False))
+    return [yollar[i] for i in secilen], [int(etiketler[i]) for i in secilen]
+
+
+def ornekleri_topla(yeni_dizin, dataset_path, sinif_isimleri, tekrar_orani=1.0, dogrulama_orani=0.2, seed=0):
+    """Yeni görüntüleri eğitim/doğrulama olarak böl ve eski veriden tekrar örnekleri ekle
+
+    Tekrar örnekleri eski verinin eğitim bölümünden, doğrulama için olanlar doğrulama
+    bölümünden seçilir. Her öğe (yollar, etiketler, yeni_mi) üçlüsüdür.
+    """
+    import veri_onbellegi
+
+    rng = np.random.default_rng(seed)
+    yeni_yollar, yeni_etiketler, yeni_siniflar = veri_onbellegi.veri_setini_listele(yeni_dizin)
+    # Yeni dizindeki sınıf sırası birleşik sınıf listesine eşlenir
+    yeni_etiketler = np.array([sinif_isimleri.index(yeni_siniflar[e]) for e in yeni_etiketler], dtype=np.int32)
+    sira = rng.permutation(len(yeni_yollar))
+    sinir = int(len(sira) * dogrulama_orani)
+
+    eski_yollar, eski_etiketler, eski_siniflar = veri_onbellegi.veri_setini_listele(dataset_path)
+    # Modelin bilmediği sınıflar (-1) tekrar örneklerine alınmaz
+    eski_etiketler = np.array(
+        [sinif_isimleri.index(eski_siniflar[e]) if eski_siniflar[e] in sinif_isimleri else -1 for e in eski_etiketler],
+        dtype=np.int32
+    )
+
+    bolumler = []
+    for yeni_indeksler, subset in ((sira[sinir:], 'training'), (sira[:sinir], 'validation')):
+        tekrar_yollari, tekrar_etiketleri = _ornekle(
+            rng, eski_yollar, eski_etiketler, veri_onbellegi.bolum_indeksleri(eski_etiketler, 0.2, subset),
+            int(round(len(yeni_indeksler) * tekrar_orani))
+        )
+        yollar = [yeni_yollar[i] for i in yeni_indeksler] + tekrar_yollari
+        etiketler = [int(yeni_etiketler[i]) for i in yeni_indeksler] + tekrar_etiketleri
+        yeni_mi = [True] * len(yeni_indeksler) + [False] * len(tekrar_yollari)
+        bolumler.append((yollar, np.array(etiketler, dtype=np.int32), np.array(yeni_mi, dtype=bool)))
+    return bolumler
+
+
+def goruntuleri_yukle(yollar, etiketler, yeni_mi, img_width, img_height, workers=None):
+    """Görüntüleri uint8 dizisine çöz; okunamayanlar atlanır"""
+    goruntuler = np.empty((len(yollar), img_height, img_width, 3), dtype=np.uint8)
+    gecerli = np.zeros(len(yollar), dtype=bool)
+    with ThreadPoolExecutor(workers) as havuz:
+        for i, (yol, dizi, hata, _) in enumerate(sirali_hazirla(havuz, yollar, img_width, img_height, 256)):
+            if hata is not None:
+                print(f"Atlandı: {yol}: {hata}", file=sys.stderr)
+                continue
+            goruntuler[i] = dizi
+            gecerli[i] = True
+    return goruntuler[gecerli], etiketler[gecerli], yeni_mi[gecerli]
+
+
+def dogruluk(model, goruntuler, etiketler, batch_size=256):
+    """Bellekteki görüntüler üzerinde modelin doğruluğunu hesapla"""
+    from onisleme import normalize
+
+    if len(goruntuler) == 0:
+        return float('nan')
+    dogru = 0
+    for i in range(0, len(goruntuler), batch_size):
+        olasiliklar = model.predict_on_batch(normalize(goruntuler[i:i + batch_size]))
+        dogru += int(np.sum(np.argmax(olasiliklar, axis=1) == etiketler[i:i + batch_size]))
+    return dogru / len(goruntuler)
+
+
+def _guvenli_kaydet(model, sinif_isimleri, model_yolu, sinif_dosyasi):
+    """Önceki dosyaları *_onceki olarak sakla, yenilerini geçici dosyadan yerine taşı"""
+    model_koku, model_uzantisi = os.path.splitext(model_yolu)
+    sinif_koku, _ = os.path.splitext(sinif_dosyasi)
+    # Keras biçimi uzantıdan belirlediği için geçici dosya da .h5 ile biter
+    gecici_model = f"{model_koku}.tmp{model_uzantisi}"
+    gecici_siniflar = f"{sinif_koku}.tmp.npy"
+    model.save(gecici_model, include_optimizer=False)
+    np.save(gecici_siniflar, np.array(sinif_isimleri))
+
+    for yol, onceki in ((model_yolu, f"{model_koku}_onceki{model_uzantisi}"),
+                        (sinif_dosyasi, f"{sinif_koku}_onceki.npy")):
+        if os.path.exists(yol):
+            shutil.copy2(yol, onceki)
+    # Sınıf listesi önce değişir: arada kesilirse eski model fazladan bir isimle çalışmaya devam eder
+    os.replace(gecici_siniflar, sinif_dosyasi)
+    os.replace(gecici_model, model_yolu)
+
+
+def _paketi_guvenli_kaydet(model, sinif_isimleri, paket):
+    """Önceki paketi *_onceki olarak sakla, yenisini (sınıf isimleriyle birlikte) yerine yaz"""
+    if os.path.exists(paket):
+        shutil.copy2(paket, f"{os.path.splitext(paket)[0]}_onceki{PAKET_UZANTISI}")
+    # paketle geçici dosyaya yazıp yerine taşır
+    paketle(paket, sinif_isimleri, paket, model=model)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mevcut modeli yeni etiketlenmiş görüntüler ve eski veriden tekrar örnekleriyle ince ayarla"
+    )
+    parser.add_argument("yeni", help="Sınıf alt dizinlerinde yeni etiketlenmiş görüntüler")
+    parser.add_argument("--model", default=MODEL_PATH, help="Keras (.h5, .npz) modeli veya Keras model paketi (.pirinc)")
+    parser.add_argument("--siniflar", default=SINIF_DOSYASI)
+    parser.add_argument("--veri", default=DATASET_PATH, help="Tekrar örneklerinin alınacağı eski veri seti")
+    parser.add_argument("--tekrar-orani", type=float, default=1.0,
+                        help="Yeni görüntü başına eklenecek eski görüntü sayısı (unutmayı önler)")
+    parser.add_argument("--dogrulama-orani", type=float, default=0.2)
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--ogrenme-orani", type=float, default=OGRENME_ORANI)
+    parser.add_argument("--govdeyi-dondur", action='store_true',
+                        help="Konvolüsyon katmanlarını dondur, yalnızca Dense katmanlarını eğit")
+    parser.add_argument("--veri-setine-ekle", action='store_true',
+                        help="Yeni görüntüleri sonraki tam eğitimler için veri setine kopyala")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--is-parcacigi", type=int, default=None, help="Görüntü çözme iş parçacığı sayısı")
+    args = parser.parse_args()
+    if args.model.endswith('.tflite') or (paket_mi(args.model) and ModelPaketi(args.model).tur == 'tflite'):
+        parser.error("İnce ayar için Keras modeli (.h5, .npz) veya Keras model paketi gerekli")
+
+    import tensorflow as tf
+    from tensorflow.keras.preprocessing.image import ImageDataGenerator
+    from tensorflow.keras.callbacks import EarlyStopping
+    import veri_onbellegi
+    from cikarim import KerasArkaUcu, sinif_isimleri_yukle
+
+    baslangic = time.perf_counter()
+    tf.keras.utils.set_random_seed(args.seed)
+    eski_siniflar = [str(s) for s in sinif_isimleri_yukle(args.model, args.siniflar)]
+    yeni_siniflar = sorted(
+        d for d in os.listdir(args.yeni) if os.path.isdir(os.path.join(args.yeni, d))
+    )
+    sinif_isimleri, eklenen = siniflari_birlestir(eski_siniflar, yeni_siniflar)
+    if eklenen:
+        print(f"Yeni sınıflar: {', '.join(eklenen)}")
+
+    model = KerasArkaUcu(args.model).model
+    img_height, img_width = model.input_shape[1:3]
+    egitim, dogrulama = ornekleri_topla(args.yeni, args.veri, sinif_isimleri, args.tekrar_orani,
+                                        args.dogrulama_orani, args.seed)
+    x_egitim, y_egitim, _ = goruntuleri_yukle(*egitim, img_width, img_height, args.is_parcacigi)
+    x_dogrulama, y_dogrulama, dogrulama_yeni_mi = goruntuleri_yukle(*dogrulama, img_width, img_height,
+                                                                     args.is_parcacigi)
+    if not len(x_egitim):
+        parser.error(f"{args.yeni} içinde eğitim için görüntü bulunamadı")
+    print(f"Eğitim: {int(np.sum(egitim[2]))} yeni + {int(np.sum(~egitim[2]))} tekrar, "
+          f"doğrulama: {len(x_dogrulama)} görüntü")
+
+    # Eski sınıflardaki doğruluk ince ayardan önce ve sonra karşılaştırılır (unutma kontrolü)
+    x_tekrar, y_tekrar = x_dogrulama[~dogrulama_yeni_mi], y_dogrulama[~dogrulama_yeni_mi]
+    onceki_dogruluk = dogruluk(model, x_tekrar, y_tekrar)
+
+    model = cikisi_buyut(model, len(sinif_isimleri), args.seed)
+    if args.govdeyi_dondur:
+        for katman in model.layers:
+            katman.trainable = isinstance(katman, tf.keras.layers.Dense)
+    model.compile(optimizer=tf.keras.optimizers.Adam(args.ogrenme_orani),
+                  loss='categorical_crossentropy', metrics=['accuracy'])
+
+    # model_egitimi.py'deki veri artırma ayarları
+    datagen = ImageDataGenerator(
+        rotation_range=20, width_shift_range=0.1, height_shift_range=0.1,
+        shear_range=0.1, zoom_range=0.1, horizontal_flip=True
+    )
+    egitim_verisi = veri_onbellegi.OnbellekSequence(
+        BellekVeriSeti(x_egitim, y_egitim, sinif_isimleri), np.arange(len(x_egitim)), args.batch_size,
+        datagen=datagen, seed=args.seed
+    )
+    dogrulama_verisi = None
+    if len(x_dogrulama):
+        dogrulama_verisi = veri_onbellegi.OnbellekSequence(
+            BellekVeriSeti(x_dogrulama, y_dogrulama, sinif_isimleri), np.arange(len(x_dogrulama)),
+            args.batch_size, shuffle=False
+        )
+    izlenen = 'val_loss' if dogrulama_verisi is not None else 'loss'
+    model.fit(
+        egitim_verisi, validation_data=dogrulama_verisi, epochs=args.epochs, verbose=1,
+        callbacks=[EarlyStopping(monitor=izlenen, patience=2, restore_best_weights=True)]
+    )
+
+    print(f"\nEski sınıflarda doğruluk: {onceki_dogruluk:.4f} -> {dogruluk(model, x_tekrar, y_tekrar):.4f}")
+    x_yeni, y_yeni = x_dogrulama[dogrulama_yeni_mi], y_dogrulama[dogrulama_yeni_mi]
+    print(f"Yeni görüntülerde doğruluk: {dogruluk(model, x_yeni, y_yeni):.4f}")
+
+    if paket_mi(args.model):
+        # Sınıf isimleri paketin içinde tutulur
+        _paketi_guvenli_kaydet(model, sinif_isimleri, args.model)
+        print(f"Model paketi {args.model} olarak kaydedildi (önceki *_onceki{PAKET_UZANTISI})")
+    else:
+        _guvenli_kaydet(model, sinif_isimleri, args.model, args.siniflar)
+        print(f"Model {args.model}, sınıf isimleri {args.siniflar} olarak kaydedildi (öncekiler *_onceki)")
+        paketle(args.model, sinif_isimleri, paket_yolu(args.model), model=model)
+        print(f"Model paketi güncellendi: {paket_yolu(args.model)}")
+
+    if args.veri_setine_ekle:
+        yollar, etiketler, yeni_siniflar_sirali = veri_onbellegi.veri_setini_listele(args.yeni)
+        for yol, etiket in zip(yollar, etiketler):
+            hedef_dizin = os.path.join(args.veri, yeni_siniflar_sirali[etiket])
+            os.makedirs(hedef_dizin, exist_ok=True)
+            hedef = os.path.join(hedef_dizin, os.path.basename(yol))
+            if not os.path.exists(hedef):
+                shutil.copy2(yol, hedef)
+        print(f"{len(yollar)} görüntü {args.veri} veri setine eklendi")
+
+    print(f"Toplam süre: {time.perf_counter() - baslangic:.1f} sn")
+
+
+if __name__ == "__main__":
+    main()
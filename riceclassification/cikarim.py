@@ -0,0 +1,500 @@
+import os
+import json
+import time
+import sys
+import hashlib
+import numpy as np
+from model_paketi import ModelPaketi, paket_mi, SINIF_DOSYASI
+
+# PIRINC_XLA=1 ile Keras modelleri tahmin için XLA ile derlenir
+XLA = os.environ.get("PIRINC_XLA", "0") == "1"
+
+# Kademeli çıkarımda küçük modelin kalibre güveni bunun altındaysa görüntü tam modele aktarılır
+KADEME_ESIGI = 0.9
+
+
+def _tflite_interpreter():
+    """Hafif tflite_runtime paketi varsa onu, yoksa TensorFlow'un yorumlayıcısını döndür"""
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+        Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+
+def _tflite_mi(model_yolu):
+    if paket_mi(model_yolu):
+        return ModelPaketi(model_yolu).tur == 'tflite'
+    return model_yolu.endswith('.tflite')
+
+
+def bagimliliklari_yukle(model_yolu):
+    """Arka ucun ihtiyaç duyduğu kütüphaneyi içe aktar (başlangıç süresini ayrı ölçmek için)"""
+    if _tflite_mi(model_yolu):
+        _tflite_interpreter()
+    else:
+        import tensorflow  # noqa: F401
+
+
+def hizli_onbellek_yolu(model_yolu):
+    """HDF5 modelinin hızlı biçimdeki kopyasının yolunu döndür"""
+    kok, _ = os.path.splitext(model_yolu)
+    return f"{kok}_hizli.npz"
+
+
+def hizli_kaydet(model, hedef):
+    """Modeli mimari JSON'u ve sıkıştırılmamış ağırlıklarıyla tek bir .npz dosyasına kaydet"""
+    gecici = hedef + ".tmp"
+    with open(gecici, 'wb') as f:
+        np.savez(
+            f,
+            mimari=np.array(model.to_json()),
+            **{f"w{i:03d}": w for i, w in enumerate(model.get_weights())}
+        )
+    os.replace(gecici, hedef)
+
+
+def _hizli_yukle(yol):
+    """Hızlı biçimdeki modeli h5py ve optimizer durumu olmadan yükle"""
+    import tensorflow as tf
+
+    with np.load(yol) as veri:
+        model = tf.keras.models.model_from_json(str(veri['mimari']))
+        agirlik_adlari = sorted(ad for ad in veri.files if ad != 'mimari')
+        model.set_weights([veri[ad] for ad in agirlik_adlari])
+    return model
+
+
+def _paketten_yukle(paket):
+    """Paketteki mimariyi kur; ağırlıklar bellek eşlemeli dosyadan doğrudan değişkenlere kopyalanır"""
+    import tensorflow as tf
+
+    model = tf.keras.models.model_from_json(paket.bilgi['mimari'])
+    model.set_weights(paket.agirliklar())
+    return model
+
+
+def _onisleme_denetle(paket):
+    """Paketin kaydettiği ön işleme ayarları bu sürümdekilerden farklıysa uyar"""
+    from onisleme import RESIZE_FILTER, OLCEK
+    from PIL import Image
+
+    filtre = {'nearest': Image.NEAREST, 'bilinear': Image.BILINEAR}.get(paket.onisleme.get('boyutlandirma'))
+    if filtre != RESIZE_FILTER or not np.isclose(paket.onisleme.get('olcek', 0), OLCEK):
+        print(f"Uyarı: {paket.yol} farklı ön işleme ayarlarıyla eğitilmiş ({paket.onisleme}), "
+              "tahminler güvenilir olmayabilir", file=sys.stderr)
+
+
+def sinif_isimleri_yukle(model_yolu, sinif_dosyasi=SINIF_DOSYASI):
+    """Sınıf isimlerini model paketinden, paket değilse ayrı .npy dosyasından oku"""
+    if paket_mi(model_yolu):
+        return ModelPaketi(model_yolu).sinif_isimleri
+    return np.load(sinif_dosyasi, allow_pickle=True)
+
+
+class KerasArkaUcu:
+    """Keras modeliyle tahmin yapan arka uç"""
+
+    ad = "keras"
+
+    def surum(self):
+        return _model_surumu(self)
+
+    def __init__(self, model_yolu, hizli_onbellek=False, xla=XLA, paket=None):
+        self.model_yolu = model_yolu
+        self.sinif_isimleri = None
+        if paket is not None or paket_mi(model_yolu):
+            paket = paket or ModelPaketi(model_yolu)
+            _onisleme_denetle(paket)
+            self.model = _paketten_yukle(paket)
+            self.sinif_isimleri = paket.sinif_isimleri
+        elif model_yolu.endswith('.npz'):
+            self.model = _hizli_yukle(model_yolu)
+        else:
+            onbellek_yolu = hizli_onbellek_yolu(model_yolu)
+            if (hizli_onbellek and os.path.exists(onbellek_yolu)
+                    and os.path.getmtime(onbellek_yolu) >= os.path.getmtime(model_yolu)):
+                self.model = _hizli_yukle(onbellek_yolu)
+            else:
+                from tensorflow.keras.models import load_model
+
+                # Tahmin için optimizer durumuna gerek yok
+                self.model = load_model(model_yolu, compile=False)
+                if hizli_onbellek:
+                    try:
+                        hizli_kaydet(self.model, onbellek_yolu)
+                    except OSError:
+                        pass
+        self._xla_ayarla(xla)
+        _, h, w, _ = self.model.input_shape
+        self.girdi_boyutu = (h, w)
+
+    def _xla_ayarla(self, xla):
+        self._derlenmis = None
+        if xla:
+            import tensorflow as tf
+
+            # Her yeni batch boyutu için bir kez derlenir
+            self._derlenmis = tf.function(lambda x: self.model(x, training=False), jit_compile=True)
+
+    @classmethod
+    def modelden(cls, model):
+        """Bellekteki bir Keras modelini arka uç olarak sar"""
+        arka_uc = cls.__new__(cls)
+        arka_uc.model_yolu = None
+        arka_uc.sinif_isimleri = None
+        arka_uc.model = model
+        arka_uc._xla_ayarla(False)
+        _, h, w, _ = model.input_shape
+        arka_uc.girdi_boyutu = (h, w)
+        return arka_uc
+
+    def tahmin(self, x):
+        """(n, yükseklik, genişlik, 3) float32 batch için olasılıkları döndür"""
+        if self._derlenmis is not None:
+            return self._derlenmis(x).numpy()
+        return np.asarray(self.model.predict_on_batch(x))
+
+
+class TFLiteArkaUcu:
+    """TFLite yorumlayıcısıyla (float16 veya int8 model) tahmin yapan arka uç"""
+
+    ad = "tflite"
+
+    def surum(self):
+        return _model_surumu(self)
+
+    def __init__(self, model_yolu, is_parcacigi=None, paket=None):
+        self.model_yolu = model_yolu
+        self.sinif_isimleri = None
+        if paket is not None or paket_mi(model_yolu):
+            paket = paket or ModelPaketi(model_yolu)
+            _onisleme_denetle(paket)
+            self.interpreter = _tflite_interpreter()(model_content=paket.tflite_icerigi(), num_threads=is_parcacigi)
+            self.sinif_isimleri = paket.sinif_isimleri
+        else:
+            self.interpreter = _tflite_interpreter()(model_path=model_yolu, num_threads=is_parcacigi)
+        self.interpreter.allocate_tensors()
+        self._detaylari_oku()
+        self.girdi_boyutu = tuple(int(v) for v in self.girdi['shape'][1:3])
+        self._batch = int(self.girdi['shape'][0])
+
+    def _detaylari_oku(self):
+        self.girdi = self.interpreter.get_input_details()[0]
+        self.cikti = self.interpreter.get_output_details()[0]
+
+    def _batch_ayarla(self, n):
+        # Değişken batch boyutlarında sık yeniden ayırmayı önlemek için 2'nin kuvvetine yuvarlanır
+        hedef = 1 << (n - 1).bit_length()
+        if hedef != self._batch:
+            h, w = self.girdi_boyutu
+            self.interpreter.resize_tensor_input(self.girdi['index'], [hedef, h, w, 3])
+            self.interpreter.allocate_tensors()
+            self._detaylari_oku()
+            self._batch = hedef
+        return hedef
+
+    def tahmin(self, x):
+        """(n, yükseklik, genişlik, 3) float32 batch için olasılıkları döndür"""
+        n = len(x)
+        hedef = self._batch_ayarla(n)
+        if hedef != n:
+            dolu = np.zeros((hedef,) + x.shape[1:], dtype=x.dtype)
+            dolu[:n] = x
+            x = dolu
+
+        tip = self.girdi['dtype']
+        if tip != np.float32:
+            # Nicemlenmiş girdi: gerçek değer = ölçek * (q - sıfır noktası)
+            olcek, sifir = self.girdi['quantization']
+            bilgi = np.iinfo(tip)
+            x = np.clip(np.round(x / olcek + sifir), bilgi.min, bilgi.max).astype(tip)
+        self.interpreter.set_tensor(self.girdi['index'], x)
+        self.interpreter.invoke()
+        y = self.interpreter.get_tensor(self.cikti['index'])[:n]
+
+        if self.cikti['dtype'] != np.float32:
+            olcek, sifir = self.cikti['quantization']
+            y = (y.astype(np.float32) - sifir) * olcek
+        return y
+
+
+def _model_surumu(arka_uc):
+    from tahmin_onbellegi import model_surumu
+
+    return model_surumu(arka_uc.model_yolu)
+
+
+def kalibrasyon_yolu(model_yolu):
+    """Modelin yanında saklanan sıcaklık kalibrasyonu dosyasının yolunu döndür"""
+    kok, uzanti = os.path.splitext(model_yolu)
+    # Aynı adlı .h5, .tflite ve .pirinc dosyaları birbirinin kalibrasyonunu ezmesin diye
+    # uzantı da dosya adına katılır (.h5 için eski ad korunur)
+    if uzanti == '.h5':
+        return f"{kok}_kalibrasyon.json"
+    return f"{kok}_{uzanti.lstrip('.')}_kalibrasyon.json"
+
+
+def sicaklik_oku(model_yolu):
+    """Kalibrasyon dosyasındaki sıcaklığı döndür; dosya yoksa veya başka bir modele aitse None"""
+    from tahmin_onbellegi import model_surumu
+
+    yol = kalibrasyon_yolu(model_yolu)
+    if not os.path.exists(yol):
+        return None
+    with open(yol, encoding='utf-8') as f:
+        kalibrasyon = json.load(f)
+    if kalibrasyon.get('model_surumu') != model_surumu(model_yolu):
+        print(f"Uyarı: {yol} başka bir model için oluşturulmuş, kalibrasyon kullanılmıyor", file=sys.stderr)
+        return None
+    return float(kalibrasyon['sicaklik'])
+
+
+def sicaklik_uygula(olasiliklar, sicaklik):
+    """Softmax çıktısını sıcaklıkla yeniden ölçekle: softmax(log(p) / T)"""
+    z = np.log(np.maximum(olasiliklar, 1e-12)) / sicaklik
+    z -= z.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return (e / e.sum(axis=1, keepdims=True)).astype(np.float32)
+
+
+class KalibreArkaUcu:
+    """Olasılıkları doğrulama bölümünde bulunan sıcaklıkla kalibre eden arka uç"""
+
+    def __init__(self, arka_uc, sicaklik):
+        self.arka_uc = arka_uc
+        self.sicaklik = sicaklik
+        self.girdi_boyutu = arka_uc.girdi_boyutu
+        self.ad = f"kalibre({arka_uc.ad}, T={sicaklik:.3f})"
+
+    def surum(self):
+        return f"{self.arka_uc.surum()}/T={self.sicaklik}"
+
+    def tahmin(self, x):
+        return sicaklik_uygula(self.arka_uc.tahmin(x), self.sicaklik)
+
+
+def _en_yakin_boyutlandir(x, img_height, img_width):
+    """Batch'i en yakın komşu örneklemeyle (PIL NEAREST gibi piksel merkezlerinden) boyutlandır"""
+    h, w = x.shape[1:3]
+    satirlar = ((np.arange(img_height) + 0.5) * h / img_height).astype(np.intp)
+    sutunlar = ((np.arange(img_width) + 0.5) * w / img_width).astype(np.intp)
+    return x[:, satirlar][:, :, sutunlar]
+
+
+class BoyutlandiranArkaUcu:
+    """Başka bir girdi boyutunda hazırlanmış batch'i modelin boyutuna indirip tahmin eder
+
+    Kademede küçük girdili model, tam model için hazırlanmış görüntüleri yeniden çözmeden kullanır.
+    """
+
+    def __init__(self, arka_uc, girdi_boyutu):
+        self.arka_uc = arka_uc
+        self.girdi_boyutu = girdi_boyutu
+        self.ad = arka_uc.ad
+
+    def surum(self):
+        return f"{self.arka_uc.surum()}@{self.girdi_boyutu}"
+
+    def tahmin(self, x):
+        if tuple(x.shape[1:3]) != tuple(self.arka_uc.girdi_boyutu):
+            x = _en_yakin_boyutlandir(x, *self.arka_uc.girdi_boyutu)
+        return self.arka_uc.tahmin(x)
+
+
+# Test zamanı artırma dönüşümleri. Eğitimde yalnızca yatay çevirme ve ±20° döndürme görülür; dikey çevirme
+# ve 90° / 180° / 270° döndürmeler eğitim dağılımının dışındadır, katkıları degerlendirme.py --tta ile ölçülmelidir
+TTA_DONUSUMLERI = ('yatay', 'dikey', 'r90', 'r180', 'r270')
+
+
+def _donustur(x, donusum):
+    """(n, y, g, 3) batch'e bir TTA dönüşümü uygula"""
+    if donusum == 'yatay':
+        return x[:, :, ::-1]
+    if donusum == 'dikey':
+        return x[:, ::-1]
+    return np.rot90(x, {'r90': 1, 'r180': 2, 'r270': 3}[donusum], axes=(1, 2))
+
+
+def marj(olasiliklar):
+    """En yüksek iki olasılık arasındaki fark; küçükse tahmin kararsızdır"""
+    iki = np.partition(olasiliklar, -2, axis=1)[:, -2:]
+    return iki[:, 1] - iki[:, 0]
+
+
+class TTAArkaUcu:
+    """Görüntüyü ve çevrilmiş / döndürülmüş kopyalarını tek batch'te modelden geçirip ortalar"""
+
+    def __init__(self, arka_uc, donusumler=TTA_DONUSUMLERI):
+        self.arka_uc = arka_uc
+        self.girdi_boyutu = arka_uc.girdi_boyutu
+        h, w = self.girdi_boyutu
+        # 90° döndürme yalnızca kare girdide boyutu korur
+        self.donusumler = [d for d in donusumler if h == w or d not in ('r90', 'r270')]
+        self.ad = f"tta({arka_uc.ad})"
+
+    def surum(self):
+        return f"tta[{','.join(self.donusumler)}]({self.arka_uc.surum()})"
+
+    def tahmin(self, x):
+        n = len(x)
+        yigin = np.concatenate([x] + [_donustur(x, d) for d in self.donusumler])
+        y = self.arka_uc.tahmin(yigin)
+        return y.reshape(len(self.donusumler) + 1, n, -1).mean(axis=0)
+
+
+class TopluArkaUcu:
+    """Birden fazla modelin olasılıklarını ortalar; her model batch için bir kez çağrılır"""
+
+    def __init__(self, arka_ucler):
+        self.arka_ucler = list(arka_ucler)
+        self.girdi_boyutu = self.arka_ucler[0].girdi_boyutu
+        for arka_uc in self.arka_ucler[1:]:
+            if arka_uc.girdi_boyutu != self.girdi_boyutu:
+                raise ValueError(f"Topluluktaki modellerin girdi boyutları farklı: "
+                                 f"{self.girdi_boyutu} ve {arka_uc.girdi_boyutu}")
+        self.ad = f"topluluk({','.join(a.ad for a in self.arka_ucler)})"
+
+    def surum(self):
+        return f"topluluk({','.join(a.surum() for a in self.arka_ucler)})"
+
+    def tahmin(self, x):
+        return np.mean([arka_uc.tahmin(x) for arka_uc in self.arka_ucler], axis=0)
+
+
+class UyarlamaliArkaUcu:
+    """Önce ucuz arka ucu çalıştırır; yalnızca kararsız görüntüleri pahalı olana tek batch'te verir
+
+    olcut='marj': ilk iki olasılık farkı eşiğin altındakiler (TTA / topluluk için);
+    olcut='guven': en yüksek (kalibre) olasılığı eşiğin altındakiler (küçük model -> tam model kademesi).
+    """
+
+    def __init__(self, ucuz, pahali, esik, olcut='marj'):
+        self.ucuz = ucuz
+        self.pahali = pahali
+        self.esik = esik
+        self.olcut = olcut
+        self.girdi_boyutu = pahali.girdi_boyutu
+        self.ad = f"uyarlamali({ucuz.ad} -> {pahali.ad}, {olcut} < {esik})"
+        self.toplam = 0
+        self.yukseltilen = 0
+        self.ucuz_sure = 0.0
+        self.pahali_sure = 0.0
+
+    def surum(self):
+        return f"{self.ucuz.surum()}|{self.olcut}<{self.esik}|{self.pahali.surum()}"
+
+    def tahmin(self, x):
+        baslangic = time.perf_counter()
+        y = np.array(self.ucuz.tahmin(x), dtype=np.float32)
+        olcu = marj(y) if self.olcut == 'marj' else y.max(axis=1)
+        kararsiz = np.flatnonzero(olcu < self.esik)
+        ara = time.perf_counter()
+        if len(kararsiz):
+            y[kararsiz] = self.pahali.tahmin(x[kararsiz])
+        self.ucuz_sure += ara - baslangic
+        self.pahali_sure += time.perf_counter() - ara
+        self.toplam += len(x)
+        self.yukseltilen += len(kararsiz)
+        return y
+
+    def istatistikler(self):
+        """Her aşamanın karşıladığı trafik oranı ve görüntü başına ortalama gecikme (ms)"""
+        toplam = max(1, self.toplam)
+        return {
+            'toplam': self.toplam,
+            'ilk_asama_orani': 1 - self.yukseltilen / toplam,
+            'ikinci_asama_orani': self.yukseltilen / toplam,
+            'ilk_asama_ms': self.ucuz_sure / toplam * 1000,
+            'ikinci_asama_ms': self.pahali_sure / max(1, self.yukseltilen) * 1000,
+            'ortalama_ms': (self.ucuz_sure + self.pahali_sure) / toplam * 1000,
+        }
+
+    def rapor(self):
+        i = self.istatistikler()
+        return (f"{self.ad}\n"
+                f"  1. aşama: görüntülerin %{i['ilk_asama_orani'] * 100:.1f}'i, {i['ilk_asama_ms']:.3f} ms/görüntü\n"
+                f"  2. aşama: görüntülerin %{i['ikinci_asama_orani'] * 100:.1f}'i, "
+                f"{i['ikinci_asama_ms']:.3f} ms/görüntü (ilk aşamaya ek)\n"
+                f"  Ortalama: {i['ortalama_ms']:.3f} ms/görüntü ({self.toplam} görüntü)")
+
+
+def onbellek_eki(arka_uc):
+    """Sarmalanmış (kalibre, TTA, topluluk, kademe) arka uçlar için tahmin önbelleği sürüm eki"""
+    if isinstance(arka_uc, (KerasArkaUcu, TFLiteArkaUcu)):
+        return ""
+    return hashlib.sha1(arka_uc.surum().encode('utf-8')).hexdigest()
+
+
+def _kalibre_yukle(model_yolu, is_parcacigi=None, hizli_onbellek=False, kalibrasyon=True):
+    """Modeli yükle; yanında kalibrasyon dosyası varsa olasılıkları kalibre et"""
+    arka_uc = arka_uc_yukle(model_yolu, is_parcacigi, hizli_onbellek)
+    sicaklik = sicaklik_oku(model_yolu) if kalibrasyon else None
+    return arka_uc if sicaklik is None else KalibreArkaUcu(arka_uc, sicaklik)
+
+
+def arka_uc_olustur(model_yolu, ek_modeller=(), tta=False, esik=None, is_parcacigi=None, hizli_onbellek=False,
+                    kalibrasyon=True, kademe_modeli=None, kademe_esigi=KADEME_ESIGI):
+    """Modeli (ve varsa topluluğun diğer modellerini) yükleyip TTA / topluluk / kademe sarmalayıcılarıyla birleştir
+
+    esik verilirse TTA ve topluluk yalnızca ana modelin ilk iki olasılık farkı eşiğin altında
+    kaldığı görüntülerde çalışır. kademe_modeli verilirse önce bu (küçük) model çalışır,
+    kalibre güveni kademe_esigi'nin altındaki görüntüler tam modele aktarılır.
+    """
+    arka_ucler = [_kalibre_yukle(yol, is_parcacigi, hizli_onbellek, kalibrasyon)
+                  for yol in [model_yolu] + list(ek_modeller)]
+    tam = arka_ucler[0]
+    if tta or len(arka_ucler) > 1:
+        pahali = [TTAArkaUcu(a) if tta else a for a in arka_ucler]
+        pahali = pahali[0] if len(pahali) == 1 else TopluArkaUcu(pahali)
+        tam = pahali if esik is None else UyarlamaliArkaUcu(arka_ucler[0], pahali, esik)
+    if kademe_modeli is None:
+        return tam
+    kucuk = BoyutlandiranArkaUcu(_kalibre_yukle(kademe_modeli, is_parcacigi, hizli_onbellek, kalibrasyon),
+                                 tam.girdi_boyutu)
+    return UyarlamaliArkaUcu(kucuk, tam, kademe_esigi, olcut='guven')
+
+
+def arka_uc_argumanlari(parser):
+    """TTA / topluluk / kademe seçeneklerini komut satırı ayrıştırıcısına ekle (tüm araçlarda aynı)"""
+    parser.add_argument("--topluluk", default="", help="Olasılıkları ortalanacak ek modeller (virgülle ayrılmış)")
+    parser.add_argument("--tta", action='store_true', help="Çevirme ve döndürmelerle test zamanı artırma")
+    parser.add_argument("--marj-esigi", type=float, default=None,
+                        help="TTA / topluluğu yalnızca ilk iki olasılık farkı bu değerin altındaki görüntülerde çalıştır")
+    parser.add_argument("--kademe-modeli", help="Önce çalışan küçük model; güveni düşük görüntüler tam modele aktarılır")
+    parser.add_argument("--kademe-esigi", type=float, default=KADEME_ESIGI,
+                        help="Küçük modelin kalibre güveni bunun altındaysa tam model kullanılır")
+
+
+def arka_uc_secenekleri(args):
+    """arka_uc_argumanlari ile eklenen seçenekleri arka_uc_olustur anahtar sözcüklerine çevir"""
+    return {
+        'ek_modeller': [m for m in args.topluluk.split(',') if m],
+        'tta': args.tta,
+        'esik': args.marj_esigi,
+        'kademe_modeli': args.kademe_modeli,
+        'kademe_esigi': args.kademe_esigi,
+    }
+
+
+def arka_uc_argumanlardan(args, **kwargs):
+    """args.model ve arka_uc_argumanlari seçenekleriyle arka ucu oluştur"""
+    return arka_uc_olustur(args.model, **arka_uc_secenekleri(args), **kwargs)
+
+
+def arka_uc_yukle(model_yolu, is_parcacigi=None, hizli_onbellek=False):
+    """Dosya uzantısına göre uygun arka ucu yükle
+
+    hizli_onbellek: HDF5 modeli ilk yüklemede hızlı biçime kaydedilir, sonraki
+    başlangıçlarda (model değişmediyse) bu kopya kullanılır. Model paketleri (.pirinc)
+    içerdikleri model türüne göre yüklenir.
+    """
+    if paket_mi(model_yolu):
+        paket = ModelPaketi(model_yolu)
+        if paket.tur == 'tflite':
+            return TFLiteArkaUcu(model_yolu, is_parcacigi=is_parcacigi, paket=paket)
+        return KerasArkaUcu(model_yolu, paket=paket)
+    if model_yolu.endswith('.tflite'):
+        return TFLiteArkaUcu(model_yolu, is_parcacigi=is_parcacigi)
+    return KerasArkaUcu(model_yolu, hizli_onbellek=hizli_onbellek)
@@ -0,0 +1,348 @@
+import io
+import os
+import math
+from collections import Counter
+import tkinter as tk
+from tkinter import ttk, filedialog
+import numpy as np
+from PIL import Image, ImageTk
+from onisleme import goruntu_onisle
+from tahmin_onbellegi import icerik_ozeti
+
+GORUNTU_UZANTILARI = ('.jpg', '.jpeg', '.png', '.bmp')
+KUCUK_RESIM_BOYUTU = 48
+COKLU_BATCH_SIZE = 32
+
+
+class CokluSiniflandirmaPenceresi:
+    """Birden fazla görüntüyü listeleyip batch halinde sınıflandıran pencere"""
+
+    def __init__(self, app):
+        self.app = app
+        self.window = tk.Toplevel(app.root)
+        self.window.title("Çoklu Sınıflandırma")
+        self.window.geometry("720x560")
+        self.window.configure(bg=app.bg_color)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        # Değişkenler
+        self.paths = {}  # satır kimliği -> dosya yolu
+        self.thumbnails = {}  # satır kimliği -> PhotoImage (referansı tutmak için)
+        self.thumbnail_jobs = {}  # satır kimliği -> işçi görev kimliği
+        self.results = {}  # satır kimliği -> olasılıklar
+        self.tally = Counter()
+        self.batch_jobs = {}  # batch numarası -> işçi görev kimliği
+        self.visible_check = None
+
+        self.create_interface()
+
+    def create_interface(self):
+        app = self.app
+
+        # Butonlar çerçevesi
+        self.button_frame = tk.Frame(self.window, bg=app.bg_color)
+        self.button_frame.pack(fill="x", padx=15, pady=(15, 10))
+
+        buttons = [
+            ("⊕ Dosya Ekle", self.add_files, app.secondary_button_color),
+            ("⊕ Klasör Ekle", self.add_folder, app.secondary_button_color),
+            ("☐ Tümünü Sınıflandır", self.classify_all, app.primary_button_color),
+            ("✕ İptal", self.cancel, "#9E9E9E"),
+            ("Temizle", self.clear, "#9E9E9E"),
+        ]
+        self.buttons = {}
+        for text, command, color in buttons:
+            button = tk.Button(
+                self.button_frame,
+                text=text,
+                command=command,
+                font=("Arial", 11),
+                bg=color,
+                fg="white",
+                relief="flat",
+                padx=10,
+                pady=6,
+                cursor="hand2"
+            )
+            button.pack(side="left", padx=(0, 8))
+            self.buttons[command.__name__] = button
+        self.buttons["cancel"].configure(state="disabled")
+
+        # Görüntü listesi
+        self.list_frame = tk.Frame(self.window, bg=app.frame_bg_color)
+        self.list_frame.pack(fill="both", expand=True, padx=15)
+
+        style = ttk.Style(self.window)
+        style.configure("Coklu.Treeview", rowheight=KUCUK_RESIM_BOYUTU + 6)
+
+        self.tree = ttk.Treeview(
+            self.list_frame,
+            columns=("dosya", "sonuc", "guven"),
+            show="tree headings",
+            style="Coklu.Treeview"
+        )
+        self.tree.column("#0", width=KUCUK_RESIM_BOYUTU + 20, stretch=False)
+        self.tree.heading("dosya", text="Dosya")
+        self.tree.heading("sonuc", text="Sonuç")
+        self.tree.heading("guven", text="Güven")
+        self.tree.column("dosya", width=320)
+        self.tree.column("sonuc", width=140)
+        self.tree.column("guven", width=90, anchor="e")
+
+        self.scrollbar = ttk.Scrollbar(self.list_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.tree.bind("<Configure>", lambda e: self.schedule_visible_check())
+        self.tree.bind("<Double-1>", self.on_row_activate)
+
+        # İlerleme ve sınıf sayıları
+        self.progress_var = tk.StringVar()
+        self.progress_var.set("Görüntü seçilmedi")
+        tk.Label(
+            self.window,
+            textvariable=self.progress_var,
+            font=("Arial", 10),
+            bg=app.bg_color,
+            fg=app.text_color,
+            anchor="w"
+        ).pack(fill="x", padx=15, pady=(10, 0))
+
+        self.tally_var = tk.StringVar()
+        tk.Label(
+            self.window,
+            textvariable=self.tally_var,
+            font=("Arial", 11, "bold"),
+            bg=app.bg_color,
+            fg=app.primary_button_color,
+            anchor="w",
+            justify="left"
+        ).pack(fill="x", padx=15, pady=(5, 15))
+        self.update_tally()
+
+    def add_files(self):
+        """Birden fazla görüntü dosyası seç"""
+        file_paths = filedialog.askopenfilenames(
+            parent=self.window,
+            title="Görüntüleri Seç",
+            filetypes=(
+                ("Görüntü Dosyaları", "*.jpg *.jpeg *.png *.bmp"),
+                ("Tüm Dosyalar", "*.*")
+            )
+        )
+        self.add_paths(file_paths)
+
+    def add_folder(self):
+        """Bir klasördeki tüm görüntüleri ekle"""
+        folder = filedialog.askdirectory(parent=self.window, title="Klasör Seç")
+        if not folder:
+            return
+        file_paths = []
+        for kok, dizinler, dosyalar in os.walk(folder):
+            dizinler.sort()
+            for dosya in sorted(dosyalar):
+                if dosya.lower().endswith(GORUNTU_UZANTILARI):
+                    file_paths.append(os.path.join(kok, dosya))
+        self.add_paths(file_paths)
+
+    def add_paths(self, file_paths):
+        """Dosyaları listeye ekle; küçük resimler yalnızca görünür olduklarında yüklenir"""
+        existing = set(self.paths.values())
+        for file_path in file_paths:
+            if file_path in existing:
+                continue
+            iid = self.tree.insert("", "end", values=(os.path.basename(file_path), "-", ""))
+            self.paths[iid] = file_path
+            existing.add(file_path)
+        self.update_progress()
+        self.schedule_visible_check()
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.schedule_visible_check()
+
+    def schedule_visible_check(self):
+        """Kaydırma olaylarını birleştirip görünür satırları kısa bir gecikmeyle kontrol et"""
+        if self.visible_check is None:
+            self.visible_check = self.window.after(50, self.load_visible_thumbnails)
+
+    def load_visible_thumbnails(self):
+        """Görünür satırların küçük resimlerini arka planda oluştur"""
+        self.visible_check = None
+        children = self.tree.get_children()
+        if not children:
+            return
+        top, bottom = self.tree.yview()
+        start = int(top * len(children))
+        end = min(len(children), math.ceil(bottom * len(children)) + 1)
+        for iid in children[start:end]:
+            if iid in self.thumbnails or iid in self.thumbnail_jobs:
+                continue
+            self.thumbnail_jobs[iid] = self.app.image_worker.gonder(
+                self.make_thumbnail, iid, self.paths[iid],
+                basarili=self.on_thumbnail_ready,
+                hata=lambda e, iid=iid: self.on_thumbnail_error(iid)
+            )
+
+    @staticmethod
+    def make_thumbnail(iid, file_path):
+        """Küçük resmi oluştur (işçi iş parçacığında)"""
+        with Image.open(file_path) as img:
+            # JPEG'lerde tam çözünürlük yerine küçültülmüş çözme
+            img.draft("RGB", (KUCUK_RESIM_BOYUTU * 2, KUCUK_RESIM_BOYUTU * 2))
+            img.thumbnail((KUCUK_RESIM_BOYUTU, KUCUK_RESIM_BOYUTU))
+            return iid, img.copy()
+
+    def on_thumbnail_ready(self, result):
+        iid, img = result
+        self.thumbnail_jobs.pop(iid, None)
+        if not self.tree.exists(iid):
+            return
+        photo = ImageTk.PhotoImage(img)
+        self.thumbnails[iid] = photo
+        self.tree.item(iid, image=photo)
+
+    def on_thumbnail_error(self, iid):
+        # Açılamayan dosya için tekrar denenmez
+        self.thumbnail_jobs.pop(iid, None)
+        self.thumbnails[iid] = None
+
+    def classify_all(self):
+        """Sınıflandırılmamış tüm görüntüleri batch'ler halinde sınıflandır"""
+        pending = [iid for iid in self.tree.get_children() if iid not in self.results]
+        if not pending or self.batch_jobs:
+            return
+        for batch_no, i in enumerate(range(0, len(pending), COKLU_BATCH_SIZE)):
+            chunk = pending[i:i + COKLU_BATCH_SIZE]
+            self.batch_jobs[batch_no] = self.app.model_worker.gonder(
+                self.predict_batch, batch_no, chunk, [self.paths[iid] for iid in chunk],
+                basarili=self.on_batch_done,
+                hata=lambda e, batch_no=batch_no: self.on_batch_error(batch_no, e)
+            )
+        self.buttons["classify_all"].configure(state="disabled")
+        self.buttons["cancel"].configure(state="normal")
+        self.update_progress()
+
+    def predict_batch(self, batch_no, iids, file_paths):
+        """Görüntüleri ön işleyip tek bir model çağrısıyla tahmin yap (işçi iş parçacığında)"""
+        cache = self.app.prediction_cache
+        batch = np.empty((len(file_paths), self.app.IMG_HEIGHT, self.app.IMG_WIDTH, 3), dtype=np.float32)
+        errors = []
+        
+        # Dosyalar bir kez okunur; önbellekte sonucu olanlar çözülmez
+        contents = []
+        for iid, file_path in zip(iids, file_paths):
+            try:
+                with open(file_path, "rb") as f:
+                    data = f.read()
+                contents.append((iid, data, icerik_ozeti(data) if cache is not None else None))
+            except Exception as e:
+                errors.append((iid, str(e)))
+        cached = cache.al_coklu([h for _, _, h in contents]) if cache is not None else {}
+        
+        ok_iids = []
+        predictions = []
+        pending_iids = []
+        pending_hashes = []
+        for iid, data, image_hash in contents:
+            if image_hash in cached:
+                ok_iids.append(iid)
+                predictions.append(cached[image_hash])
+                continue
+            try:
+                with Image.open(io.BytesIO(data)) as img:
+                    goruntu_onisle(img, self.app.IMG_WIDTH, self.app.IMG_HEIGHT, out=batch[len(pending_iids)])
+                pending_iids.append(iid)
+                pending_hashes.append(image_hash)
+            except Exception as e:
+                errors.append((iid, str(e)))
+        
+        if pending_iids:
+            new_predictions = self.app.model.tahmin(batch[:len(pending_iids)])
+            if cache is not None:
+                cache.koy_coklu(zip(pending_hashes, new_predictions))
+            ok_iids.extend(pending_iids)
+            predictions.extend(new_predictions)
+        return batch_no, ok_iids, predictions, errors
+
+    def on_batch_done(self, result):
+        """Batch sonuçlarını satırlara ve sınıf sayılarına işle"""
+        batch_no, ok_iids, predictions, errors = result
+        for iid, prediction in zip(ok_iids, predictions):
+            if not self.tree.exists(iid):
+                continue
+            idx = int(np.argmax(prediction))
+            class_name = self.app.sinif_isimleri[idx]
+            self.results[iid] = prediction
+            self.tally[class_name] += 1
+            self.tree.set(iid, "sonuc", class_name)
+            self.tree.set(iid, "guven", f"{prediction[idx] * 100:.2f}%")
+        for iid, error in errors:
+            if self.tree.exists(iid):
+                self.tree.set(iid, "sonuc", "Hata")
+                self.tree.set(iid, "guven", "")
+        self.finish_job(batch_no)
+
+    def on_batch_error(self, batch_no, e):
+        self.finish_job(batch_no)
+        self.progress_var.set(f"Sınıflandırma sırasında hata oluştu: {e}")
+
+    def finish_job(self, batch_no):
+        self.batch_jobs.pop(batch_no, None)
+        if not self.batch_jobs:
+            self.buttons["classify_all"].configure(state="normal")
+            self.buttons["cancel"].configure(state="disabled")
+        self.update_progress()
+        self.update_tally()
+
+    def cancel(self):
+        """Bekleyen batch'leri iptal et"""
+        for job in self.batch_jobs.values():
+            self.app.model_worker.iptal(job)
+        self.batch_jobs.clear()
+        self.buttons["classify_all"].configure(state="normal")
+        self.buttons["cancel"].configure(state="disabled")
+        self.update_progress()
+
+    def clear(self):
+        """Listeyi ve sonuçları temizle"""
+        self.cancel()
+        for job in self.thumbnail_jobs.values():
+            self.app.image_worker.iptal(job)
+        self.tree.delete(*self.tree.get_children())
+        self.paths.clear()
+        self.thumbnails.clear()
+        self.thumbnail_jobs.clear()
+        self.results.clear()
+        self.tally.clear()
+        self.update_progress()
+        self.update_tally()
+
+    def update_progress(self):
+        total = len(self.paths)
+        if total == 0:
+            self.progress_var.set("Görüntü seçilmedi")
+            return
+        text = f"{len(self.results)}/{total} görüntü sınıflandırıldı"
+        if self.batch_jobs:
+            text += " - sınıflandırılıyor..."
+        self.progress_var.set(text)
+
+    def update_tally(self):
+        """Sınıf bazında sayıları göster"""
+        self.tally_var.set("   ".join(
+            f"{class_name}: {self.tally.get(class_name, 0)}" for class_name in self.app.sinif_isimleri
+        ))
+
+    def on_row_activate(self, event):
+        """Çift tıklanan görüntüyü ana pencerede sonucuyla birlikte göster"""
+        iid = self.tree.focus()
+        if iid in self.paths:
+            self.app.open_image_path(self.paths[iid], self.results.get(iid))
+
+    def close(self):
+        if self.visible_check is not None:
+            self.window.after_cancel(self.visible_check)
+        self.clear()
+        self.window.destroy()
+        self.app.multi_window = None
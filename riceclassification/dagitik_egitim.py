@@ -0,0 +1,179 @@
+import os
+import sys
+import json
+import socket
+import time
+import argparse
+import subprocess
+
+# Sabit değişkenler - model_egitimi.py ile aynı olmalı
+IMG_WIDTH = 150
+IMG_HEIGHT = 150
+BATCH_SIZE = 32  # iş parçası (worker) başına
+EPOCHS = 5
+MODEL_PATH = "pirinc_model.h5"
+DATASET_PATH = "Rice_Image_Dataset"
+OGRENME_ORANI = 0.001  # Adam varsayılanı
+SEED = 1234
+
+
+def bos_port():
+    """İşletim sisteminden boş bir TCP portu al"""
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+def yerel_baslat(is_sayisi, args):
+    """Aynı makinede her biri ayrı süreç olan is_sayisi kadar worker başlat ve bitmelerini bekle"""
+    adresler = [f"localhost:{bos_port()}" for _ in range(is_sayisi)]
+    # Çekirdekler worker'lar arasında paylaştırılır; aksi halde her süreç tüm çekirdekleri ister
+    is_parcacigi = args.is_parcacigi or max(1, (os.cpu_count() or 1) // is_sayisi)
+
+    surecler = []
+    for indeks in range(is_sayisi):
+        ortam = dict(os.environ)
+        ortam["TF_CONFIG"] = json.dumps({
+            "cluster": {"worker": adresler},
+            "task": {"type": "worker", "index": indeks},
+        })
+        komut = [sys.executable, __file__, "--calisan", "--is-parcacigi", str(is_parcacigi)]
+        komut += [f"--{ad.replace('_', '-')}={deger}" for ad, deger in [
+            ("veri", args.veri), ("model", args.model), ("epochs", args.epochs),
+            ("batch_size", args.batch_size), ("ogrenme_orani", args.ogrenme_orani),
+        ]]
+        if args.olceklemeden:
+            komut.append("--olceklemeden")
+        surecler.append(subprocess.Popen(komut, env=ortam))
+
+    # Bir worker çökerse diğerleri ortak işlemlerde sonsuza kadar bekler; bu yüzden tümü birlikte izlenir
+    # ve ilk hatalı çıkışta kalanlar sonlandırılır
+    try:
+        while True:
+            kodlar = [surec.poll() for surec in surecler]
+            hatali = next((kod for kod in kodlar if kod), None)
+            if hatali is not None:
+                print(f"Worker çıkış kodları: {kodlar}; kalan worker'lar sonlandırılıyor", file=sys.stderr)
+                break
+            if all(kod == 0 for kod in kodlar):
+                return
+            time.sleep(0.5)
+    finally:
+        for surec in surecler:
+            if surec.poll() is None:
+                surec.terminate()
+        for surec in surecler:
+            try:
+                surec.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                surec.kill()
+                surec.wait()
+    sys.exit(hatali)
+
+
+def calis(args):
+    """TF_CONFIG ile tanımlanan kümede bu worker'ın payını eğit"""
+    import tensorflow as tf
+
+    if args.is_parcacigi:
+        tf.config.threading.set_intra_op_parallelism_threads(args.is_parcacigi)
+        tf.config.threading.set_inter_op_parallelism_threads(2)
+
+    import veri_hatti
+    import veri_onbellegi
+    from model_mimarisi import model_olustur
+    from tensorflow.keras.callbacks import ModelCheckpoint, EarlyStopping
+
+    # CPU'lar arasında gradyan toplamı için halka (ring) all-reduce
+    strategy = tf.distribute.MultiWorkerMirroredStrategy(
+        communication_options=tf.distribute.experimental.CommunicationOptions(
+            implementation=tf.distribute.experimental.CommunicationImplementation.RING
+        )
+    )
+    resolver = strategy.cluster_resolver
+    is_sayisi = strategy.num_replicas_in_sync
+    sef = resolver.task_type in (None, "chief") or (resolver.task_type == "worker" and resolver.task_id == 0)
+    global_batch = args.batch_size * is_sayisi
+
+    def veri_seti(subset):
+        # Her worker yalnızca kendi parçasını çözer; global batch replikalar arasında eşit bölünür
+        def olustur(input_context):
+            ds, _, _ = veri_hatti.veri_seti_olustur(
+                subset, input_context.get_per_replica_batch_size(global_batch), args.veri,
+                validation_split=0.2, img_width=IMG_WIDTH, img_height=IMG_HEIGHT, seed=SEED,
+                parca=(input_context.num_input_pipelines, input_context.input_pipeline_id)
+            )
+            return ds.repeat()
+        return tf.keras.utils.experimental.DatasetCreator(olustur)
+
+    # Tüm worker'lar aynı sayıda adım atmalı; en küçük parçaya göre hesaplanır
+    yollar, etiketler, class_names = veri_onbellegi.veri_setini_listele(args.veri)
+    train_samples = len(veri_onbellegi.bolum_indeksleri(etiketler, 0.2, 'training'))
+    validation_samples = len(veri_onbellegi.bolum_indeksleri(etiketler, 0.2, 'validation'))
+    steps_per_epoch = max(1, (train_samples // is_sayisi) // args.batch_size)
+    validation_steps = max(1, (validation_samples // is_sayisi) // args.batch_size)
+
+    ogrenme_orani = args.ogrenme_orani if args.olceklemeden else args.ogrenme_orani * is_sayisi
+    with strategy.scope():
+        model = model_olustur(len(class_names), IMG_WIDTH, IMG_HEIGHT)
+        model.compile(
+            optimizer=tf.keras.optimizers.Adam(ogrenme_orani),
+            loss='categorical_crossentropy',
+            metrics=['accuracy']
+        )
+
+    callbacks = [EarlyStopping(monitor='val_loss', patience=3, restore_best_weights=True)]
+    if sef:
+        # Model dosyasını yalnızca şef worker yazar
+        callbacks.append(ModelCheckpoint(args.model, monitor='val_accuracy', save_best_only=True, verbose=1))
+        callbacks.append(veri_hatti.GoruntuHizi(global_batch))
+        print(f"{is_sayisi} worker, global batch {global_batch}, öğrenme oranı {ogrenme_orani}, "
+              f"epoch başına {steps_per_epoch} adım")
+
+    model.fit(
+        veri_seti('training'),
+        steps_per_epoch=steps_per_epoch,
+        validation_data=veri_seti('validation'),
+        validation_steps=validation_steps,
+        epochs=args.epochs,
+        callbacks=callbacks,
+        verbose=1 if sef else 0
+    )
+
+    if sef:
+        import numpy as np
+        from model_paketi import paketle, paket_yolu
+
+        np.save('sinif_isimleri.npy', class_names)
+        # Arayüz ve araçlar paketi tercih ettiği için eski paket yeni modelle değiştirilir
+        paket = paket_yolu(args.model)
+        paketle(args.model, class_names, paket)
+        print(f"Model {args.model}, paket {paket} olarak kaydedildi; metrikler için: "
+              f"python degerlendirme.py --model {paket}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MultiWorkerMirroredStrategy ile çok süreçli veri paralel eğitim")
+    parser.add_argument("--is-sayisi", type=int, default=2,
+                        help="Bu makinede başlatılacak worker süreci sayısı")
+    parser.add_argument("--calisan", action="store_true",
+                        help="Tek worker olarak çalış (küme TF_CONFIG ortam değişkeninden okunur; "
+                             "birden fazla makinede her makinede bu şekilde başlatılır)")
+    parser.add_argument("--veri", default=DATASET_PATH)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Worker başına batch boyutu")
+    parser.add_argument("--ogrenme-orani", type=float, default=OGRENME_ORANI,
+                        help="Tek worker için öğrenme oranı; worker sayısıyla doğrusal ölçeklenir")
+    parser.add_argument("--olceklemeden", action="store_true", help="Öğrenme oranını worker sayısıyla ölçekleme")
+    parser.add_argument("--is-parcacigi", type=int, default=None, help="Worker başına iş parçacığı sayısı")
+    args = parser.parse_args()
+
+    if args.calisan:
+        calis(args)
+    else:
+        yerel_baslat(args.is_sayisi, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import sys
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from onisleme import normalize
+from toplu_siniflandirma import sirali_hazirla
+from model_paketi import varsayilan_model, SINIF_DOSYASI
+
+# Sabit değişkenler - model_egitimi.py ile aynı olmalı
+MODEL_PATH = varsayilan_model()
+DATASET_PATH = "Rice_Image_Dataset"
+BATCH_SIZE = 64
+
+
+class KarisiklikMatrisi:
+    """Batch batch güncellenen karışıklık matrisi ve ondan türetilen sınıf metrikleri"""
+
+    def __init__(self, sinif_sayisi):
+        self.sinif_sayisi = sinif_sayisi
+        self.matris = np.zeros((sinif_sayisi, sinif_sayisi), dtype=np.int64)
+
+    def guncelle(self, y_true, y_pred):
+        """Bir batch'in gerçek ve tahmin edilen etiketlerini matrise ekle"""
+        n = self.sinif_sayisi
+        indeks = np.asarray(y_true, dtype=np.int64) * n + np.asarray(y_pred, dtype=np.int64)
+        self.matris += np.bincount(indeks, minlength=n * n).reshape(n, n)
+
+    @property
+    def toplam(self):
+        return int(self.matris.sum())
+
+    def dogruluk(self):
+        return float(np.trace(self.matris) / max(1, self.toplam))
+
+    def sinif_metrikleri(self):
+        """Sınıf başına kesinlik, duyarlılık, F1 ve destek değerlerini döndür"""
+        m = self.matris.astype(np.float64)
+        dogru = np.diag(m)
+        destek = m.sum(axis=1)
+        tahmin = m.sum(axis=0)
+        # Tanımsız durumlar (hiç örnek veya tahmin yok) sklearn'deki gibi 0 kabul edilir
+        kesinlik = np.divide(dogru, tahmin, out=np.zeros_like(dogru), where=tahmin > 0)
+        duyarlilik = np.divide(dogru, destek, out=np.zeros_like(dogru), where=destek > 0)
+        payda = kesinlik + duyarlilik
+        f1 = np.divide(2 * kesinlik * duyarlilik, payda, out=np.zeros_like(dogru), where=payda > 0)
+        return kesinlik, duyarlilik, f1, destek.astype(np.int64)
+
+    def agirlikli_f1(self):
+        _, _, f1, destek = self.sinif_metrikleri()
+        return float(np.average(f1, weights=destek)) if destek.sum() else 0.0
+
+    def rapor(self, sinif_isimleri):
+        """classification_report benzeri metin rapor oluştur"""
+        kesinlik, duyarlilik, f1, destek = self.sinif_metrikleri()
+        genislik = max(12, max(len(str(s)) for s in sinif_isimleri) + 2)
+        satirlar = [f"{'':<{genislik}}{'kesinlik':>11}{'duyarlılık':>12}{'f1':>8}{'destek':>9}", ""]
+        for i, sinif in enumerate(sinif_isimleri):
+            satirlar.append(f"{str(sinif):<{genislik}}{kesinlik[i]:>11.4f}{duyarlilik[i]:>12.4f}"
+                            f"{f1[i]:>8.4f}{destek[i]:>9}")
+        toplam = int(destek.sum())
+        agirlik = destek if toplam else None
+        satirlar.append("")
+        satirlar.append(f"{'doğruluk':<{genislik}}{'':>11}{'':>12}{self.dogruluk():>8.4f}{toplam:>9}")
+        satirlar.append(f"{'makro ort.':<{genislik}}{kesinlik.mean():>11.4f}{duyarlilik.mean():>12.4f}"
+                        f"{f1.mean():>8.4f}{toplam:>9}")
+        satirlar.append(f"{'ağırlıklı ort.':<{genislik}}{np.average(kesinlik, weights=agirlik):>11.4f}"
+                        f"{np.average(duyarlilik, weights=agirlik):>12.4f}"
+                        f"{np.average(f1, weights=agirlik):>8.4f}{toplam:>9}")
+        return "\n".join(satirlar)
+
+    def sozluk(self, sinif_isimleri):
+        """JSON'a yazılabilir sonuç sözlüğü döndür"""
+        kesinlik, duyarlilik, f1, destek = self.sinif_metrikleri()
+        return {
+            'ornek_sayisi': self.toplam,
+            'dogruluk': self.dogruluk(),
+            'agirlikli_f1': self.agirlikli_f1(),
+            'siniflar': {
+                str(s): {'kesinlik': float(kesinlik[i]), 'duyarlilik': float(duyarlilik[i]),
+                         'f1': float(f1[i]), 'destek': int(destek[i])}
+                for i, s in enumerate(sinif_isimleri)
+            },
+            'karisiklik_matrisi': self.matris.tolist(),
+        }
+
+
+def model_sinif_isimleri(model_yolu, sinif_dosyasi=SINIF_DOSYASI):
+    """Modelin çıkış sırasındaki sınıf isimlerini döndür; paket değilse ve sınıf dosyası yoksa None"""
+    from cikarim import sinif_isimleri_yukle
+
+    try:
+        return [str(s) for s in sinif_isimleri_yukle(model_yolu, sinif_dosyasi)]
+    except FileNotFoundError:
+        print(f"Uyarı: {sinif_dosyasi} bulunamadı, etiketler dizin sırasına göre numaralanıyor", file=sys.stderr)
+        return None
+
+
+def dogrulama_ornekleri(dataset_path=DATASET_PATH, validation_split=0.2, subset='validation', model_siniflari=None):
+    """Eğitimdeki bölmeyle aynı doğrulama (veya eğitim / tüm) yollarını ve etiketlerini döndür
+
+    model_siniflari verilirse etiketler dizin sırasına göre değil, modelin çıkış sırasındaki
+    sınıf adına göre numaralanır (artımlı eğitimle eklenen sınıflar çıkışın sonundadır).
+    Modelin bilmediği bir sınıf dizini varsa ValueError verilir.
+    """
+    import veri_onbellegi
+
+    yollar, etiketler, sinif_isimleri = veri_onbellegi.veri_setini_listele(dataset_path)
+    if subset != 'tumu':
+        indeksler = veri_onbellegi.bolum_indeksleri(etiketler, validation_split, subset)
+        yollar = [yollar[i] for i in indeksler]
+        etiketler = etiketler[indeksler]
+    if model_siniflari is not None:
+        model_siniflari = [str(s) for s in model_siniflari]
+        bilinmeyen = [s for s in sinif_isimleri if s not in model_siniflari]
+        if bilinmeyen:
+            raise ValueError(f"Veri setindeki sınıflar modelde yok: {', '.join(bilinmeyen)}")
+        donusum = np.array([model_siniflari.index(s) for s in sinif_isimleri], dtype=np.int64)
+        etiketler = donusum[etiketler]
+        sinif_isimleri = model_siniflari
+    return yollar, etiketler, sinif_isimleri
+
+
+def degerlendir(arka_uc, yollar, etiketler, sinif_sayisi, batch_size=BATCH_SIZE, workers=None, geri_cagirim=None):
+    """Görüntüleri artırma olmadan tek geçişte modelden geçirip karışıklık matrisini biriktir
+
+    geri_cagirim verilirse her batch'in (etiketler, olasılıklar) çifti ile çağrılır.
+    """
+    img_height, img_width = arka_uc.girdi_boyutu
+    tampon = np.empty((batch_size, img_height, img_width, 3), dtype=np.float32)
+    batch_etiketleri = np.empty(batch_size, dtype=np.int64)
+    matris = KarisiklikMatrisi(sinif_sayisi)
+    etiket_sozlugu = dict(zip(yollar, etiketler))
+    n = 0
+    atlanan = 0
+
+    def batch_isle(n):
+        olasiliklar = arka_uc.tahmin(tampon[:n])
+        matris.guncelle(batch_etiketleri[:n], np.argmax(olasiliklar, axis=1))
+        if geri_cagirim is not None:
+            geri_cagirim(batch_etiketleri[:n].copy(), np.asarray(olasiliklar))
+
+    with ThreadPoolExecutor(workers) as havuz:
+        for yol, dizi, hata, _ in sirali_hazirla(havuz, yollar, img_width, img_height, batch_size * 2):
+            if hata is not None:
+                print(f"Atlandı: {yol}: {hata}", file=sys.stderr)
+                atlanan += 1
+                continue
+            normalize(dizi, out=tampon[n])
+            batch_etiketleri[n] = etiket_sozlugu[yol]
+            n += 1
+            if n == batch_size:
+                batch_isle(n)
+                n = 0
+    if n:
+        batch_isle(n)
+
+    if atlanan:
+        print(f"{atlanan} görüntü okunamadığı için değerlendirmeye katılmadı", file=sys.stderr)
+    return matris
+
+
+def main():
+    from cikarim import arka_uc_argumanlari, arka_uc_argumanlardan, UyarlamaliArkaUcu
+
+    parser = argparse.ArgumentParser(description="Kayıtlı bir modeli doğrulama bölümünde tek geçişte değerlendir")
+    parser.add_argument("--model", default=MODEL_PATH, help="Model paketi (.pirinc), Keras (.h5, .npz) veya TFLite (.tflite) modeli")
+    parser.add_argument("--siniflar", default=SINIF_DOSYASI, help="Model paket değilse sınıf isimleri dosyası")
+    parser.add_argument("--veri", default=DATASET_PATH)
+    parser.add_argument("--bolum", choices=['validation', 'training', 'tumu'], default='validation',
+                        help="Değerlendirilecek bölüm ('tumu' = ayrı bir test dizini için)")
+    parser.add_argument("--validation-split", type=float, default=0.2)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--is-parcacigi", type=int, default=None, help="Görüntü çözme iş parçacığı sayısı")
+    parser.add_argument("--cikti", help="Sonuçların yazılacağı JSON dosyası")
+    arka_uc_argumanlari(parser)
+    args = parser.parse_args()
+
+    yollar, etiketler, sinif_isimleri = dogrulama_ornekleri(args.veri, args.validation_split, args.bolum,
+                                                            model_sinif_isimleri(args.model, args.siniflar))
+    arka_uc = arka_uc_argumanlardan(args)
+    print(f"{len(yollar)} görüntü değerlendiriliyor ({args.bolum})...")
+    matris = degerlendir(arka_uc, yollar, etiketler, len(sinif_isimleri), args.batch_size, args.is_parcacigi)
+
+    print(matris.rapor(sinif_isimleri))
+    if isinstance(arka_uc, UyarlamaliArkaUcu):
+        print(f"\n{arka_uc.rapor()}")
+    print("\nKarışıklık matrisi (satır: gerçek, sütun: tahmin):")
+    print(matris.matris)
+    if args.cikti:
+        with open(args.cikti, 'w', encoding='utf-8') as f:
+            json.dump(matris.sozluk(sinif_isimleri), f, ensure_ascii=False, indent=2)
+        print(f"Sonuçlar kaydedildi: {args.cikti}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image
+from onisleme import goruntu_dizisi, normalize
+from toplu_siniflandirma import sirali_hazirla
+from tahmin_onbellegi import model_surumu
+from model_paketi import ModelPaketi, paket_mi, varsayilan_model
+
+# Sabit değişkenler - model_egitimi.py ile aynı olmalı
+MODEL_PATH = varsayilan_model()
+DATASET_PATH = "Rice_Image_Dataset"
+INDEKS_DIZINI = "gomme_indeksi"
+BATCH_SIZE = 256
+
+
+def gomme_modeli(model):
+    """Sınıflandırıcının çıkış katmanından önceki Dense katmanının aktivasyonlarını veren model"""
+    import tensorflow as tf
+
+    for katman in reversed(model.layers[:-1]):
+        if isinstance(katman, tf.keras.layers.Dense):
+            return tf.keras.Model(model.inputs, katman.output)
+    raise ValueError("Modelde çıkıştan önce Dense katmanı yok")
+
+
+def gomme_arka_ucu(model_yolu):
+    """Gömme modelini cikarim arka ucu olarak yükle (yalnızca Keras modelleri ve paketleri; TFLite ara katman vermez)"""
+    from cikarim import KerasArkaUcu
+
+    if model_yolu.endswith('.tflite') or (paket_mi(model_yolu) and ModelPaketi(model_yolu).tur == 'tflite'):
+        raise ValueError("Gömmeler için Keras modeli (.h5, .npz veya Keras paketi) gerekli")
+    return KerasArkaUcu.modelden(gomme_modeli(KerasArkaUcu(model_yolu, hizli_onbellek=True).model))
+
+
+def _birim(x):
+    """Satırları L2 normuna böl; iç çarpım kosinüs benzerliği olur"""
+    x = np.asarray(x, dtype=np.float32)
+    norm = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norm, 1e-12)
+
+
+def indeksi_olustur(model_yolu=MODEL_PATH, dataset_path=DATASET_PATH, dizin=INDEKS_DIZINI,
+                    batch_size=BATCH_SIZE, workers=None):
+    """Veri setindeki tüm görüntülerin gömmelerini hesaplayıp float16 olarak kaydet"""
+    import veri_onbellegi
+
+    yollar, etiketler, sinif_isimleri = veri_onbellegi.veri_setini_listele(dataset_path)
+    etiket_sozlugu = dict(zip(yollar, etiketler))
+    arka_uc = gomme_arka_ucu(model_yolu)
+    img_height, img_width = arka_uc.girdi_boyutu
+    boyut = int(arka_uc.model.output_shape[-1])
+
+    gommeler = np.empty((len(yollar), boyut), dtype=np.float16)
+    tampon = np.empty((batch_size, img_height, img_width, 3), dtype=np.float32)
+    kayitli_yollar = []
+    kayitli_etiketler = []
+    batch_baslangici = 0
+    baslangic = time.perf_counter()
+
+    def batch_isle():
+        n = len(kayitli_yollar) - batch_baslangici
+        gommeler[batch_baslangici:batch_baslangici + n] = _birim(arka_uc.tahmin(tampon[:n]))
+        return batch_baslangici + n
+
+    print(f"{len(yollar)} görüntünün gömmesi hesaplanıyor...")
+    with ThreadPoolExecutor(workers) as havuz:
+        for yol, dizi, hata, _ in sirali_hazirla(havuz, yollar, img_width, img_height, batch_size * 2):
+            if hata is not None:
+                print(f"Atlandı: {yol}: {hata}", file=sys.stderr)
+                continue
+            normalize(dizi, out=tampon[len(kayitli_yollar) - batch_baslangici])
+            kayitli_yollar.append(yol)
+            kayitli_etiketler.append(int(etiket_sozlugu[yol]))
+            if len(kayitli_yollar) - batch_baslangici == batch_size:
+                batch_baslangici = batch_isle()
+    if len(kayitli_yollar) > batch_baslangici:
+        batch_isle()
+
+    os.makedirs(dizin, exist_ok=True)
+    np.save(os.path.join(dizin, "gommeler.npy"), gommeler[:len(kayitli_yollar)])
+    with open(os.path.join(dizin, "bilgi.json"), 'w', encoding='utf-8') as f:
+        json.dump({
+            'model_surumu': model_surumu(model_yolu),
+            'sinif_isimleri': list(sinif_isimleri),
+            'yollar': kayitli_yollar,
+            'etiketler': kayitli_etiketler,
+        }, f, ensure_ascii=False)
+    print(f"{len(kayitli_yollar)} gömme ({boyut} boyutlu, float16) {time.perf_counter() - baslangic:.1f} sn'de "
+          f"hesaplandı: {dizin}")
+
+
+class GommeIndeksi:
+    """Birim uzunluklu gömmeler üzerinde vektörel kosinüs benzerliğiyle en yakın komşu araması
+
+    Bir sorgu tüm indeksle tek bir matris çarpımıyla karşılaştırılır; 75 bin görüntü ve
+    64 boyutlu gömmelerde bu birkaç milisaniye sürer, görüntüler yeniden okunmaz.
+    """
+
+    def __init__(self, dizin=INDEKS_DIZINI):
+        with open(os.path.join(dizin, "bilgi.json"), encoding='utf-8') as f:
+            bilgi = json.load(f)
+        self.model_surumu = bilgi['model_surumu']
+        self.sinif_isimleri = bilgi['sinif_isimleri']
+        self.yollar = bilgi['yollar']
+        self.etiketler = np.asarray(bilgi['etiketler'], dtype=np.int32)
+        # Diskte float16 saklanır; BLAS float16 çarpım desteklemediği için bellekte float32 tutulur
+        self.gommeler = np.load(os.path.join(dizin, "gommeler.npy")).astype(np.float32)
+
+    def __len__(self):
+        return len(self.yollar)
+
+    def ara(self, sorgular, k=5, sinif=None):
+        """(n, boyut) sorgu gömmelerinin her biri için en benzer k görüntüyü döndür"""
+        gommeler = self.gommeler
+        indeksler = None
+        if sinif is not None:
+            indeksler = np.flatnonzero(self.etiketler == self.sinif_isimleri.index(sinif))
+            gommeler = gommeler[indeksler]
+        skorlar = _birim(np.atleast_2d(sorgular)) @ gommeler.T
+        k = min(k, skorlar.shape[1])
+        if k <= 0:
+            return [[] for _ in skorlar]
+        # Tam sıralama yerine önce en iyi k aday seçilir, yalnızca onlar sıralanır
+        adaylar = np.argpartition(-skorlar, k - 1, axis=1)[:, :k]
+        sonuclar = []
+        for satir, aday in zip(skorlar, adaylar):
+            aday = aday[np.argsort(-satir[aday])]
+            kayitlar = aday if indeksler is None else indeksler[aday]
+            sonuclar.append([
+                {'dosya': self.yollar[j], 'sinif': self.sinif_isimleri[self.etiketler[j]], 'benzerlik': float(satir[i])}
+                for i, j in zip(aday, kayitlar)
+            ])
+        return sonuclar
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Eğitim görüntüleri arasında benzer taneleri bul")
+    parser.add_argument("sorgular", nargs='*', help="Benzerleri aranacak görüntüler")
+    parser.add_argument("--olustur", action='store_true', help="Veri setinin gömme indeksini oluştur")
+    parser.add_argument("-k", type=int, default=5, help="Görüntü başına döndürülecek benzer görüntü sayısı")
+    parser.add_argument("--sinif", help="Yalnızca bu sınıfın görüntüleri arasında ara")
+    parser.add_argument("--model", default=MODEL_PATH, help="Keras (.h5, .npz) modeli veya Keras model paketi (.pirinc)")
+    parser.add_argument("--veri", default=DATASET_PATH)
+    parser.add_argument("--dizin", default=INDEKS_DIZINI, help="İndeks dizini")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--is-parcacigi", type=int, default=None, help="Görüntü çözme iş parçacığı sayısı")
+    parser.add_argument("--json", action='store_true', help="Sonuçları JSON olarak yazdır")
+    args = parser.parse_args()
+
+    if args.olustur:
+        indeksi_olustur(args.model, args.veri, args.dizin, args.batch_size, args.is_parcacigi)
+    if not args.sorgular:
+        if not args.olustur:
+            parser.error("Sorgu görüntüsü veya --olustur gerekli")
+        return
+
+    indeks = GommeIndeksi(args.dizin)
+    if args.sinif is not None and args.sinif not in indeks.sinif_isimleri:
+        parser.error(f"Bilinmeyen sınıf: {args.sinif} (seçenekler: {', '.join(indeks.sinif_isimleri)})")
+    if indeks.model_surumu != model_surumu(args.model):
+        print("Uyarı: indeks farklı bir modelle oluşturulmuş, --olustur ile yenileyin", file=sys.stderr)
+    arka_uc = gomme_arka_ucu(args.model)
+    img_height, img_width = arka_uc.girdi_boyutu
+
+    x = np.empty((len(args.sorgular), img_height, img_width, 3), dtype=np.float32)
+    for i, yol in enumerate(args.sorgular):
+        with Image.open(yol) as img:
+            normalize(goruntu_dizisi(img, img_width, img_height), out=x[i])
+    sorgu_gommeleri = arka_uc.tahmin(x)
+
+    baslangic = time.perf_counter()
+    sonuclar = indeks.ara(sorgu_gommeleri, args.k, args.sinif)
+    sure = time.perf_counter() - baslangic
+
+    if args.json:
+        print(json.dumps(dict(zip(args.sorgular, sonuclar)), ensure_ascii=False, indent=2))
+        return
+    for yol, benzerler in zip(args.sorgular, sonuclar):
+        print(f"\n{yol}")
+        for sira, b in enumerate(benzerler, 1):
+            print(f"{sira:>3}. {b['benzerlik']:.4f}  {b['sinif']:<12}{b['dosya']}")
+    print(f"\n{len(indeks)} görüntü içinde arama: {sure * 1000:.2f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import sys
+import json
+import time
+import argparse
+import subprocess
+import numpy as np
+
+# Sabit değişkenler - model_egitimi.py ile aynı olmalı
+IMG_WIDTH = 150
+IMG_HEIGHT = 150
+BATCH_SIZE = 32
+SONUC_DOSYASI = "hassasiyet_sonuclari.json"
+
+MODLAR = [
+    ('float32', False),
+    ('float32', True),
+    ('mixed_bfloat16', False),
+    ('mixed_bfloat16', True),
+]
+
+
+def _ms(sureler):
+    return float(np.median(sureler) * 1000)
+
+
+def modu_olc(hassasiyet, xla, sinif_sayisi, batch_size, tekrar):
+    """Tek bir hassasiyet/XLA modunda eğitim adımı ve tahmin süresini ölç (alt süreçte)"""
+    import tensorflow as tf
+    from model_mimarisi import model_olustur
+
+    # Genel hassasiyet modeli oluşturmadan önce ayarlanmalı; bu yüzden her mod ayrı süreçte ölçülür
+    tf.keras.mixed_precision.set_global_policy(hassasiyet)
+    model = model_olustur(sinif_sayisi, IMG_WIDTH, IMG_HEIGHT)
+    model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'], jit_compile=xla)
+
+    rng = np.random.default_rng(0)
+    x = rng.random((batch_size, IMG_HEIGHT, IMG_WIDTH, 3), dtype=np.float32)
+    y = np.eye(sinif_sayisi, dtype=np.float32)[rng.integers(0, sinif_sayisi, batch_size)]
+
+    def sure_olc(fonksiyon):
+        # İlk çağrılar izleme ve XLA derlemesini içerir, ölçüme katılmaz
+        for _ in range(3):
+            fonksiyon()
+        sureler = []
+        for _ in range(tekrar):
+            baslangic = time.perf_counter()
+            fonksiyon()
+            sureler.append(time.perf_counter() - baslangic)
+        return sureler
+
+    egitim = sure_olc(lambda: model.train_on_batch(x, y))
+    tekli = sure_olc(lambda: model.predict_on_batch(x[:1]))
+    toplu = sure_olc(lambda: model.predict_on_batch(x))
+    return {
+        'hassasiyet': hassasiyet,
+        'xla': xla,
+        'egitim_adimi_ms': _ms(egitim),
+        'egitim_goruntu_sn': batch_size / float(np.median(egitim)),
+        'tahmin_ms_batch1': _ms(tekli),
+        f'tahmin_ms_batch{batch_size}': _ms(toplu),
+        'cikti_tipi': str(model.output.dtype.name),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="float32 / bfloat16 ve XLA modlarında eğitim adımı ve tahmin süresi")
+    parser.add_argument("--sinif-sayisi", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--tekrar", type=int, default=20)
+    parser.add_argument("--zorla", action="store_true", help="CPU desteklemese de bfloat16 modlarını ölç")
+    parser.add_argument("--cikti", default=SONUC_DOSYASI)
+    parser.add_argument("--olc", help=argparse.SUPPRESS)
+    parser.add_argument("--xla", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.olc:
+        print(json.dumps(modu_olc(args.olc, args.xla, args.sinif_sayisi, args.batch_size, args.tekrar)))
+        return
+
+    from model_mimarisi import bf16_destekleniyor
+
+    modlar = MODLAR
+    if not bf16_destekleniyor() and not args.zorla:
+        print("CPU bfloat16 desteklemiyor; yalnızca float32 modları ölçülüyor (--zorla ile hepsi)")
+        modlar = [m for m in MODLAR if m[0] == 'float32']
+
+    sonuclar = []
+    for hassasiyet, xla in modlar:
+        komut = [sys.executable, __file__, "--olc", hassasiyet, "--sinif-sayisi", str(args.sinif_sayisi),
+                 "--batch-size", str(args.batch_size), "--tekrar", str(args.tekrar)]
+        if xla:
+            komut.append("--xla")
+        cikti = subprocess.run(komut, check=True, stdout=subprocess.PIPE, text=True).stdout
+        sonuclar.append(json.loads(cikti.strip().splitlines()[-1]))
+
+    toplu_anahtar = f'tahmin_ms_batch{args.batch_size}'
+    print(f"\n{'Hassasiyet':<16}{'XLA':<7}{'Eğitim adımı ms':>17}{'görüntü/sn':>12}"
+          f"{'Tahmin ms (1)':>15}{f'Tahmin ms ({args.batch_size})':>16}")
+    for s in sonuclar:
+        print(f"{s['hassasiyet']:<16}{'açık' if s['xla'] else 'kapalı':<7}{s['egitim_adimi_ms']:>17.2f}"
+              f"{s['egitim_goruntu_sn']:>12.1f}{s['tahmin_ms_batch1']:>15.2f}{s[toplu_anahtar]:>16.2f}")
+
+    with open(args.cikti, 'w', encoding='utf-8') as f:
+        json.dump(sonuclar, f, ensure_ascii=False, indent=2)
+    print(f"\nSonuçlar kaydedildi: {args.cikti}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+import os
+import sys
+import time
+import queue
+import select
+import signal
+import struct
+import ctypes
+import ctypes.util
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from onisleme import normalize
+from cikarim import arka_uc_argumanlari, arka_uc_argumanlardan, onbellek_eki, sinif_isimleri_yukle
+from tahmin_onbellegi import onbellek_ac
+from toplu_siniflandirma import (
+    SonucYazici, islenmis_dosyalar, sirali_hazirla, GECERLI_UZANTILAR, MODEL_PATH, SINIF_DOSYASI
+)
+
+CIKTI_DOSYASI = "izleme_sonuclari.jsonl"
+
+# inotify olay maskeleri (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+_OLAY = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+def _inotify():
+    """Linux'ta inotify işlevlerini içeren libc'yi döndür; yoksa None"""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class DizinIzleyici(threading.Thread):
+    """Dizine yeni gelen görüntülerin yollarını sınırlı kuyruğa koyar
+
+    Kuyruk doluyken yeni yollar beklenir (geri basınç); bellekte yalnızca yollar tutulur.
+    inotify yoksa dizin zamanı değiştiğinde taranır, boyutu iki yoklama arasında değişmeyen
+    (yazılması bitmiş) dosyalar kuyruğa alınır.
+    """
+
+    def __init__(self, dizin, kuyruk, islenmis=(), yoklama=False, yoklama_araligi=1.0):
+        super().__init__(name="DizinIzleyici", daemon=True)
+        self.dizin = os.path.normpath(dizin)
+        self.kuyruk = kuyruk
+        self.bilinen = set(islenmis)
+        self.yoklama_araligi = yoklama_araligi
+        self.libc = None if yoklama else _inotify()
+        self.dur = threading.Event()
+
+    def _yeni_dosyalar(self):
+        """Dizindeki henüz kuyruğa alınmamış görüntü yollarını sıralı döndür"""
+        with os.scandir(self.dizin) as girisler:
+            adlar = sorted(g.name for g in girisler if g.is_file() and g.name.lower().endswith(GECERLI_UZANTILAR))
+        yollar = (os.path.join(self.dizin, ad) for ad in adlar)
+        return [yol for yol in yollar if yol not in self.bilinen]
+
+    def _koy(self, yol):
+        if yol in self.bilinen or not yol.lower().endswith(GECERLI_UZANTILAR):
+            return
+        self.bilinen.add(yol)
+        while not self.dur.is_set():
+            try:
+                self.kuyruk.put(yol, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def run(self):
+        try:
+            if self.libc is not None:
+                try:
+                    self._inotify_izle()
+                    return
+                except OSError as e:
+                    print(f"inotify kullanılamadı ({e}), yoklamaya geçiliyor", file=sys.stderr)
+            self._yokla()
+        finally:
+            # İzleyici hata ile biterse sınıflandırma döngüsü de durur
+            self.dur.set()
+
+    def _inotify_izle(self):
+        fd = self.libc.inotify_init1(os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        try:
+            if self.libc.inotify_add_watch(fd, os.fsencode(self.dizin), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+                raise OSError(ctypes.get_errno(), "inotify_add_watch", self.dizin)
+            print(f"{self.dizin} inotify ile izleniyor", file=sys.stderr)
+            # Mevcut dosyalar izleme kurulduktan sonra taranır; arada gelenler kaçmaz
+            for yol in self._yeni_dosyalar():
+                self._koy(yol)
+            while not self.dur.is_set():
+                if not select.select([fd], [], [], 0.5)[0]:
+                    continue
+                veri = os.read(fd, 1 << 16)
+                konum = 0
+                while konum < len(veri):
+                    _, maske, _, uzunluk = _OLAY.unpack_from(veri, konum)
+                    konum += _OLAY.size
+                    ad = veri[konum:konum + uzunluk].rstrip(b'\0')
+                    konum += uzunluk
+                    if maske & IN_Q_OVERFLOW:
+                        # Kuyruk doluyken çekirdekteki olay kuyruğu taştı; kaçan dosyalar taranarak bulunur
+                        for yol in self._yeni_dosyalar():
+                            self._koy(yol)
+                    elif ad:
+                        self._koy(os.path.join(self.dizin, os.fsdecode(ad)))
+        finally:
+            os.close(fd)
+
+    def _yokla(self):
+        print(f"{self.dizin} {self.yoklama_araligi} sn aralıkla yoklanıyor", file=sys.stderr)
+        dizin_zamani = None
+        adaylar = {}  # yol -> (boyut, değişim zamanı) son yoklamada
+        while not self.dur.is_set():
+            # Dizin yalnızca içine dosya eklenip çıkarıldığında taranır
+            zaman = os.stat(self.dizin).st_mtime_ns
+            if zaman != dizin_zamani:
+                dizin_zamani = zaman
+                for yol in self._yeni_dosyalar():
+                    adaylar.setdefault(yol, None)
+            for yol, onceki in list(adaylar.items()):
+                try:
+                    st = os.stat(yol)
+                except FileNotFoundError:
+                    del adaylar[yol]
+                    continue
+                simdi = (st.st_size, st.st_mtime_ns)
+                if simdi == onceki:
+                    del adaylar[yol]
+                    self._koy(yol)
+                else:
+                    adaylar[yol] = simdi
+            self.dur.wait(self.yoklama_araligi)
+
+
+class DonenSonucYazici(SonucYazici):
+    """Dosya en_buyuk_bayt'ı aşınca RotatingFileHandler gibi .1, .2 ... yedeklerine döner"""
+
+    def __init__(self, yol, bicim, sinif_isimleri, en_buyuk_bayt=0, yedek_sayisi=5):
+        super().__init__(yol, bicim, sinif_isimleri)
+        self.yol = yol
+        self.en_buyuk_bayt = en_buyuk_bayt
+        self.yedek_sayisi = yedek_sayisi
+
+    def yedekler(self):
+        return [f"{self.yol}.{i}" for i in range(1, self.yedek_sayisi + 1)]
+
+    def flush(self):
+        super().flush()
+        if self.en_buyuk_bayt and self.dosya is not sys.stdout and self.dosya.tell() >= self.en_buyuk_bayt:
+            self._dondur()
+
+    def _dondur(self):
+        self.close()
+        if self.yedek_sayisi:
+            for i in range(self.yedek_sayisi - 1, 0, -1):
+                if os.path.exists(f"{self.yol}.{i}"):
+                    os.replace(f"{self.yol}.{i}", f"{self.yol}.{i + 1}")
+            os.replace(self.yol, f"{self.yol}.1")
+        else:
+            os.remove(self.yol)
+        SonucYazici.__init__(self, self.yol, self.bicim, self.sinif_isimleri)
+
+
+def batch_topla(kuyruk, batch_size, bekleme, dur):
+    """İlk yolu bekle, ardından batch dolana veya bekleme süresi bitene kadar gelenleri topla"""
+    while not dur.is_set():
+        try:
+            batch = [kuyruk.get(timeout=0.5)]
+        except queue.Empty:
+            continue
+        son = time.monotonic() + bekleme
+        while len(batch) < batch_size:
+            kalan = son - time.monotonic()
+            if kalan <= 0:
+                break
+            try:
+                batch.append(kuyruk.get(timeout=kalan))
+            except queue.Empty:
+                break
+        return batch
+    return []
+
+
+def izle(izleyici, arka_uc, yazici, batch_size=64, bekleme=0.5, workers=None, onbellek=None, rapor_araligi=30.0):
+    """Kuyruktaki yolları batch'ler halinde sınıflandırıp çıktıya ekle; izleyici durana kadar çalışır"""
+    img_height, img_width = arka_uc.girdi_boyutu
+    # Tampon batch boyutuyla sınırlıdır; dosya patlamasında bellek büyümez
+    tampon = np.empty((batch_size, img_height, img_width, 3), dtype=np.float32)
+    toplam = 0
+    hatali = 0
+    baslangic = time.perf_counter()
+    son_rapor = baslangic
+
+    with ThreadPoolExecutor(workers) as havuz:
+        while True:
+            yollar = batch_topla(izleyici.kuyruk, batch_size, bekleme, izleyici.dur)
+            if not yollar:
+                break
+            batch_yollari = []
+            batch_ozetleri = []
+            for yol, dizi, hata, bilgi in sirali_hazirla(havuz, yollar, img_width, img_height, batch_size,
+                                                          onbellek):
+                if hata is not None:
+                    yazici.yaz(yol, hata=hata)
+                    hatali += 1
+                elif bilgi is not None and bilgi[1] is not None:
+                    yazici.yaz(yol, bilgi[1])
+                    toplam += 1
+                else:
+                    normalize(dizi, out=tampon[len(batch_yollari)])
+                    batch_yollari.append(yol)
+                    if bilgi is not None:
+                        batch_ozetleri.append(bilgi[0])
+            if batch_yollari:
+                olasiliklar = arka_uc.tahmin(tampon[:len(batch_yollari)])
+                for yol, p in zip(batch_yollari, olasiliklar):
+                    yazici.yaz(yol, p)
+                if onbellek is not None:
+                    onbellek.koy_coklu(zip(batch_ozetleri, olasiliklar))
+                toplam += len(batch_yollari)
+            yazici.flush()
+
+            simdi = time.perf_counter()
+            if simdi - son_rapor >= rapor_araligi:
+                print(f"{toplam} görüntü sınıflandırıldı, {hatali} hata, kuyrukta {izleyici.kuyruk.qsize()}",
+                      file=sys.stderr)
+                son_rapor = simdi
+
+    print(f"Durduruldu: {toplam} görüntü, {hatali} hata, {time.perf_counter() - baslangic:.1f} sn", file=sys.stderr)
+    return toplam, hatali
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bir dizini izleyip gelen görüntüleri sürekli sınıflandır")
+    parser.add_argument("dizin", help="İzlenecek dizin")
+    parser.add_argument("--cikti", default=CIKTI_DOSYASI, help="Sonuçların eklendiği dönen çıktı dosyası")
+    parser.add_argument("--bicim", choices=['csv', 'jsonl'], default=None,
+                        help="Çıktı biçimi (varsayılan: dosya uzantısından, yoksa jsonl)")
+    parser.add_argument("--model", default=MODEL_PATH, help="Model paketi (.pirinc), Keras (.h5) veya TFLite (.tflite) modeli")
+    parser.add_argument("--siniflar", default=SINIF_DOSYASI, help="Model paket değilse sınıf isimleri dosyası")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--bekleme", type=float, default=0.5, help="Batch dolmadan önce en fazla bekleme (sn)")
+    parser.add_argument("--kuyruk", type=int, default=1024, help="Sınıflandırılmayı bekleyen en fazla dosya")
+    parser.add_argument("--is-parcacigi", type=int, default=None, help="Ön işleme iş parçacığı sayısı")
+    parser.add_argument("--yoklama", action='store_true', help="inotify yerine yoklama kullan (ör. ağ dizinleri)")
+    parser.add_argument("--yoklama-araligi", type=float, default=1.0)
+    parser.add_argument("--en-buyuk-mb", type=float, default=100, help="Çıktı dosyası bu boyutu aşınca döner")
+    parser.add_argument("--yedek", type=int, default=5, help="Saklanan eski çıktı dosyası sayısı")
+    parser.add_argument("--onbellek", default="", help="Görüntü içeriğine göre tahmin önbelleği (SQLite dosyası)")
+    arka_uc_argumanlari(parser)
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.dizin):
+        parser.error(f"Dizin bulunamadı: {args.dizin}")
+    bicim = args.bicim or ('csv' if args.cikti.lower().endswith('.csv') else 'jsonl')
+
+    arka_uc = arka_uc_argumanlardan(args)
+    sinif_isimleri = sinif_isimleri_yukle(args.model, args.siniflar)
+    yazici = DonenSonucYazici(args.cikti, bicim, sinif_isimleri, int(args.en_buyuk_mb * 1024 * 1024), args.yedek)
+
+    # Önceki çalışmalarda çıktıya (ve yedeklerine) yazılmış dosyalar yeniden sınıflandırılmaz
+    islenmis = set()
+    for yol in [args.cikti] + yazici.yedekler():
+        islenmis |= islenmis_dosyalar(yol, bicim)
+    if islenmis:
+        print(f"{len(islenmis)} dosya daha önce işlenmiş, atlanıyor", file=sys.stderr)
+
+    izleyici = DizinIzleyici(args.dizin, queue.Queue(maxsize=args.kuyruk), islenmis, args.yoklama,
+                             args.yoklama_araligi)
+    # Durdurulunca elindeki batch bitirilir; kuyrukta kalanlar sonraki açılışta taranarak bulunur
+    for sinyal in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sinyal, lambda *_: izleyici.dur.set())
+
+    onbellek = onbellek_ac(args.onbellek, args.model, ek=onbellek_eki(arka_uc))
+    izleyici.start()
+    try:
+        izle(izleyici, arka_uc, yazici, args.batch_size, args.bekleme, args.is_parcacigi, onbellek)
+    finally:
+        izleyici.dur.set()
+        yazici.close()
+        if onbellek is not None:
+            onbellek.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import json
+import argparse
+import numpy as np
+from cikarim import arka_uc_yukle, kalibrasyon_yolu, sicaklik_uygula
+from degerlendirme import degerlendir, dogrulama_ornekleri, model_sinif_isimleri, MODEL_PATH, DATASET_PATH, BATCH_SIZE
+from model_paketi import SINIF_DOSYASI
+from tahmin_onbellegi import model_surumu
+
+# Güvenilirlik diyagramı ve ECE için aralık sayısı
+KUTU_SAYISI = 15
+
+
+def nll(olasiliklar, etiketler):
+    """Ortalama negatif log olabilirlik"""
+    return float(-np.mean(np.log(np.maximum(olasiliklar[np.arange(len(etiketler)), etiketler], 1e-12))))
+
+
+def ece(olasiliklar, etiketler, kutu_sayisi=KUTU_SAYISI):
+    """Beklenen kalibrasyon hatası: güven aralıklarında |doğruluk - ortalama güven| ağırlıklı ortalaması"""
+    guven = olasiliklar.max(axis=1)
+    dogru = olasiliklar.argmax(axis=1) == etiketler
+    kutular = np.minimum((guven * kutu_sayisi).astype(np.int64), kutu_sayisi - 1)
+    hata = 0.0
+    for k in range(kutu_sayisi):
+        secim = kutular == k
+        if secim.any():
+            hata += secim.mean() * abs(dogru[secim].mean() - guven[secim].mean())
+    return float(hata)
+
+
+def sicaklik_bul(olasiliklar, etiketler, alt=0.05, ust=20.0, adim=60):
+    """Doğrulama NLL'ini en küçük yapan sıcaklığı log ölçekte altın oran aramasıyla bul"""
+    def kayip(log_t):
+        return nll(sicaklik_uygula(olasiliklar, np.exp(log_t)), etiketler)
+
+    oran = (np.sqrt(5) - 1) / 2
+    a, b = np.log(alt), np.log(ust)
+    c, d = b - oran * (b - a), a + oran * (b - a)
+    kc, kd = kayip(c), kayip(d)
+    for _ in range(adim):
+        if kc < kd:
+            b, d, kd = d, c, kc
+            c = b - oran * (b - a)
+            kc = kayip(c)
+        else:
+            a, c, kc = c, d, kd
+            d = a + oran * (b - a)
+            kd = kayip(d)
+    return float(np.exp((a + b) / 2))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Doğrulama bölümünde sıcaklık ölçekleme ile güven kalibrasyonu yap ve modelin yanına kaydet"
+    )
+    parser.add_argument("--model", default=MODEL_PATH, help="Model paketi (.pirinc), Keras (.h5, .npz) veya TFLite (.tflite) modeli")
+    parser.add_argument("--siniflar", default=SINIF_DOSYASI, help="Model paket değilse sınıf isimleri dosyası")
+    parser.add_argument("--veri", default=DATASET_PATH)
+    parser.add_argument("--validation-split", type=float, default=0.2)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--is-parcacigi", type=int, default=None, help="Görüntü çözme iş parçacığı sayısı")
+    args = parser.parse_args()
+
+    yollar, etiketler, sinif_isimleri = dogrulama_ornekleri(args.veri, args.validation_split, 'validation',
+                                                            model_sinif_isimleri(args.model, args.siniflar))
+    arka_uc = arka_uc_yukle(args.model)
+    toplanan_etiketler = []
+    toplanan_olasiliklar = []
+
+    def topla(batch_etiketleri, olasiliklar):
+        toplanan_etiketler.append(batch_etiketleri)
+        toplanan_olasiliklar.append(olasiliklar.astype(np.float32))
+
+    print(f"{len(yollar)} doğrulama görüntüsü modelden geçiriliyor...")
+    degerlendir(arka_uc, yollar, etiketler, len(sinif_isimleri), args.batch_size, args.is_parcacigi, topla)
+    y = np.concatenate(toplanan_etiketler)
+    p = np.concatenate(toplanan_olasiliklar)
+
+    sicaklik = sicaklik_bul(p, y)
+    kalibre = sicaklik_uygula(p, sicaklik)
+    sonuc = {
+        'model_surumu': model_surumu(args.model),
+        'sicaklik': sicaklik,
+        'ornek_sayisi': int(len(y)),
+        'dogruluk': float(np.mean(p.argmax(axis=1) == y)),
+        'once': {'nll': nll(p, y), 'ece': ece(p, y), 'ortalama_guven': float(p.max(axis=1).mean())},
+        'sonra': {'nll': nll(kalibre, y), 'ece': ece(kalibre, y), 'ortalama_guven': float(kalibre.max(axis=1).mean())},
+    }
+
+    print(f"\nSıcaklık: {sicaklik:.4f} (doğruluk {sonuc['dogruluk']:.4f})")
+    print(f"{'':<10}{'NLL':>10}{'ECE':>10}{'Ort. güven':>12}")
+    for ad in ('once', 'sonra'):
+        m = sonuc[ad]
+        print(f"{'Önce' if ad == 'once' else 'Sonra':<10}{m['nll']:>10.4f}{m['ece']:>10.4f}{m['ortalama_guven']:>12.4f}")
+
+    yol = kalibrasyon_yolu(args.model)
+    with open(yol, 'w', encoding='utf-8') as f:
+        json.dump(sonuc, f, ensure_ascii=False, indent=2)
+    print(f"Kalibrasyon kaydedildi: {yol}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+import tensorflow as tf
+
+KONTROL_DIZINI = "kontrol_noktalari"
+SAKLANAN = 3
+
+
+def kontrol_dizini(kok, varyant, yapilandirma):
+    """Varyant ve eğitim ayarlarına özgü kontrol noktası dizinini döndür
+
+    Farklı varyant, girdi boyutu veya veri setiyle başlatılan eğitim başka bir
+    çalışmanın kontrol noktasını (uyumsuz ağırlık şekilleriyle) yüklemeye çalışmaz.
+    """
+    ozet = hashlib.sha1(json.dumps(yapilandirma, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    return os.path.join(kok, f"{varyant}_{ozet[:12]}")
+
+
+def _np_durumu_al():
+    ad, anahtarlar, konum, gauss_var, gauss = np.random.get_state()
+    return [ad, anahtarlar.tolist(), konum, gauss_var, gauss]
+
+
+def _np_durumu_yukle(durum):
+    ad, anahtarlar, konum, gauss_var, gauss = durum
+    np.random.set_state((ad, np.array(anahtarlar, dtype=np.uint32), konum, gauss_var, gauss))
+
+
+def _veri_durumu_al(veri):
+    """Sequence tabanlı yükleyicinin bu epoch'taki örnek sırasını ve RNG durumunu al"""
+    if veri is None:
+        return None
+    if hasattr(veri, 'sira'):
+        # veri_onbellegi.OnbellekSequence
+        return {'sira': veri.sira.tolist(), 'rng': veri.rng.bit_generator.state}
+    if getattr(veri, 'index_array', None) is not None:
+        # DirectoryIterator (sırayı numpy'ın genel RNG'si ile karıştırır)
+        return {'index_array': veri.index_array.tolist()}
+    return None
+
+
+def _veri_durumu_yukle(veri, durum):
+    if veri is None or durum is None:
+        return
+    if 'sira' in durum:
+        veri.sira = np.array(durum['sira'], dtype=veri.sira.dtype)
+        veri.rng.bit_generator.state = durum['rng']
+    elif 'index_array' in durum:
+        veri.index_array = np.array(durum['index_array'], dtype=np.int64)
+
+
+class _KalanBatchler(tf.keras.utils.Sequence):
+    """Yarıda kalan bir epoch'un kalan batch'lerini veren Sequence"""
+
+    def __init__(self, veri, atla):
+        self.veri = veri
+        self.atla = atla
+
+    def __len__(self):
+        return len(self.veri) - self.atla
+
+    def __getitem__(self, idx):
+        return self.veri[idx + self.atla]
+
+    def on_epoch_end(self):
+        self.veri.on_epoch_end()
+
+
+def kalan_veri(veri, atla):
+    """Eğitim verisinin epoch başından atla kadar batch'i geçilmiş görünümünü döndür"""
+    if isinstance(veri, tf.data.Dataset):
+        return veri.skip(atla)
+    return _KalanBatchler(veri, atla)
+
+
+class TamDurumKaydedici(tf.keras.callbacks.Callback):
+    """Model, optimizer, epoch/adım, RNG ve veri sırasını periyodik olarak asenkron kaydeden callback
+
+    Kontrol noktaları dizinde tf.train.CheckpointManager ile tutulur; en yeni `saklanan`
+    tanesi dışındakiler silinir. geri_yukle() en son kontrol noktasını yükler ve eğitime
+    kaldığı epoch ile o epoch'ta atlanacak batch sayısını döndürür.
+
+    Diğer callback'lerin durumu (EarlyStopping / ReduceLROnPlateau sayaçları ve en iyi
+    ağırlıkları) kaydedilmez; devam edilen eğitimde bu sayaçlar sıfırdan başlar.
+    """
+
+    def __init__(self, model, dizin=KONTROL_DIZINI, veri=None, her_adim=0, saklanan=SAKLANAN, asenkron=True):
+        super().__init__()
+        self.dizin = dizin
+        self.veri = veri
+        self.her_adim = her_adim
+        self.epoch = 0
+        self.adim = 0
+        self.gecmis = {}
+        self._baslangic_adim = 0
+
+        self._epoch = tf.Variable(0, dtype=tf.int64, trainable=False)
+        self._adim = tf.Variable(0, dtype=tf.int64, trainable=False)
+        self._durum = tf.Variable("", dtype=tf.string, trainable=False)
+        self.checkpoint = tf.train.Checkpoint(
+            model=model, optimizer=model.optimizer, epoch=self._epoch, adim=self._adim,
+            durum=self._durum, tf_rng=tf.random.get_global_generator()
+        )
+        self.yonetici = tf.train.CheckpointManager(self.checkpoint, dizin, max_to_keep=saklanan)
+        # Değişkenler belleğe kopyalandıktan sonra dosyaya yazma arka planda yapılır. Yazmanın bitmesi
+        # yalnızca Checkpoint.sync() ile beklenebildiği için o yoksa (ör. TF 2.10) kayıtlar eşzamanlıdır;
+        # aksi halde tamamla() dizini silerken son kayıt hâlâ yazılıyor olabilir
+        self.asenkron = asenkron and hasattr(self.checkpoint, 'sync')
+        self.secenekler = tf.train.CheckpointOptions()
+        if self.asenkron:
+            try:
+                self.secenekler = tf.train.CheckpointOptions(experimental_enable_async_checkpoint=True)
+            except TypeError:
+                self.asenkron = False
+
+    def geri_yukle(self):
+        """En son kontrol noktasını yükle; (başlangıç epoch'u, atlanacak batch sayısı) döndür"""
+        yol = self.yonetici.latest_checkpoint
+        if yol is None:
+            return 0, 0
+        self.checkpoint.restore(yol)
+        self.epoch = int(self._epoch.numpy())
+        self.adim = int(self._adim.numpy())
+        durum = json.loads(self._durum.numpy().decode('utf-8'))
+        self.gecmis = durum['gecmis']
+        _np_durumu_yukle(durum['np_rng'])
+        _veri_durumu_yukle(self.veri, durum['veri'])
+        if self.adim == 0 and self.veri is not None and hasattr(self.veri, 'on_epoch_end'):
+            # Epoch sonunda kaydedildi: kesintisiz eğitimde olduğu gibi sıra yeniden karıştırılır
+            self.veri.on_epoch_end()
+        self._baslangic_adim = self.adim
+        print(f"Kontrol noktasından devam ediliyor: {yol} (epoch {self.epoch + 1}, adım {self.adim})")
+        return self.epoch, self.adim
+
+    def kaydet(self):
+        self._epoch.assign(self.epoch)
+        self._adim.assign(self.adim)
+        self._durum.assign(json.dumps({
+            'gecmis': self.gecmis,
+            'np_rng': _np_durumu_al(),
+            'veri': _veri_durumu_al(self.veri),
+        }))
+        self.yonetici.save(options=self.secenekler)
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.epoch = epoch
+        self.adim = self._baslangic_adim
+        self._baslangic_adim = 0
+
+    def on_train_batch_end(self, batch, logs=None):
+        self.adim += 1
+        if self.her_adim and self.adim % self.her_adim == 0:
+            self.kaydet()
+
+    def on_epoch_end(self, epoch, logs=None):
+        for anahtar, deger in (logs or {}).items():
+            self.gecmis.setdefault(anahtar, []).append(float(deger))
+        self.epoch = epoch + 1
+        self.adim = 0
+        self.kaydet()
+
+    def _bekle(self):
+        """Bekleyen asenkron yazmanın bitmesini bekle"""
+        if self.asenkron:
+            self.checkpoint.sync()
+
+    def on_train_end(self, logs=None):
+        # Süreç bitmeden bekleyen asenkron yazma tamamlanmalı
+        self._bekle()
+
+    def tamamla(self):
+        """Eğitim tamamlandı: kontrol noktalarını sil, sonraki çalıştırma sıfırdan başlasın
+
+        Yalnızca yarıda kesilen eğitimler devam ettirilir; bitmiş bir eğitimin son epoch'u
+        yüklenirse yeni çalıştırma hiç eğitim yapmadan eski ağırlıkları yeniden kaydederdi.
+        """
+        self._bekle()
+        shutil.rmtree(self.dizin, ignore_errors=True)
@@ -0,0 +1,227 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import platform
+import argparse
+import subprocess
+import numpy as np
+from PIL import Image
+from model_paketi import varsayilan_model
+
+# Sabit değişkenler - model_egitimi.py ile aynı olmalı
+MODEL_PATH = varsayilan_model()
+DATASET_PATH = "Rice_Image_Dataset"
+SONUC_DOSYASI = "benchmark_sonuclari.json"
+
+KAYNAKLAR = ('sentetik', 'gercek', 'cozme')
+
+
+def _liste(deger, tip=int):
+    return [tip(v) for v in deger.split(',') if v.strip()]
+
+
+def model_ozeti(yol):
+    """Sürümler arası karşılaştırma için model dosyasının SHA-1 özetini döndür"""
+    ozet = hashlib.sha1()
+    with open(yol, 'rb') as f:
+        for parca in iter(lambda: f.read(1 << 20), b''):
+            ozet.update(parca)
+    return ozet.hexdigest()
+
+
+def ornek_yollari(dataset_path, adet):
+    """Veri setinden sınıflara yayılmış, her çalışmada aynı olan örnek yolları seç"""
+    yollar = sorted(
+        os.path.join(kok, dosya)
+        for kok, _, dosyalar in os.walk(dataset_path)
+        for dosya in dosyalar
+        if dosya.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp'))
+    )
+    if not yollar:
+        raise FileNotFoundError(f"Görüntü bulunamadı: {dataset_path}")
+    return [yollar[i] for i in np.linspace(0, len(yollar) - 1, adet).astype(int)]
+
+
+def _sureleri_ozetle(sureler, batch_size):
+    sureler = np.asarray(sureler)
+    return {
+        'gecikme_ms_p50': float(np.percentile(sureler, 50) * 1000),
+        'gecikme_ms_p90': float(np.percentile(sureler, 90) * 1000),
+        'gecikme_ms_p99': float(np.percentile(sureler, 99) * 1000),
+        'goruntu_basina_ms': float(sureler.mean() / batch_size * 1000),
+        'verim_goruntu_sn': float(batch_size * len(sureler) / sureler.sum()),
+    }
+
+
+def yapilandirmayi_olc(model_yolu, intra, inter, batch_boyutlari, kaynaklar, dataset_path, adet, tekrar):
+    """Tek bir iş parçacığı ayarında tüm batch boyutlarını ve girdi kaynaklarını ölç (alt süreçte)"""
+    from onisleme import goruntu_onisle
+
+    if not model_yolu.endswith('.tflite'):
+        import tensorflow as tf
+
+        # Bu ayarlar TensorFlow çalışma zamanı başlamadan yapılmalı; bu yüzden her ayar ayrı süreçte ölçülür
+        tf.config.threading.set_intra_op_parallelism_threads(intra)
+        tf.config.threading.set_inter_op_parallelism_threads(inter)
+
+    from cikarim import arka_uc_yukle
+
+    baslangic = time.perf_counter()
+    arka_uc = arka_uc_yukle(model_yolu, is_parcacigi=intra or None)
+    yukleme = time.perf_counter() - baslangic
+    h, w = arka_uc.girdi_boyutu
+
+    yollar = []
+    onceden_islenmis = None
+    if any(k != 'sentetik' for k in kaynaklar):
+        yollar = ornek_yollari(dataset_path, adet)
+        if 'gercek' in kaynaklar:
+            onceden_islenmis = np.empty((len(yollar), h, w, 3), dtype=np.float32)
+            for i, yol in enumerate(yollar):
+                with Image.open(yol) as img:
+                    goruntu_onisle(img, w, h, out=onceden_islenmis[i])
+
+    sonuclar = []
+    for kaynak in kaynaklar:
+        for batch_size in batch_boyutlari:
+            tampon = np.empty((batch_size, h, w, 3), dtype=np.float32)
+            if kaynak == 'sentetik':
+                tampon[:] = np.random.default_rng(0).random(tampon.shape, dtype=np.float32)
+
+            def batch_hazirla(adim):
+                if kaynak == 'sentetik':
+                    return tampon
+                for j in range(batch_size):
+                    k = (adim * batch_size + j) % len(yollar)
+                    if kaynak == 'gercek':
+                        tampon[j] = onceden_islenmis[k]
+                    else:
+                        # Çözme dahil: dosya her adımda diskten okunup ön işlenir
+                        with Image.open(yollar[k]) as img:
+                            goruntu_onisle(img, w, h, out=tampon[j])
+                return tampon
+
+            # Isınma: grafik oluşturma ve bellek ayırma ölçüme katılmaz
+            for adim in range(2):
+                arka_uc.tahmin(batch_hazirla(adim))
+
+            sureler = []
+            for adim in range(tekrar):
+                t = time.perf_counter()
+                arka_uc.tahmin(batch_hazirla(adim))
+                sureler.append(time.perf_counter() - t)
+
+            sonuc = {
+                'model': model_yolu,
+                'arka_uc': arka_uc.ad,
+                'intra_is_parcacigi': intra,
+                'inter_is_parcacigi': inter,
+                'kaynak': kaynak,
+                'batch_size': batch_size,
+                'yukleme_sn': yukleme,
+            }
+            sonuc.update(_sureleri_ozetle(sureler, batch_size))
+            sonuclar.append(sonuc)
+            print(f"{kaynak:<9} batch={batch_size:<4} {sonuc['verim_goruntu_sn']:>9.1f} görüntü/sn  "
+                  f"p50={sonuc['gecikme_ms_p50']:.2f} ms  p99={sonuc['gecikme_ms_p99']:.2f} ms",
+                  file=sys.stderr)
+    return sonuclar
+
+
+def onceki_ile_karsilastir(sonuclar, onceki_yolu):
+    """Aynı ayarların verimini önceki bir sonuç dosyasıyla karşılaştır"""
+    with open(onceki_yolu, encoding='utf-8') as f:
+        onceki = json.load(f)
+
+    def anahtar(s):
+        return (os.path.basename(s['model']), s['arka_uc'], s['intra_is_parcacigi'],
+                s['inter_is_parcacigi'], s['kaynak'], s['batch_size'])
+
+    eski = {anahtar(s): s for s in onceki['sonuclar']}
+    print(f"\nÖnceki sonuçlarla karşılaştırma ({onceki_yolu}):")
+    for s in sonuclar:
+        o = eski.get(anahtar(s))
+        if o is None:
+            continue
+        degisim = s['verim_goruntu_sn'] / o['verim_goruntu_sn'] - 1
+        print(f"{os.path.basename(s['model']):<28}{s['kaynak']:<10}intra={s['intra_is_parcacigi']:<3}"
+              f"inter={s['inter_is_parcacigi']:<3}batch={s['batch_size']:<5}{degisim:>+8.1%}")
+
+
+def rapor_yazdir(sonuclar):
+    print(f"\n{'Model':<28}{'Kaynak':<10}{'Intra':>6}{'Inter':>6}{'Batch':>7}"
+          f"{'görüntü/sn':>12}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}")
+    for s in sonuclar:
+        print(f"{os.path.basename(s['model']):<28}{s['kaynak']:<10}{s['intra_is_parcacigi']:>6}"
+              f"{s['inter_is_parcacigi']:>6}{s['batch_size']:>7}{s['verim_goruntu_sn']:>12.1f}"
+              f"{s['gecikme_ms_p50']:>9.2f}{s['gecikme_ms_p90']:>9.2f}{s['gecikme_ms_p99']:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Modelin batch boyutu, iş parçacığı ve arka uca göre verim ve gecikmesi")
+    parser.add_argument("--model", nargs='+', default=[MODEL_PATH], help="Keras (.h5, .npz), TFLite (.tflite) modelleri veya model paketleri (.pirinc)")
+    parser.add_argument("--batch-boyutlari", default="1,8,32,128")
+    parser.add_argument("--intra", default="0", help="Operasyon içi iş parçacığı sayıları (0 = varsayılan)")
+    parser.add_argument("--inter", default="0", help="Operasyonlar arası iş parçacığı sayıları (0 = varsayılan, TFLite'ta kullanılmaz)")
+    parser.add_argument("--kaynak", default=",".join(KAYNAKLAR),
+                        help="sentetik, gercek (önceden çözülmüş) ve/veya cozme (çözme dahil)")
+    parser.add_argument("--veri", default=DATASET_PATH)
+    parser.add_argument("--adet", type=int, default=256, help="Gerçek girdi için kullanılacak görüntü sayısı")
+    parser.add_argument("--tekrar", type=int, default=30, help="Her ölçümdeki batch sayısı")
+    parser.add_argument("--cikti", default=SONUC_DOSYASI)
+    parser.add_argument("--onceki", help="Verim değişimini göstermek için önceki sonuç dosyası")
+    parser.add_argument("--olc", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    batch_boyutlari = _liste(args.batch_boyutlari)
+    kaynaklar = _liste(args.kaynak, str)
+    for kaynak in kaynaklar:
+        if kaynak not in KAYNAKLAR:
+            parser.error(f"Bilinmeyen kaynak: {kaynak}")
+
+    if args.olc:
+        # Alt süreç: tek model ve iş parçacığı ayarını ölç, sonucu JSON olarak yazdır
+        intra, inter = _liste(args.intra)[0], _liste(args.inter)[0]
+        print(json.dumps(yapilandirmayi_olc(args.olc, intra, inter, batch_boyutlari, kaynaklar,
+                                            args.veri, args.adet, args.tekrar)))
+        return
+
+    sonuclar = []
+    for model_yolu in args.model:
+        ozet = model_ozeti(model_yolu)
+        # TFLite yorumlayıcısında yalnızca tek bir iş parçacığı ayarı vardır
+        inter_degerleri = _liste(args.inter)[:1] if model_yolu.endswith('.tflite') else _liste(args.inter)
+        for intra in _liste(args.intra):
+            for inter in inter_degerleri:
+                print(f"{model_yolu}: intra={intra}, inter={inter}", file=sys.stderr)
+                cikti = subprocess.run(
+                    [sys.executable, __file__, "--olc", model_yolu, "--intra", str(intra), "--inter", str(inter),
+                     "--batch-boyutlari", args.batch_boyutlari, "--kaynak", args.kaynak, "--veri", args.veri,
+                     "--adet", str(args.adet), "--tekrar", str(args.tekrar)],
+                    check=True, stdout=subprocess.PIPE, text=True
+                ).stdout
+                for sonuc in json.loads(cikti.strip().splitlines()[-1]):
+                    sonuc['model_sha1'] = ozet
+                    sonuclar.append(sonuc)
+
+    rapor_yazdir(sonuclar)
+    if args.onceki:
+        onceki_ile_karsilastir(sonuclar, args.onceki)
+
+    kayit = {
+        'zaman': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'cpu_sayisi': os.cpu_count(),
+        'tekrar': args.tekrar,
+        'sonuclar': sonuclar,
+    }
+    with open(args.cikti, 'w', encoding='utf-8') as f:
+        json.dump(kayit, f, ensure_ascii=False, indent=2)
+    print(f"\nSonuçlar kaydedildi: {args.cikti}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+import numpy as np
+from PIL import Image
+from onisleme import goruntu_onisle
+from cikarim import arka_uc_yukle
+
+# Sabit değişkenler - model_egitimi.py ile aynı olmalı
+MODEL_PATH = "pirinc_model.h5"
+DATASET_PATH = "Rice_Image_Dataset"
+RAPOR_DOSYASI = "disa_aktarim_raporu.json"
+
+KALIBRASYON_ADEDI = 300
+DEGERLENDIRME_ADEDI = 1000
+
+
+def ornek_sec(dataset_path, subset, adet, seed=0):
+    """Veri setinin bir bölümünden rastgele örnek yolları ve etiketleri seç"""
+    import veri_onbellegi
+
+    yollar, etiketler, _ = veri_onbellegi.veri_setini_listele(dataset_path)
+    indeksler = veri_onbellegi.bolum_indeksleri(etiketler, 0.2, subset)
+    secilen = np.random.default_rng(seed).choice(indeksler, size=min(adet, len(indeksler)), replace=False)
+    return [yollar[i] for i in secilen], etiketler[secilen]
+
+
+def goruntuleri_yukle(yollar, img_width, img_height):
+    """Görüntüleri tek bir float32 batch'e ön işle"""
+    x = np.empty((len(yollar), img_height, img_width, 3), dtype=np.float32)
+    for i, yol in enumerate(yollar):
+        with Image.open(yol) as img:
+            goruntu_onisle(img, img_width, img_height, out=x[i])
+    return x
+
+
+def tflite_donustur(model, hedef, nicemleme, kalibrasyon=None):
+    """Keras modelini float16 veya tam int8 nicemlenmiş TFLite modeline dönüştür"""
+    import tensorflow as tf
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if nicemleme == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    elif nicemleme == 'int8':
+        def temsili_veri():
+            for i in range(len(kalibrasyon)):
+                yield [kalibrasyon[i:i + 1]]
+
+        converter.representative_dataset = temsili_veri
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    else:
+        raise ValueError(f"Bilinmeyen nicemleme: {nicemleme}")
+
+    with open(hedef, 'wb') as f:
+        f.write(converter.convert())
+    print(f"{nicemleme} model kaydedildi: {hedef} ({os.path.getsize(hedef) / 1024:.1f} KB)")
+
+
+def arka_uc_olc(model_yolu, veri_yolu, tekrar=100):
+    """Arka ucu bu süreçte yükleyip tahminleri, gecikmeyi ve belleği ölç"""
+    baslangic = time.perf_counter()
+    arka_uc = arka_uc_yukle(model_yolu)
+    yukleme = time.perf_counter() - baslangic
+
+    x = np.load(veri_yolu)
+    tahminler = []
+    for i in range(0, len(x), 32):
+        tahminler.extend(np.argmax(arka_uc.tahmin(x[i:i + 32]), axis=1).tolist())
+
+    # Tek görüntü gecikmesi (arayüz senaryosu)
+    arka_uc.tahmin(x[:1])
+    sureler = []
+    for i in range(tekrar):
+        baslangic = time.perf_counter()
+        arka_uc.tahmin(x[i % len(x):i % len(x) + 1])
+        sureler.append(time.perf_counter() - baslangic)
+
+    # 32'lik batch verimi (toplu araç senaryosu)
+    batch = x[:32]
+    baslangic = time.perf_counter()
+    for _ in range(max(1, tekrar // 10)):
+        arka_uc.tahmin(batch)
+    verim = len(batch) * max(1, tekrar // 10) / (time.perf_counter() - baslangic)
+
+    return {
+        'model': model_yolu,
+        'arka_uc': arka_uc.ad,
+        'boyut_kb': os.path.getsize(model_yolu) / 1024,
+        'yukleme_sn': yukleme,
+        'gecikme_ms_p50': float(np.percentile(sureler, 50) * 1000),
+        'gecikme_ms_p99': float(np.percentile(sureler, 99) * 1000),
+        'verim_goruntu_sn': verim,
+        # Linux'ta ru_maxrss KB cinsindendir
+        'tepe_bellek_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'tahminler': tahminler,
+    }
+
+
+def karsilastir(model_yollari, x, etiketler):
+    """Her arka ucu ayrı bir süreçte ölçüp doğruluk, gecikme ve bellek tablosu oluştur"""
+    with tempfile.TemporaryDirectory() as dizin:
+        veri_yolu = os.path.join(dizin, "degerlendirme.npy")
+        np.save(veri_yolu, x)
+        sonuclar = []
+        for model_yolu in model_yollari:
+            cikti = subprocess.run(
+                [sys.executable, __file__, "--olc", model_yolu, "--veri-dosyasi", veri_yolu],
+                check=True, capture_output=True, text=True
+            ).stdout
+            sonuclar.append(json.loads(cikti.strip().splitlines()[-1]))
+
+    referans = np.array(sonuclar[0]['tahminler'])
+    for sonuc in sonuclar:
+        tahminler = np.array(sonuc.pop('tahminler'))
+        sonuc['dogruluk'] = float(np.mean(tahminler == etiketler))
+        sonuc['dogruluk_farki'] = sonuc['dogruluk'] - float(np.mean(referans == etiketler))
+        sonuc['referansla_uyum'] = float(np.mean(tahminler == referans))
+    return sonuclar
+
+
+def rapor_yazdir(sonuclar):
+    print(f"\n{'Model':<34}{'Boyut KB':>10}{'Doğruluk':>10}{'Fark':>8}{'Uyum':>8}"
+          f"{'p50 ms':>9}{'p99 ms':>9}{'görüntü/sn':>12}{'Yükleme sn':>12}{'Bellek MB':>11}")
+    for s in sonuclar:
+        print(f"{os.path.basename(s['model']):<34}{s['boyut_kb']:>10.1f}{s['dogruluk']:>10.4f}"
+              f"{s['dogruluk_farki']:>+8.4f}{s['referansla_uyum']:>8.4f}{s['gecikme_ms_p50']:>9.2f}"
+              f"{s['gecikme_ms_p99']:>9.2f}{s['verim_goruntu_sn']:>12.1f}{s['yukleme_sn']:>12.2f}"
+              f"{s['tepe_bellek_mb']:>11.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Modeli float16 ve int8 TFLite olarak dışa aktar ve karşılaştır")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--veri", default=DATASET_PATH)
+    parser.add_argument("--kalibrasyon-adedi", type=int, default=KALIBRASYON_ADEDI)
+    parser.add_argument("--degerlendirme-adedi", type=int, default=DEGERLENDIRME_ADEDI)
+    parser.add_argument("--rapor", default=RAPOR_DOSYASI)
+    parser.add_argument("--olc", help=argparse.SUPPRESS)
+    parser.add_argument("--veri-dosyasi", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.olc:
+        # Alt süreç: tek arka ucu ölç ve sonucu JSON olarak yazdır
+        print(json.dumps(arka_uc_olc(args.olc, args.veri_dosyasi)))
+        return
+
+    from tensorflow.keras.models import load_model
+
+    model = load_model(args.model, compile=False)
+    _, img_height, img_width, _ = model.input_shape
+    kok, _ = os.path.splitext(args.model)
+
+    # Kalibrasyon eğitim bölümünden, değerlendirme doğrulama bölümünden seçilir
+    kalibrasyon_yollari, _ = ornek_sec(args.veri, 'training', args.kalibrasyon_adedi)
+    kalibrasyon = goruntuleri_yukle(kalibrasyon_yollari, img_width, img_height)
+
+    float16_yolu = f"{kok}_float16.tflite"
+    int8_yolu = f"{kok}_int8.tflite"
+    tflite_donustur(model, float16_yolu, 'float16')
+    tflite_donustur(model, int8_yolu, 'int8', kalibrasyon)
+
+    degerlendirme_yollari, etiketler = ornek_sec(args.veri, 'validation', args.degerlendirme_adedi, seed=1)
+    x = goruntuleri_yukle(degerlendirme_yollari, img_width, img_height)
+    sonuclar = karsilastir([args.model, float16_yolu, int8_yolu], x, etiketler)
+
+    rapor_yazdir(sonuclar)
+    with open(args.rapor, 'w', encoding='utf-8') as f:
+        json.dump(sonuclar, f, ensure_ascii=False, indent=2)
+    print(f"\nRapor kaydedildi: {args.rapor}")
+
+
+if __name__ == "__main__":
+    main()
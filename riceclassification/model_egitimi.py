@@ -1,26 +1,47 @@
 import os
 import numpy as np
 import tensorflow as tf
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import Conv2D, MaxPooling2D, Dense, Flatten, Dropout
 from tensorflow.keras.preprocessing.image import ImageDataGenerator
 from tensorflow.keras.callbacks import ModelCheckpoint, EarlyStopping
+from veri_hatti import GoruntuHizi, AdimOlcer
+from kontrol_noktasi import TamDurumKaydedici, kalan_veri, kontrol_dizini
+from model_mimarisi import varyant_olustur, hassasiyet_ayarla, VARYANTLAR
+from cikarim import KerasArkaUcu
+from model_paketi import paketle, PAKET_PATH
+import degerlendirme
+import olcum
 import matplotlib.pyplot as plt
-from sklearn.metrics import confusion_matrix, classification_report, f1_score
 import seaborn as sns
 
 print("TensorFlow versiyonu:", tf.__version__)
 
+# Model varyantı (model_mimarisi.VARYANTLAR); girdi boyutu varyanttan gelir, arayüz modelden okur
+MODEL_VARYANTI = os.environ.get("MODEL_VARYANTI", "temel")
+
 # Sabit değişkenler - bunlar sınıflandırma arayüzünde de aynı olmalı
-IMG_WIDTH = 150
-IMG_HEIGHT = 150
+IMG_WIDTH = VARYANTLAR[MODEL_VARYANTI]['img_size']
+IMG_HEIGHT = VARYANTLAR[MODEL_VARYANTI]['img_size']
 BATCH_SIZE = 32
 EPOCHS = 5  # Daha hızlı eğitim için
 MODEL_PATH = "pirinc_model.h5"
 
+# Tam durum kontrol noktaları (model, Adam durumu, epoch, RNG, veri sırası); yarıda kalmış eğitim varsa
+# en sonuncusundan devam eder. Her varyant / ayar bu dizinin altında kendi alt dizinini kullanır
+KONTROL_DIZINI = os.environ.get("KONTROL_DIZINI", "kontrol_noktalari")
+KONTROL_ADIM = int(os.environ.get("KONTROL_ADIM", "0"))  # 0 = yalnızca epoch sonlarında
+
 # Veri yolu
 DATASET_PATH = "Rice_Image_Dataset"
 
+# Veri yükleyici: "generator" (ImageDataGenerator), "onbellek" (önceden çözülmüş memmap önbelleği)
+# veya "tfdata" (paralel çözme ve batch halinde artırma yapan tf.data hattı)
+VERI_YUKLEYICI = os.environ.get("VERI_YUKLEYICI", "generator")
+
+# Hesaplama hassasiyeti: "float32" veya "mixed_bfloat16" (CPU destekliyorsa); XLA=1 ile jit derleme
+HASSASIYET = hassasiyet_ayarla(os.environ.get("HASSASIYET", "float32"))
+XLA = os.environ.get("XLA", "0") == "1"
+print(f"Hassasiyet: {HASSASIYET}, XLA: {'açık' if XLA else 'kapalı'}")
+
 # Veri artırma ve ön işleme
 train_datagen = ImageDataGenerator(
     rescale=1./255,
@@ -34,81 +55,143 @@ train_datagen = ImageDataGenerator(
 )
 
 # Eğitim ve doğrulama verileri
-train_generator = train_datagen.flow_from_directory(
-    DATASET_PATH,
-    target_size=(IMG_WIDTH, IMG_HEIGHT),
-    batch_size=BATCH_SIZE,
-    class_mode='categorical',
-    subset='training'
-)
-
-validation_generator = train_datagen.flow_from_directory(
-    DATASET_PATH,
-    target_size=(IMG_WIDTH, IMG_HEIGHT),
-    batch_size=BATCH_SIZE,
-    class_mode='categorical',
-    subset='validation'
-)
+if VERI_YUKLEYICI == "onbellek":
+    import veri_onbellegi
+
+    # Önbellek yalnızca değişen görüntüler için güncellenir
+    veri_onbellegi.onbellegi_olustur(DATASET_PATH, img_width=IMG_WIDTH, img_height=IMG_HEIGHT)
+    veri_seti = veri_onbellegi.OnbellekVeriSeti(img_width=IMG_WIDTH, img_height=IMG_HEIGHT)
+    train_generator = veri_seti.sequence('training', BATCH_SIZE, validation_split=0.2, datagen=train_datagen)
+    validation_generator = veri_seti.sequence(
+        'validation', BATCH_SIZE, validation_split=0.2, datagen=train_datagen, shuffle=False
+    )
+elif VERI_YUKLEYICI == "tfdata":
+    import veri_hatti
+
+    train_generator, train_samples, class_names = veri_hatti.veri_seti_olustur(
+        'training', BATCH_SIZE, DATASET_PATH, validation_split=0.2, img_width=IMG_WIDTH, img_height=IMG_HEIGHT
+    )
+    validation_generator, validation_samples, _ = veri_hatti.veri_seti_olustur(
+        'validation', BATCH_SIZE, DATASET_PATH, validation_split=0.2, img_width=IMG_WIDTH, img_height=IMG_HEIGHT
+    )
+else:
+    train_generator = train_datagen.flow_from_directory(
+        DATASET_PATH,
+        target_size=(IMG_WIDTH, IMG_HEIGHT),
+        batch_size=BATCH_SIZE,
+        class_mode='categorical',
+        subset='training'
+    )
+
+    validation_generator = train_datagen.flow_from_directory(
+        DATASET_PATH,
+        target_size=(IMG_WIDTH, IMG_HEIGHT),
+        batch_size=BATCH_SIZE,
+        class_mode='categorical',
+        subset='validation'
+    )
 
 # Sınıf isimleri
-class_names = list(train_generator.class_indices.keys())
+if VERI_YUKLEYICI != "tfdata":
+    class_names = list(train_generator.class_indices.keys())
+    train_samples = train_generator.samples
+    validation_samples = validation_generator.samples
 print(f"Sınıf isimleri: {class_names}")
 num_classes = len(class_names)
 
 # Daha basit bir model oluşturma
-model = Sequential([
-    # Daha az katmanlı ve düzgün yapılandırılmış model
-    Conv2D(16, (3, 3), activation='relu', input_shape=(IMG_WIDTH, IMG_HEIGHT, 3)),
-    MaxPooling2D(2, 2),
-    
-    Conv2D(32, (3, 3), activation='relu'),
-    MaxPooling2D(2, 2),
-    
-    Flatten(),
-    Dense(64, activation='relu'),
-    Dropout(0.3),
-    Dense(num_classes, activation='softmax')
-])
+model = varyant_olustur(MODEL_VARYANTI, num_classes)
 
 # Model derleme
 model.compile(
     optimizer='adam',
     loss='categorical_crossentropy',
-    metrics=['accuracy']
+    metrics=['accuracy'],
+    jit_compile=XLA
 )
 
 # Model özeti
 model.summary()
 
+# Yarıda kalmış bir eğitim varsa kaldığı yerden devam et
+egitim_ayarlari = {
+    'img_size': IMG_WIDTH, 'batch_size': BATCH_SIZE, 'veri': os.path.abspath(DATASET_PATH),
+    'veri_yukleyici': VERI_YUKLEYICI, 'hassasiyet': HASSASIYET, 'siniflar': class_names,
+    'egitim_ornekleri': train_samples,
+}
+checkpointer = TamDurumKaydedici(
+    model, kontrol_dizini(KONTROL_DIZINI, MODEL_VARYANTI, egitim_ayarlari), veri=None if VERI_YUKLEYICI == "tfdata" else train_generator, her_adim=KONTROL_ADIM
+)
+initial_epoch, skip_steps = checkpointer.geri_yukle()
+best_val_accuracy = max(checkpointer.gecmis.get('val_accuracy', []), default=None)
+
 # Eğitim durdurma ve kaydetme
 callbacks = [
     EarlyStopping(monitor='val_loss', patience=3, restore_best_weights=True),
-    ModelCheckpoint(MODEL_PATH, monitor='val_accuracy', save_best_only=True, verbose=1)
+    # Devam edilen eğitimde önceki en iyi modelin üzerine daha kötüsü yazılmaz
+    ModelCheckpoint(MODEL_PATH, monitor='val_accuracy', save_best_only=True, verbose=1,
+                    initial_value_threshold=best_val_accuracy),
+    GoruntuHizi(BATCH_SIZE),
+    checkpointer
 ]
+if olcum.etkin:
+    # PIRINC_OLCUM verildiğinde adım / doğrulama süreleri iz dosyasına yazılır
+    callbacks.append(AdimOlcer())
 
 # Adım boyutunu hesapla
-steps_per_epoch = max(1, train_generator.samples // BATCH_SIZE)
-validation_steps = max(1, validation_generator.samples // BATCH_SIZE)
+if VERI_YUKLEYICI == "tfdata":
+    # tf.data veri setleri sonlu olduğu için her epoch tamamı okunur
+    steps_per_epoch = -(-train_samples // BATCH_SIZE)
+    validation_steps = -(-validation_samples // BATCH_SIZE)
+else:
+    steps_per_epoch = max(1, train_samples // BATCH_SIZE)
+    validation_steps = max(1, validation_samples // BATCH_SIZE)
 
-print(f"Eğitim veri sayısı: {train_generator.samples}, Adım sayısı: {steps_per_epoch}")
-print(f"Doğrulama veri sayısı: {validation_generator.samples}, Doğrulama adım sayısı: {validation_steps}")
+print(f"Eğitim veri sayısı: {train_samples}, Adım sayısı: {steps_per_epoch}")
+print(f"Doğrulama veri sayısı: {validation_samples}, Doğrulama adım sayısı: {validation_steps}")
 
 # Modeli eğitme
-history = model.fit(
-    train_generator,
-    steps_per_epoch=steps_per_epoch,
-    validation_data=validation_generator,
-    validation_steps=validation_steps,
-    epochs=EPOCHS,
-    callbacks=callbacks,
-    verbose=1
-)
-
-# Eğitim sonuçlarını görselleştirme
-acc = history.history['accuracy']
-val_acc = history.history['val_accuracy']
-loss = history.history['loss']
-val_loss = history.history['val_loss']
+# Sequence yükleyiciler her epoch örnekleri kendisi karıştırır; batch sırası sabit kalınca
+# kontrol noktasındaki veri konumu birebir geri yüklenebilir
+# PIRINC_TF_PROFIL verildiğinde eğitim TensorFlow profileriyle çalışır
+with olcum.tf_profil():
+    if skip_steps:
+        # Yarıda kalan epoch'un kalan batch'leri
+        model.fit(
+            kalan_veri(train_generator, skip_steps),
+            steps_per_epoch=steps_per_epoch - skip_steps,
+            validation_data=validation_generator,
+            validation_steps=None if VERI_YUKLEYICI == "tfdata" else validation_steps,
+            initial_epoch=initial_epoch,
+            epochs=initial_epoch + 1,
+            callbacks=callbacks,
+            shuffle=False,
+            verbose=1
+        )
+        initial_epoch += 1
+
+    if initial_epoch < EPOCHS:
+        model.fit(
+            train_generator,
+            steps_per_epoch=None if VERI_YUKLEYICI == "tfdata" else steps_per_epoch,
+            validation_data=validation_generator,
+            validation_steps=None if VERI_YUKLEYICI == "tfdata" else validation_steps,
+            initial_epoch=initial_epoch,
+            epochs=EPOCHS,
+            callbacks=callbacks,
+            shuffle=False,
+            verbose=1
+        )
+
+# Eğitim bitti; sonraki çalıştırma (ör. veri eklendikten sonra) sıfırdan başlar
+checkpointer.tamamla()
+
+# Eğitim sonuçlarını görselleştirme (önceki çalışmalardaki epoch'lar dahil)
+history = checkpointer.gecmis
+acc = history['accuracy']
+val_acc = history['val_accuracy']
+loss = history['loss']
+val_loss = history['val_loss']
 
 plt.figure(figsize=(12, 4))
 plt.subplot(1, 2, 1)
@@ -127,22 +210,17 @@ plt.savefig('egitim_sonuclari.png')
 plt.show()
 
 # Karışıklık matrisi ve F1 skoru hesaplama
-# Validation verileri üzerinde tahminler
+# Doğrulama bölümünün tamamı artırma olmadan tek geçişte okunur, metrikler batch batch biriktirilir
 print("Doğrulama verileri üzerinde metrikleri hesaplıyorum...")
-validation_generator.reset()
-y_pred_probs = model.predict(validation_generator, steps=validation_steps, verbose=1)
-y_pred = np.argmax(y_pred_probs, axis=1)
-
-# Gerçek etiketleri al
-validation_generator.reset()
-y_true = []
-for i in range(validation_steps):
-    x, y = next(validation_generator)
-    y_true.extend(np.argmax(y, axis=1))
-y_true = np.array(y_true[:len(y_pred)])  # Tahmin sayısı kadar gerçek etiket al
+validation_paths, validation_labels, _ = degerlendirme.dogrulama_ornekleri(
+    DATASET_PATH, validation_split=0.2, model_siniflari=class_names
+)
+metrics = degerlendirme.degerlendir(
+    KerasArkaUcu.modelden(model), validation_paths, validation_labels, num_classes, batch_size=BATCH_SIZE
+)
 
 # Karışıklık matrisi
-cm = confusion_matrix(y_true, y_pred)
+cm = metrics.matris
 
 # Karışıklık matrisini görselleştirme
 plt.figure(figsize=(10, 8))
@@ -154,12 +232,11 @@ plt.savefig('karisiklik_matrisi.png')
 plt.show()
 
 # F1 skoru ve sınıflandırma raporu
-f1 = f1_score(y_true, y_pred, average='weighted')
+f1 = metrics.agirlikli_f1()
 print(f"\nAğırlıklı F1 Skoru: {f1:.4f}")
 
 # Sınıf bazında F1 skorları
-class_report = classification_report(y_true, y_pred, target_names=class_names, output_dict=True)
-f1_scores = [class_report[class_name]['f1-score'] for class_name in class_names]
+_, _, f1_scores, _ = metrics.sinif_metrikleri()
 
 # F1 skorlarını görselleştirme
 plt.figure(figsize=(10, 6))
@@ -182,7 +259,7 @@ plt.show()
 
 # Detaylı sınıflandırma raporu
 print("\nSınıflandırma Raporu:")
-print(classification_report(y_true, y_pred, target_names=class_names))
+print(metrics.rapor(class_names))
 
 print(f"Model başarıyla eğitildi ve {MODEL_PATH} olarak kaydedildi")
 
@@ -194,6 +271,10 @@ model.summary()
 np.save('sinif_isimleri.npy', class_names)
 print(f"Sınıf isimleri 'sinif_isimleri.npy' olarak kaydedildi")
 
+# Arayüz, araçlar ve sunucu için ağırlıklar, sınıf isimleri ve ön işleme ayarları tek dosyada
+paketle(MODEL_PATH, class_names, PAKET_PATH)
+print(f"Model paketi {PAKET_PATH} olarak kaydedildi")
+
 # Bir örnek tahmin yap
 sample_image = np.zeros((1, IMG_WIDTH, IMG_HEIGHT, 3), dtype=np.float32)
 try:
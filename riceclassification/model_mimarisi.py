@@ -0,0 +1,78 @@
+import tensorflow as tf
+from tensorflow.keras.models import Sequential
+from tensorflow.keras.layers import (
+    Conv2D, SeparableConv2D, MaxPooling2D, GlobalAveragePooling2D, Dense, Flatten, Dropout
+)
+
+# Sabit değişkenler - model_egitimi.py ile aynı olmalı
+IMG_WIDTH = 150
+IMG_HEIGHT = 150
+
+# Küçük girdi, Flatten yerine global ortalama havuzlama ve derinlemesine ayrılabilir
+# konvolüsyon seçenekleriyle model varyantları; "temel" eğitimde kullanılan orijinal modeldir
+VARYANTLAR = {
+    'temel': {'img_size': 150, 'havuzlama': 'flatten', 'ayrilabilir': False},
+    '128_flatten': {'img_size': 128, 'havuzlama': 'flatten', 'ayrilabilir': False},
+    '96_flatten': {'img_size': 96, 'havuzlama': 'flatten', 'ayrilabilir': False},
+    '64_flatten': {'img_size': 64, 'havuzlama': 'flatten', 'ayrilabilir': False},
+    '150_gap': {'img_size': 150, 'havuzlama': 'gap', 'ayrilabilir': False},
+    '128_gap': {'img_size': 128, 'havuzlama': 'gap', 'ayrilabilir': False},
+    '96_gap': {'img_size': 96, 'havuzlama': 'gap', 'ayrilabilir': False},
+    '64_gap': {'img_size': 64, 'havuzlama': 'gap', 'ayrilabilir': False},
+    '96_gap_ayrilabilir': {'img_size': 96, 'havuzlama': 'gap', 'ayrilabilir': True},
+    '64_gap_ayrilabilir': {'img_size': 64, 'havuzlama': 'gap', 'ayrilabilir': True},
+}
+
+
+def bf16_destekleniyor():
+    """CPU'nun yerel bfloat16 komutlarını (AVX512_BF16 veya AMX) destekleyip desteklemediğini döndür"""
+    try:
+        with open('/proc/cpuinfo') as f:
+            bayraklar = set(f.read().split())
+    except OSError:
+        return False
+    return bool(bayraklar & {'avx512_bf16', 'amx_bf16'})
+
+
+def hassasiyet_ayarla(hassasiyet):
+    """Keras'ın genel hesaplama hassasiyetini ayarla ve kullanılan hassasiyeti döndür"""
+    if hassasiyet == 'mixed_bfloat16' and not bf16_destekleniyor():
+        # Donanım desteği olmayan CPU'larda bfloat16 öykünmesi float32'den yavaştır
+        print("Uyarı: CPU bfloat16 desteklemiyor, float32 kullanılacak")
+        hassasiyet = 'float32'
+    tf.keras.mixed_precision.set_global_policy(hassasiyet)
+    return hassasiyet
+
+
+def model_olustur(num_classes, img_width=IMG_WIDTH, img_height=IMG_HEIGHT,
+                  conv1=16, conv2=32, dense=64, dropout=0.3, havuzlama='flatten', ayrilabilir=False):
+    """Eğitimde kullanılan basit CNN modelini (derlenmemiş) oluştur
+
+    havuzlama='gap' ile Flatten yerine GlobalAveragePooling2D kullanılır; böylece ilk Dense
+    katmanının boyutu girdi çözünürlüğünden bağımsız olur. ayrilabilir=True ile ikinci
+    konvolüsyon derinlemesine ayrılabilir (SeparableConv2D) olur.
+    """
+    # İlk katman 3 kanallı girdide çalıştığı için ayrılabilir konvolüsyon kazanç sağlamaz
+    ikinci_conv = SeparableConv2D if ayrilabilir else Conv2D
+    return Sequential([
+        # Daha az katmanlı ve düzgün yapılandırılmış model
+        Conv2D(conv1, (3, 3), activation='relu', input_shape=(img_width, img_height, 3)),
+        MaxPooling2D(2, 2),
+        
+        ikinci_conv(conv2, (3, 3), activation='relu'),
+        MaxPooling2D(2, 2),
+        
+        GlobalAveragePooling2D() if havuzlama == 'gap' else Flatten(),
+        Dense(dense, activation='relu'),
+        Dropout(dropout),
+        # Karışık hassasiyette de olasılıklar float32 hesaplanır
+        Dense(num_classes, activation='softmax', dtype='float32')
+    ])
+
+
+def varyant_olustur(ad, num_classes):
+    """VARYANTLAR içindeki bir varyantın modelini oluştur"""
+    varyant = VARYANTLAR[ad]
+    boyut = varyant['img_size']
+    return model_olustur(num_classes, boyut, boyut, havuzlama=varyant['havuzlama'],
+                         ayrilabilir=varyant['ayrilabilir'])
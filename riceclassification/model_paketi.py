@@ -0,0 +1,185 @@
+import os
+import json
+import time
+import struct
+import hashlib
+import argparse
+import numpy as np
+
+# Sabit değişkenler - model_egitimi.py ile aynı olmalı
+MODEL_PATH = "pirinc_model.h5"
+SINIF_DOSYASI = "sinif_isimleri.npy"
+PAKET_UZANTISI = ".pirinc"
+PAKET_PATH = "pirinc_model" + PAKET_UZANTISI
+
+# Dosya düzeni: SIHIRLI (8 bayt) | biçim sürümü, başlık uzunluğu (2 x uint32, little endian) |
+# JSON başlık | HIZALAMA'ya yuvarlanmış veri bölümü (ağırlıklar veya TFLite içeriği)
+SIHIRLI = b"PIRINCPK"
+BICIM_SURUMU = 1
+HIZALAMA = 64
+_ON_EK = struct.Struct('<8sII')
+
+
+def paket_mi(yol):
+    return yol.endswith(PAKET_UZANTISI)
+
+
+def paket_yolu(model_yolu):
+    """Model dosyasıyla aynı adlı paket dosyasının yolunu döndür"""
+    kok, _ = os.path.splitext(model_yolu)
+    return kok + PAKET_UZANTISI
+
+
+def varsayilan_model():
+    """Paket varsa onu, yoksa eski HDF5 modelini döndür; arayüz, araçlar ve sunucu aynı modeli açar"""
+    return PAKET_PATH if os.path.exists(PAKET_PATH) else MODEL_PATH
+
+
+def _hizala(n):
+    return -(-n // HIZALAMA) * HIZALAMA
+
+
+# Aynı model yeniden paketlendiğinde özet (ve ona bağlı önbellek / kalibrasyon / indeks sürümü) değişmesin diye
+# oluşturulma zamanı ve kaynak dosya adı özete katılmaz
+OZET_DISI = ('ozet', 'olusturulma', 'kaynak')
+
+
+def _ozet_hesapla(bilgi, veri):
+    """Başlık (OZET_DISI alanları hariç) ve veri bölümünün SHA-256 özetini döndür"""
+    ozet = hashlib.sha256(json.dumps({k: v for k, v in bilgi.items() if k not in OZET_DISI}, sort_keys=True).encode('utf-8'))
+    ozet.update(veri)
+    return ozet.hexdigest()
+
+
+class ModelPaketi:
+    """Tek dosyalık model paketini bellek eşlemeli açar
+
+    Başlık açılışta okunur; ağırlıklar dosyadan kopyalanmadan memmap görünümleri olarak döner.
+    """
+
+    def __init__(self, yol):
+        self.yol = yol
+        self._veri = np.memmap(yol, dtype=np.uint8, mode='r')
+        sihirli, surum, uzunluk = _ON_EK.unpack_from(self._veri, 0)
+        if sihirli != SIHIRLI:
+            raise ValueError(f"Model paketi değil: {yol}")
+        if surum > BICIM_SURUMU:
+            raise ValueError(f"{yol} daha yeni bir paket biçiminde (sürüm {surum}), güncelleme gerekli")
+        self.bilgi = json.loads(bytes(self._veri[_ON_EK.size:_ON_EK.size + uzunluk]).decode('utf-8'))
+        self._baslangic = _hizala(_ON_EK.size + uzunluk)
+        self.tur = self.bilgi['tur']
+        self.ozet = self.bilgi['ozet']
+        self.sinif_isimleri = np.array(self.bilgi['sinif_isimleri'])
+        girdi = self.bilgi['girdi']
+        self.girdi_boyutu = (girdi['yukseklik'], girdi['genislik'])
+        self.onisleme = self.bilgi['onisleme']
+
+    def _parca(self, kayit):
+        konum = self._baslangic + kayit['konum']
+        return self._veri[konum:konum + kayit['boyut']]
+
+    def agirliklar(self):
+        """Keras ağırlıklarını memmap görünümleri olarak döndür"""
+        return [self._parca(k).view(np.dtype(k['tip'])).reshape(k['sekil']) for k in self.bilgi['agirliklar']]
+
+    def tflite_icerigi(self):
+        return bytes(self._parca(self.bilgi['tflite']))
+
+    def dogrula(self):
+        """Dosyanın tamamını okuyup içerik özetini denetle"""
+        return _ozet_hesapla(self.bilgi, memoryview(self._veri[self._baslangic:])) == self.ozet
+
+
+def paketle(model_yolu, sinif_isimleri, hedef, model=None):
+    """Keras (.h5, .npz) veya TFLite modelini sınıf isimleri ve ön işleme ayarlarıyla tek pakete yaz
+
+    model verilirse dosyadan yeniden yüklemek yerine bellekteki Keras modeli paketlenir.
+    """
+    from onisleme import RESIZE_FILTER, OLCEK
+    from PIL import Image
+
+    sinif_isimleri = [str(s) for s in sinif_isimleri]
+    parcalar = []
+    konum = 0
+
+    def ekle(veri):
+        nonlocal konum
+        veri = bytes(veri)
+        kayit = {'konum': konum, 'boyut': len(veri)}
+        parcalar.append(veri + b'\0' * (_hizala(len(veri)) - len(veri)))
+        konum += len(parcalar[-1])
+        return kayit
+
+    bilgi = {'bicim_surumu': BICIM_SURUMU, 'olusturulma': time.strftime('%Y-%m-%dT%H:%M:%S'),
+             'kaynak': os.path.basename(model_yolu), 'sinif_isimleri': sinif_isimleri}
+    if model_yolu.endswith('.tflite'):
+        from cikarim import TFLiteArkaUcu
+
+        arka_uc = TFLiteArkaUcu(model_yolu)
+        with open(model_yolu, 'rb') as f:
+            bilgi['tflite'] = ekle(f.read())
+        bilgi['tur'] = 'tflite'
+        sinif_sayisi = int(arka_uc.cikti['shape'][-1])
+    else:
+        from cikarim import KerasArkaUcu
+
+        arka_uc = KerasArkaUcu.modelden(model) if model is not None else KerasArkaUcu(model_yolu)
+        bilgi['mimari'] = arka_uc.model.to_json()
+        bilgi['agirliklar'] = []
+        for w in arka_uc.model.get_weights():
+            w = np.ascontiguousarray(w)
+            bilgi['agirliklar'].append({'tip': w.dtype.str, 'sekil': list(w.shape), **ekle(w.tobytes())})
+        bilgi['tur'] = 'keras'
+        sinif_sayisi = int(arka_uc.model.output_shape[-1])
+    if sinif_sayisi != len(sinif_isimleri):
+        raise ValueError(f"Model {sinif_sayisi} sınıf üretiyor, {len(sinif_isimleri)} sınıf ismi verildi")
+
+    h, w = arka_uc.girdi_boyutu
+    bilgi['girdi'] = {'yukseklik': int(h), 'genislik': int(w), 'kanal': 3, 'tip': 'float32'}
+    bilgi['onisleme'] = {
+        'boyutlandirma': {Image.NEAREST: 'nearest', Image.BILINEAR: 'bilinear'}.get(RESIZE_FILTER, str(RESIZE_FILTER)),
+        'renk': 'RGB',
+        'olcek': float(OLCEK),
+    }
+    veri = b''.join(parcalar)
+    bilgi['ozet'] = _ozet_hesapla(bilgi, veri)
+
+    baslik = json.dumps(bilgi, ensure_ascii=False).encode('utf-8')
+    on_ek = _ON_EK.pack(SIHIRLI, BICIM_SURUMU, len(baslik)) + baslik
+    gecici = hedef + ".tmp"
+    with open(gecici, 'wb') as f:
+        f.write(on_ek + b'\0' * (_hizala(len(on_ek)) - len(on_ek)))
+        f.write(veri)
+    os.replace(gecici, hedef)
+    return bilgi['ozet']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Modeli, sınıf isimlerini ve ön işleme ayarlarını tek dosyada paketle")
+    parser.add_argument("--model", default=MODEL_PATH, help="Keras (.h5, .npz) veya TFLite (.tflite) modeli")
+    parser.add_argument("--siniflar", default=SINIF_DOSYASI)
+    parser.add_argument("--cikti", help="Paket dosyası (varsayılan: modelle aynı ad, .pirinc uzantısı)")
+    parser.add_argument("--bilgi", metavar="PAKET", help="Paketin başlığını yazdır")
+    parser.add_argument("--dogrula", metavar="PAKET", help="Paketin içerik özetini denetle")
+    args = parser.parse_args()
+
+    if args.bilgi or args.dogrula:
+        paket = ModelPaketi(args.bilgi or args.dogrula)
+        if args.bilgi:
+            ozet = {k: v for k, v in paket.bilgi.items() if k not in ('mimari', 'agirliklar', 'tflite')}
+            print(json.dumps(ozet, ensure_ascii=False, indent=2))
+        if args.dogrula:
+            if not paket.dogrula():
+                raise SystemExit(f"{paket.yol}: içerik özeti tutmuyor, dosya bozuk")
+            print(f"{paket.yol}: içerik özeti doğru ({paket.ozet[:16]})")
+        return
+
+    # Eski biçimden geçiş için pickle'lı sınıf dosyası burada bir kez okunur
+    sinif_isimleri = np.load(args.siniflar, allow_pickle=True)
+    hedef = args.cikti or paket_yolu(args.model)
+    ozet = paketle(args.model, sinif_isimleri, hedef)
+    print(f"Paket kaydedildi: {hedef} ({os.path.getsize(hedef) / 1024:.1f} KB, özet {ozet[:16]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+import contextlib
+
+# PIRINC_OLCUM=iz.json ile ölçüm açılır ve süreç bitince Chrome trace (chrome://tracing,
+# Perfetto) biçiminde yazılır; PIRINC_TF_PROFIL=dizin ile tf_profil() TensorFlow profilerini çalıştırır
+IZ_DOSYASI = os.environ.get("PIRINC_OLCUM", "")
+TF_PROFIL_DIZINI = os.environ.get("PIRINC_TF_PROFIL", "")
+
+# Uzun çalışmalarda belleğin sınırsız büyümemesi için
+EN_FAZLA_OLAY = 1_000_000
+
+etkin = False
+_iz_dosyasi = ""
+_olaylar = []
+_sayac_olaylari = []
+_sayaclar = {}
+_kilit = threading.Lock()
+_baslangic_ns = time.perf_counter_ns()
+
+
+class _BosBolum:
+    """Ölçüm kapalıyken kullanılan, hiçbir şey yapmayan bağlam yöneticisi"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *hata):
+        return False
+
+
+_BOS = _BosBolum()
+
+
+class _Bolum:
+    __slots__ = ('ad', 'kategori', 'baslangic')
+
+    def __init__(self, ad, kategori):
+        self.ad = ad
+        self.kategori = kategori
+
+    def __enter__(self):
+        self.baslangic = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *hata):
+        olay_ekle(self.ad, self.baslangic, time.perf_counter_ns(), self.kategori)
+        return False
+
+
+def bolum(ad, kategori="pirinc"):
+    """Adlandırılmış bir zamanlayıcı; ölçüm kapalıyken paylaşılan boş nesneyi döndürür"""
+    if not etkin:
+        return _BOS
+    return _Bolum(ad, kategori)
+
+
+def olay_ekle(ad, baslangic_ns, bitis_ns, kategori="pirinc"):
+    """perf_counter_ns zamanlarıyla ölçülmüş bir aralığı kaydet"""
+    if etkin and len(_olaylar) < EN_FAZLA_OLAY:
+        # list.append GIL altında atomiktir; iş parçacıkları kilitsiz ekleyebilir
+        _olaylar.append((ad, kategori, baslangic_ns, bitis_ns - baslangic_ns, threading.get_ident()))
+
+
+def sayac(ad, artis=1):
+    """Adlandırılmış bir sayacı artır"""
+    if not etkin:
+        return
+    with _kilit:
+        deger = _sayaclar.get(ad, 0) + artis
+        _sayaclar[ad] = deger
+        if len(_sayac_olaylari) < EN_FAZLA_OLAY:
+            _sayac_olaylari.append((ad, time.perf_counter_ns(), deger))
+
+
+def etkinlestir(iz_dosyasi):
+    """Ölçümü aç; süreç bitince iz dosyası yazılır"""
+    global etkin, _iz_dosyasi
+    if not etkin:
+        atexit.register(kaydet)
+    etkin = True
+    _iz_dosyasi = iz_dosyasi
+
+
+def ozet():
+    """Her bölüm için adet, toplam, ortalama ve en büyük süreyi (ms) döndür"""
+    sonuc = {}
+    for ad, _, _, sure, _ in list(_olaylar):
+        s = sonuc.setdefault(ad, {'adet': 0, 'toplam_ms': 0.0, 'en_buyuk_ms': 0.0})
+        s['adet'] += 1
+        s['toplam_ms'] += sure / 1e6
+        s['en_buyuk_ms'] = max(s['en_buyuk_ms'], sure / 1e6)
+    for s in sonuc.values():
+        s['ortalama_ms'] = s['toplam_ms'] / s['adet']
+    return sonuc
+
+
+def kaydet(yol=None):
+    """Olayları Chrome trace JSON'u olarak yaz ve özeti standart hataya yazdır"""
+    yol = yol or _iz_dosyasi
+    if not etkin or not yol:
+        return
+    pid = os.getpid()
+    olaylar = [
+        {'name': ad, 'cat': kategori, 'ph': 'X', 'pid': pid, 'tid': tid,
+         'ts': (baslangic - _baslangic_ns) / 1000, 'dur': sure / 1000}
+        for ad, kategori, baslangic, sure, tid in list(_olaylar)
+    ]
+    olaylar += [
+        {'name': ad, 'ph': 'C', 'pid': pid, 'ts': (zaman - _baslangic_ns) / 1000, 'args': {ad: deger}}
+        for ad, zaman, deger in list(_sayac_olaylari)
+    ]
+    for is_parcacigi in threading.enumerate():
+        olaylar.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': is_parcacigi.ident,
+                        'args': {'name': is_parcacigi.name}})
+    with open(yol, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': olaylar, 'displayTimeUnit': 'ms', 'otherData': {'sayaclar': _sayaclar}}, f)
+
+    print(f"\nÖlçüm izi kaydedildi: {yol}", file=sys.stderr)
+    print(f"{'Bölüm':<28}{'Adet':>8}{'Toplam ms':>12}{'Ort. ms':>10}{'En büyük ms':>13}", file=sys.stderr)
+    for ad, s in sorted(ozet().items(), key=lambda x: -x[1]['toplam_ms']):
+        print(f"{ad:<28}{s['adet']:>8}{s['toplam_ms']:>12.1f}{s['ortalama_ms']:>10.3f}{s['en_buyuk_ms']:>13.3f}",
+              file=sys.stderr)
+    for ad, deger in sorted(_sayaclar.items()):
+        print(f"{ad:<28}{deger:>8}", file=sys.stderr)
+
+
+@contextlib.contextmanager
+def tf_profil(dizin=None):
+    """PIRINC_TF_PROFIL (veya dizin) verilmişse bloğu TensorFlow profileriyle çalıştır"""
+    dizin = dizin or TF_PROFIL_DIZINI
+    if not dizin:
+        yield
+        return
+    import tensorflow as tf
+
+    tf.profiler.experimental.start(dizin)
+    try:
+        yield
+    finally:
+        tf.profiler.experimental.stop()
+        print(f"TensorFlow profili kaydedildi: {dizin} (TensorBoard > Profile)", file=sys.stderr)
+
+
+if IZ_DOSYASI:
+    etkinlestir(IZ_DOSYASI)
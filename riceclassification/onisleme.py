@@ -0,0 +1,46 @@
+import numpy as np
+from PIL import Image
+from olcum import bolum
+
+# Sabit değişkenler - model_egitimi.py ile aynı olmalı
+IMG_WIDTH = 150
+IMG_HEIGHT = 150
+
+# Eğitimde flow_from_directory (load_img) ve önbellek aynı çekirdeği kullanır
+RESIZE_FILTER = Image.NEAREST
+OLCEK = np.float32(1.0 / 255)
+
+
+def goruntu_dizisi(img, img_width=IMG_WIDTH, img_height=IMG_HEIGHT):
+    """PIL görüntüsünü eğitimle aynı şekilde boyutlandırıp uint8 RGB dizisine çevir"""
+    # Nearest örnekleme piksel bazlı mod dönüşümüyle sıra değiştirebildiği için
+    # önce küçültülür, sonra (gerekirse) RGB'ye çevrilir
+    with bolum("onisleme.boyutlandir"):
+        img = img.resize((img_width, img_height), RESIZE_FILTER)
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        return np.asarray(img)
+
+
+def normalize(dizi, out=None):
+    """uint8 görüntü veya batch dizisini [0, 1] aralığında float32'ye çevir"""
+    with bolum("onisleme.normalize"):
+        if out is None:
+            out = np.empty(dizi.shape, dtype=np.float32)
+        np.multiply(dizi, OLCEK, out=out, dtype=np.float32)
+        return out
+
+
+def goruntu_onisle(img, img_width=IMG_WIDTH, img_height=IMG_HEIGHT, out=None):
+    """PIL görüntüsünü modelin beklediği (yükseklik, genişlik, 3) float32 formatına dönüştür"""
+    return normalize(goruntu_dizisi(img, img_width, img_height), out)
+
+
+def batch_onisle(goruntuler, img_width=IMG_WIDTH, img_height=IMG_HEIGHT, out=None):
+    """Görüntüleri önceden ayrılmış (n, yükseklik, genişlik, 3) float32 tampona yaz"""
+    n = len(goruntuler)
+    if out is None:
+        out = np.empty((n, img_height, img_width, 3), dtype=np.float32)
+    for i, img in enumerate(goruntuler):
+        goruntu_onisle(img, img_width, img_height, out=out[i])
+    return out[:n]
@@ -0,0 +1,102 @@
+import os
+import time
+import argparse
+import tracemalloc
+from contextlib import ExitStack
+import numpy as np
+from PIL import Image
+from onisleme import batch_onisle, IMG_WIDTH, IMG_HEIGHT
+
+DATASET_PATH = "Rice_Image_Dataset"
+
+
+def eski_onisle(img, img_width=IMG_WIDTH, img_height=IMG_HEIGHT):
+    """app.py'deki eski preprocess_image ile aynı işlemler (karşılaştırma için)"""
+    img_resized = img.resize((img_width, img_height))
+    img_array = np.array(img_resized)
+    if len(img_array.shape) == 2:
+        img_array = np.stack((img_array,) * 3, axis=-1)
+    elif img_array.shape[2] == 4:
+        img_array = img_array[:, :, :3]
+    img_array = img_array / 255.0
+    return np.expand_dims(img_array, axis=0)
+
+
+def eski_batch(goruntuler):
+    return np.vstack([eski_onisle(img) for img in goruntuler])
+
+
+def yeni_batch(goruntuler, tampon):
+    return batch_onisle(goruntuler, out=tampon)
+
+
+def olc(fonksiyon, tekrar):
+    """Fonksiyonu tekrar tekrar çalıştırıp en iyi süreyi ve en yüksek bellek kullanımını döndür"""
+    fonksiyon()  # ısınma
+    sureler = []
+    for _ in range(tekrar):
+        baslangic = time.perf_counter()
+        fonksiyon()
+        sureler.append(time.perf_counter() - baslangic)
+
+    tracemalloc.start()
+    fonksiyon()
+    _, tepe = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(sureler), tepe
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Eski ve yeni ön işleme yolunun görüntü başına maliyeti")
+    parser.add_argument("--veri", default=DATASET_PATH)
+    parser.add_argument("--adet", type=int, default=256, help="Ölçümde kullanılacak görüntü sayısı")
+    parser.add_argument("--tekrar", type=int, default=5)
+    parser.add_argument("--cozme-dahil", action='store_true', help="JPEG çözme süresini de ölçüme kat")
+    args = parser.parse_args()
+
+    yollar = sorted(
+        os.path.join(kok, dosya)
+        for kok, _, dosyalar in os.walk(args.veri)
+        for dosya in dosyalar
+        if dosya.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp'))
+    )
+    secilen = [yollar[i] for i in np.linspace(0, len(yollar) - 1, args.adet).astype(int)]
+    tampon = np.empty((len(secilen), IMG_HEIGHT, IMG_WIDTH, 3), dtype=np.float32)
+
+    if args.cozme_dahil:
+        def goruntulerle(islem):
+            """Görüntüleri açıp işlemden geçir; dosyalar işlem bitince kapanır"""
+            with ExitStack() as yigin:
+                return islem([yigin.enter_context(Image.open(yol)) for yol in secilen])
+    else:
+        onceden_cozulmus = []
+        for yol in secilen:
+            with Image.open(yol) as img:
+                img.load()
+            onceden_cozulmus.append(img)
+
+        def goruntulerle(islem):
+            return islem(onceden_cozulmus)
+
+    # Çıktılar aynı çekirdekle boyutlandırıldığında eşleşmeli; fark yalnızca filtreden gelir
+    fark = goruntulerle(
+        lambda g: np.abs(eski_batch(g[:8]).astype(np.float32) - yeni_batch(g[:8], tampon[:8])).max()
+    )
+
+    print(f"{len(secilen)} görüntü, {args.tekrar} tekrar ({'çözme dahil' if args.cozme_dahil else 'çözme hariç'})")
+    print(f"{'Yol':<10}{'µs/görüntü':>14}{'tepe bellek (MB)':>20}")
+    sonuclar = {}
+    for ad, fonksiyon in [
+        ("eski", lambda: goruntulerle(eski_batch)),
+        ("yeni", lambda: goruntulerle(lambda g: yeni_batch(g, tampon))),
+    ]:
+        sure, tepe = olc(fonksiyon, args.tekrar)
+        sonuclar[ad] = sure
+        print(f"{ad:<10}{sure / len(secilen) * 1e6:>14.1f}{tepe / 2**20:>20.2f}")
+
+    print(f"\nHızlanma: {sonuclar['eski'] / sonuclar['yeni']:.2f}x")
+    print(f"Eski (varsayılan filtre) ve yeni (eğitimle aynı NEAREST) çıktı arasındaki en büyük fark: {fark:.4f}")
+
+
+if __name__ == "__main__":
+    main()
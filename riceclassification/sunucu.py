@@ -0,0 +1,270 @@
+import io
+import json
+import time
+import queue
+import argparse
+import threading
+from collections import deque, Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import numpy as np
+from PIL import Image
+from onisleme import goruntu_dizisi, normalize, IMG_WIDTH, IMG_HEIGHT
+from cikarim import arka_uc_argumanlari, arka_uc_argumanlardan, onbellek_eki, sinif_isimleri_yukle, UyarlamaliArkaUcu
+from tahmin_onbellegi import icerik_ozeti, onbellek_ac
+from model_paketi import varsayilan_model
+
+# Sabit değişkenler - model_egitimi.py ile aynı olmalı
+MODEL_PATH = varsayilan_model()
+SINIF_DOSYASI = "sinif_isimleri.npy"
+
+MAX_GOVDE_BOYUTU = 20 * 1024 * 1024
+ISTATISTIK_PENCERESI = 10000
+
+
+class _Is:
+    """Kuyruktaki tek bir tahmin isteği"""
+
+    def __init__(self, dizi):
+        self.dizi = dizi
+        self.olay = threading.Event()
+        self.sonuc = None
+        self.hata = None
+
+
+class DinamikBatchleyici:
+    """Eşzamanlı istekleri gecikme bütçesi içinde mikro batch'lerde toplayıp modelden geçirir"""
+
+    def __init__(self, arka_uc, img_width=IMG_WIDTH, img_height=IMG_HEIGHT, max_batch=32, max_bekleme=0.005):
+        self.arka_uc = arka_uc
+        self.max_batch = max_batch
+        self.max_bekleme = max_bekleme
+        self.kuyruk = queue.Queue()
+        self.tampon = np.empty((max_batch, img_height, img_width, 3), dtype=np.float32)
+
+        self.kilit = threading.Lock()
+        self.gecikmeler = deque(maxlen=ISTATISTIK_PENCERESI)
+        self.batch_boyutlari = deque(maxlen=ISTATISTIK_PENCERESI)
+        self.istek_sayisi = 0
+        self.batch_sayisi = 0
+
+        self.is_parcacigi = threading.Thread(target=self._calis, daemon=True)
+        self.is_parcacigi.start()
+
+    def tahmin(self, dizi):
+        """Boyutlandırılmış uint8 görüntüyü kuyruğa ekle ve olasılık vektörünü bekle"""
+        is_ = _Is(dizi)
+        self.kuyruk.put(is_)
+        is_.olay.wait()
+        if is_.hata is not None:
+            raise is_.hata
+        return is_.sonuc
+
+    def durdur(self):
+        self.kuyruk.put(None)
+        self.is_parcacigi.join()
+
+    def _calis(self):
+        while True:
+            ilk = self.kuyruk.get()
+            if ilk is None:
+                return
+            isler = [ilk]
+            son_tarih = time.perf_counter() + self.max_bekleme
+            durdur = False
+            # İlk istekten sonra en fazla max_bekleme kadar yeni istek topla
+            while len(isler) < self.max_batch:
+                kalan = son_tarih - time.perf_counter()
+                try:
+                    is_ = self.kuyruk.get(timeout=kalan) if kalan > 0 else self.kuyruk.get_nowait()
+                except queue.Empty:
+                    break
+                if is_ is None:
+                    durdur = True
+                    break
+                isler.append(is_)
+
+            self._batch_isle(isler)
+            if durdur:
+                return
+
+    def _batch_isle(self, isler):
+        n = len(isler)
+        try:
+            for i, is_ in enumerate(isler):
+                normalize(is_.dizi, out=self.tampon[i])
+            olasiliklar = self.arka_uc.tahmin(self.tampon[:n])
+            for is_, p in zip(isler, olasiliklar):
+                is_.sonuc = p
+        except Exception as e:
+            for is_ in isler:
+                is_.hata = e
+        finally:
+            with self.kilit:
+                self.batch_boyutlari.append(n)
+                self.batch_sayisi += 1
+            for is_ in isler:
+                is_.olay.set()
+
+    def gecikme_kaydet(self, sure):
+        with self.kilit:
+            self.gecikmeler.append(sure)
+            self.istek_sayisi += 1
+
+    def istatistikler(self):
+        """Gecikme yüzdelikleri ve batch boyutu dağılımını döndür"""
+        with self.kilit:
+            gecikmeler = np.array(self.gecikmeler) * 1000
+            boyutlar = np.array(self.batch_boyutlari)
+            istek_sayisi = self.istek_sayisi
+            batch_sayisi = self.batch_sayisi
+
+        sonuc = {'istek_sayisi': istek_sayisi, 'batch_sayisi': batch_sayisi}
+        if len(gecikmeler):
+            sonuc['gecikme_ms'] = {
+                'p50': float(np.percentile(gecikmeler, 50)),
+                'p99': float(np.percentile(gecikmeler, 99)),
+                'ortalama': float(gecikmeler.mean()),
+            }
+        if len(boyutlar):
+            sonuc['batch_boyutu'] = {
+                'ortalama': float(boyutlar.mean()),
+                'p50': float(np.percentile(boyutlar, 50)),
+                'max': int(boyutlar.max()),
+                'dagilim': {str(k): v for k, v in sorted(Counter(boyutlar.tolist()).items())},
+            }
+        return sonuc
+
+
+def sonuc_olustur(olasiliklar, sinif_isimleri):
+    """show_probability_bars ile aynı sırada sınıf ve yüzde listesi oluştur"""
+    sirali = np.argsort(olasiliklar)[::-1]
+    return {
+        'sinif': str(sinif_isimleri[sirali[0]]),
+        'guven': float(olasiliklar[sirali[0]] * 100),
+        'olasiliklar': [
+            {'sinif': str(sinif_isimleri[idx]), 'yuzde': float(olasiliklar[idx] * 100)} for idx in sirali
+        ],
+    }
+
+
+class SiniflandirmaIstekleri(BaseHTTPRequestHandler):
+    """POST /siniflandir ve GET /istatistik uç noktaları"""
+
+    batchleyici = None
+    sinif_isimleri = None
+    img_width = IMG_WIDTH
+    img_height = IMG_HEIGHT
+    kayit = False
+    onbellek = None
+
+    def _json_gonder(self, kod, veri):
+        govde = json.dumps(veri, ensure_ascii=False).encode('utf-8')
+        self.send_response(kod)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(govde)))
+        self.end_headers()
+        self.wfile.write(govde)
+
+    def do_GET(self):
+        if self.path == '/istatistik':
+            istatistikler = self.batchleyici.istatistikler()
+            if self.onbellek is not None:
+                istatistikler['onbellek'] = self.onbellek.istatistikler()
+            if isinstance(self.batchleyici.arka_uc, UyarlamaliArkaUcu):
+                istatistikler['kademe'] = self.batchleyici.arka_uc.istatistikler()
+            self._json_gonder(200, istatistikler)
+        elif self.path == '/saglik':
+            self._json_gonder(200, {'durum': 'hazir'})
+        else:
+            self._json_gonder(404, {'hata': 'Bulunamadı'})
+
+    def do_POST(self):
+        if self.path != '/siniflandir':
+            self._json_gonder(404, {'hata': 'Bulunamadı'})
+            return
+        baslangic = time.perf_counter()
+        uzunluk = int(self.headers.get('Content-Length') or 0)
+        if uzunluk <= 0:
+            self._json_gonder(411, {'hata': 'Görüntü verisi gerekli'})
+            return
+        if uzunluk > MAX_GOVDE_BOYUTU:
+            self._json_gonder(413, {'hata': 'Görüntü çok büyük'})
+            return
+
+        veri = self.rfile.read(uzunluk)
+        ozet = olasiliklar = None
+        if self.onbellek is not None:
+            # Aynı görüntü daha önce sınıflandırıldıysa çözme ve tahmin atlanır
+            ozet = icerik_ozeti(veri)
+            olasiliklar = self.onbellek.al(ozet)
+
+        if olasiliklar is None:
+            try:
+                with Image.open(io.BytesIO(veri)) as img:
+                    dizi = goruntu_dizisi(img, self.img_width, self.img_height)
+            except Exception as e:
+                self._json_gonder(400, {'hata': f"Görüntü okunamadı: {e}"})
+                return
+
+            try:
+                olasiliklar = self.batchleyici.tahmin(dizi)
+            except Exception as e:
+                self._json_gonder(500, {'hata': f"Sınıflandırma sırasında hata oluştu: {e}"})
+                return
+            if ozet is not None:
+                self.onbellek.koy(ozet, olasiliklar)
+
+        self._json_gonder(200, sonuc_olustur(olasiliklar, self.sinif_isimleri))
+        self.batchleyici.gecikme_kaydet(time.perf_counter() - baslangic)
+
+    def log_message(self, format, *args):
+        if self.kayit:
+            super().log_message(format, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dinamik batch'leme yapan HTTP sınıflandırma sunucusu")
+    parser.add_argument("--adres", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--model", default=MODEL_PATH, help="Model paketi (.pirinc), Keras (.h5) veya TFLite (.tflite) modeli")
+    parser.add_argument("--siniflar", default=SINIF_DOSYASI, help="Model paket değilse sınıf isimleri dosyası")
+    parser.add_argument("--max-batch", type=int, default=32, help="Bir mikro batch'teki en fazla istek")
+    parser.add_argument("--max-bekleme-ms", type=float, default=5.0,
+                        help="İlk istekten sonra batch doldurmak için beklenecek en uzun süre")
+    parser.add_argument("--kayit", action='store_true', help="Her isteği standart hataya yaz")
+    parser.add_argument("--onbellek", default="", help="Görüntü içeriğine göre tahmin önbelleği (SQLite dosyası)")
+    arka_uc_argumanlari(parser)
+    args = parser.parse_args()
+
+    arka_uc = arka_uc_argumanlardan(args)
+    img_height, img_width = arka_uc.girdi_boyutu
+    sinif_isimleri = sinif_isimleri_yukle(args.model, args.siniflar)
+
+    # İlk tahmin grafiği oluşturduğu için sunucu açılmadan önce yapılır
+    arka_uc.tahmin(np.zeros((args.max_batch, img_height, img_width, 3), dtype=np.float32))
+
+    batchleyici = DinamikBatchleyici(
+        arka_uc, img_width, img_height, max_batch=args.max_batch, max_bekleme=args.max_bekleme_ms / 1000
+    )
+    SiniflandirmaIstekleri.batchleyici = batchleyici
+    SiniflandirmaIstekleri.sinif_isimleri = sinif_isimleri
+    SiniflandirmaIstekleri.img_width = img_width
+    SiniflandirmaIstekleri.img_height = img_height
+    SiniflandirmaIstekleri.kayit = args.kayit
+    SiniflandirmaIstekleri.onbellek = onbellek_ac(
+        args.onbellek, args.model, ek=onbellek_eki(arka_uc)
+    )
+
+    sunucu = ThreadingHTTPServer((args.adres, args.port), SiniflandirmaIstekleri)
+    print(f"Sunucu http://{args.adres}:{args.port} adresinde dinliyor")
+    try:
+        sunucu.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sunucu.server_close()
+        batchleyici.durdur()
+
+
+if __name__ == "__main__":
+    main()
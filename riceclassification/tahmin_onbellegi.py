@@ -0,0 +1,137 @@
+import time
+import sqlite3
+import hashlib
+import threading
+import numpy as np
+from model_paketi import ModelPaketi, paket_mi
+
+ONBELLEK_YOLU = "tahmin_onbellegi.sqlite"
+EN_FAZLA = 100000
+
+# Sınır her eklemede değil, bu kadar eklemede bir kontrol edilir
+TEMIZLIK_ARALIGI = 256
+
+
+def icerik_ozeti(veri):
+    """Kodlanmış görüntü baytlarının SHA-1 özetini döndür (çözmeden önce hesaplanır)"""
+    return hashlib.sha1(veri).hexdigest()
+
+
+def dosya_ozeti(yol):
+    """Dosyanın SHA-1 özetini parça parça okuyarak döndür"""
+    ozet = hashlib.sha1()
+    with open(yol, 'rb') as f:
+        for parca in iter(lambda: f.read(1 << 20), b''):
+            ozet.update(parca)
+    return ozet.hexdigest()
+
+
+def model_surumu(model_yolu):
+    """Model dosyasının içeriğinden sürüm özeti üret; model değişince önbellek kayıtları geçersizleşir"""
+    if paket_mi(model_yolu):
+        # Paket kendi içerik özetini başlığında taşır, dosyanın tamamını okumaya gerek yok
+        return ModelPaketi(model_yolu).ozet
+    return dosya_ozeti(model_yolu)
+
+
+class TahminOnbellegi:
+    """Görüntü içerik özeti ve model sürümüne göre olasılık vektörlerini tutan kalıcı LRU önbellek
+
+    Kayıtlar SQLite dosyasında saklanır; aynı dosyayı arayüz, toplu araç ve sunucu birlikte
+    kullanabilir. Kayıt sayısı en_fazla'yı aşınca en uzun süredir erişilmeyenler silinir.
+    """
+
+    def __init__(self, yol=ONBELLEK_YOLU, model_surumu="", en_fazla=EN_FAZLA):
+        self.model_surumu = model_surumu
+        self.en_fazla = en_fazla
+        self.kilit = threading.Lock()
+        self._ekleme = 0
+        self.isabet = 0
+        self.iskalama = 0
+
+        self.baglanti = sqlite3.connect(yol, timeout=30, check_same_thread=False, isolation_level=None)
+        # WAL kipinde okuyucular yazan başka bir süreci beklemez
+        self.baglanti.execute("PRAGMA journal_mode=WAL")
+        self.baglanti.execute("PRAGMA synchronous=NORMAL")
+        self.baglanti.execute(
+            "CREATE TABLE IF NOT EXISTS tahminler ("
+            " goruntu TEXT NOT NULL, model TEXT NOT NULL, olasiliklar BLOB NOT NULL, erisim REAL NOT NULL,"
+            " PRIMARY KEY (goruntu, model))"
+        )
+        self.baglanti.execute("CREATE INDEX IF NOT EXISTS tahminler_erisim ON tahminler (erisim)")
+
+    def al_coklu(self, ozetler):
+        """Önbellekte bulunan özetler için {özet: olasılıklar} döndür ve erişim zamanlarını güncelle"""
+        ozetler = list(set(ozetler))
+        if not ozetler:
+            return {}
+        bulunan = {}
+        with self.kilit:
+            for i in range(0, len(ozetler), 500):
+                parca = ozetler[i:i + 500]
+                satirlar = self.baglanti.execute(
+                    f"SELECT goruntu, olasiliklar FROM tahminler WHERE model = ? AND goruntu IN "
+                    f"({','.join('?' * len(parca))})",
+                    [self.model_surumu] + parca
+                ).fetchall()
+                for goruntu, blob in satirlar:
+                    bulunan[goruntu] = np.frombuffer(blob, dtype=np.float32).copy()
+            if bulunan:
+                simdi = time.time()
+                self.baglanti.executemany(
+                    "UPDATE tahminler SET erisim = ? WHERE goruntu = ? AND model = ?",
+                    [(simdi, ozet, self.model_surumu) for ozet in bulunan]
+                )
+            self.isabet += len(bulunan)
+            self.iskalama += len(ozetler) - len(bulunan)
+        return bulunan
+
+    def al(self, ozet):
+        """Tek bir görüntünün olasılıklarını döndür; yoksa None"""
+        return self.al_coklu([ozet]).get(ozet)
+
+    def koy_coklu(self, kayitlar):
+        """(özet, olasılıklar) çiftlerini önbelleğe yaz"""
+        simdi = time.time()
+        satirlar = [
+            (ozet, self.model_surumu, np.asarray(p, dtype=np.float32).tobytes(), simdi) for ozet, p in kayitlar
+        ]
+        if not satirlar:
+            return
+        with self.kilit:
+            self.baglanti.execute("BEGIN")
+            self.baglanti.executemany("INSERT OR REPLACE INTO tahminler VALUES (?, ?, ?, ?)", satirlar)
+            self.baglanti.execute("COMMIT")
+            self._ekleme += len(satirlar)
+            if self._ekleme >= TEMIZLIK_ARALIGI:
+                self._ekleme = 0
+                self._temizle()
+
+    def koy(self, ozet, olasiliklar):
+        self.koy_coklu([(ozet, olasiliklar)])
+
+    def _temizle(self):
+        """Kayıt sayısı sınırı aşıldıysa en eski erişilenleri sil"""
+        fazla = self.baglanti.execute("SELECT COUNT(*) FROM tahminler").fetchone()[0] - self.en_fazla
+        if fazla > 0:
+            self.baglanti.execute(
+                "DELETE FROM tahminler WHERE rowid IN (SELECT rowid FROM tahminler ORDER BY erisim LIMIT ?)",
+                (fazla,)
+            )
+
+    def istatistikler(self):
+        with self.kilit:
+            kayit = self.baglanti.execute("SELECT COUNT(*) FROM tahminler").fetchone()[0]
+            return {'kayit': kayit, 'isabet': self.isabet, 'iskalama': self.iskalama}
+
+    def close(self):
+        with self.kilit:
+            self.baglanti.close()
+
+
+def onbellek_ac(yol, model_yolu, en_fazla=EN_FAZLA, ek=""):
+    """Yol boş değilse modelin sürümüne (ve varsa TTA / topluluk ayarlarına) bağlı bir önbellek aç"""
+    if not yol:
+        return None
+    surum = model_surumu(model_yolu)
+    return TahminOnbellegi(yol, f"{surum}+{ek}" if ek else surum, en_fazla)
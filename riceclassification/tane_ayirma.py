@@ -0,0 +1,131 @@
+import sys
+import json
+import argparse
+from collections import Counter
+import numpy as np
+import cv2
+from PIL import Image
+from onisleme import goruntu_dizisi, normalize
+from model_paketi import varsayilan_model
+
+# Sabit değişkenler - model_egitimi.py ile aynı olmalı
+MODEL_PATH = varsayilan_model()
+SINIF_DOSYASI = "sinif_isimleri.npy"
+
+# Bundan küçük bileşenler (toz, gürültü) tane sayılmaz
+EN_KUCUK_ALAN = 100
+# Eğitim görüntülerindeki gibi tanenin çevresinde bırakılan siyah pay (kutunun uzun kenarına oranı)
+KENAR_PAYI = 0.15
+
+
+def taneleri_bul(rgb, en_kucuk_alan=EN_KUCUK_ALAN, kenar_payi=KENAR_PAYI):
+    """Koyu zemindeki taneleri Otsu eşiği ve bağlı bileşenlerle bul
+
+    Her tane için (x, y, genişlik, yükseklik) kutusunu ve eğitim görüntülerine benzeyen
+    kare kırpıntıyı döndürür: tane ortada, kendi bileşeni dışındaki pikseller siyah.
+    Birbirine değen taneler tek bileşen olarak çıkar.
+    """
+    gri = cv2.GaussianBlur(cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY), (5, 5), 0)
+    _, maske = cv2.threshold(gri, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    maske = cv2.morphologyEx(maske, cv2.MORPH_OPEN, np.ones((3, 3), np.uint8))
+    adet, etiketler, istatistikler, _ = cv2.connectedComponentsWithStats(maske, connectivity=8)
+
+    yukseklik, genislik = maske.shape
+    kutular = []
+    kirpintilar = []
+    for i in range(1, adet):  # 0 zemin
+        x, y, w, h, alan = (int(v) for v in istatistikler[i])
+        if alan < en_kucuk_alan:
+            continue
+        kenar = int(max(w, h) * (1 + 2 * kenar_payi))
+        # Kare, kutunun merkezine yerleştirilir ve görüntü sınırlarına kırpılır
+        x0 = x + w // 2 - kenar // 2
+        y0 = y + h // 2 - kenar // 2
+        kx0, ky0 = max(0, x0), max(0, y0)
+        kx1, ky1 = min(genislik, x0 + kenar), min(yukseklik, y0 + kenar)
+        kare = np.zeros((kenar, kenar, 3), dtype=np.uint8)
+        bolge = kare[ky0 - y0:ky1 - y0, kx0 - x0:kx1 - x0]
+        tane = etiketler[ky0:ky1, kx0:kx1] == i
+        bolge[tane] = rgb[ky0:ky1, kx0:kx1][tane]
+        kutular.append((x, y, w, h))
+        kirpintilar.append(kare)
+    return kutular, kirpintilar
+
+
+def tepsi_siniflandir(arka_uc, img, sinif_isimleri, en_kucuk_alan=EN_KUCUK_ALAN, kenar_payi=KENAR_PAYI):
+    """Bir karedeki tüm taneleri bul ve tek batch'te sınıflandır
+
+    Tane başına kutu, sınıf, güven ve olasılıkları; sınıf başına sayıları döndürür.
+    """
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    kutular, kirpintilar = taneleri_bul(np.asarray(img), en_kucuk_alan, kenar_payi)
+    sayilar = Counter({str(s): 0 for s in sinif_isimleri})
+    if not kutular:
+        return {'taneler': [], 'sayilar': dict(sayilar)}
+
+    img_height, img_width = arka_uc.girdi_boyutu
+    tampon = np.empty((len(kirpintilar), img_height, img_width, 3), dtype=np.float32)
+    for i, kare in enumerate(kirpintilar):
+        normalize(goruntu_dizisi(Image.fromarray(kare), img_width, img_height), out=tampon[i])
+    olasiliklar = arka_uc.tahmin(tampon)
+
+    taneler = []
+    for kutu, p in zip(kutular, olasiliklar):
+        idx = int(np.argmax(p))
+        sinif = str(sinif_isimleri[idx])
+        sayilar[sinif] += 1
+        taneler.append({
+            'kutu': list(kutu),
+            'sinif': sinif,
+            'guven': float(p[idx]),
+            'olasiliklar': {str(s): float(o) for s, o in zip(sinif_isimleri, p)},
+        })
+    return {'taneler': taneler, 'sayilar': dict(sayilar)}
+
+
+def isaretle(img, taneler):
+    """Kutuları ve sınıf adlarını görüntünün üzerine çiz (BGR dizi döndürür, cv2.imwrite için)"""
+    cizim = cv2.cvtColor(np.asarray(img.convert('RGB')), cv2.COLOR_RGB2BGR)
+    for tane in taneler:
+        x, y, w, h = tane['kutu']
+        cv2.rectangle(cizim, (x, y), (x + w, y + h), (0, 200, 0), 2)
+        cv2.putText(cizim, f"{tane['sinif']} {tane['guven'] * 100:.0f}%", (x, max(12, y - 4)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 200, 0), 1, cv2.LINE_AA)
+    return cizim
+
+
+def main():
+    from cikarim import arka_uc_argumanlari, arka_uc_argumanlardan, sinif_isimleri_yukle
+
+    parser = argparse.ArgumentParser(description="Tepsi fotoğrafındaki taneleri ayırıp her birini sınıflandır")
+    parser.add_argument("goruntu", help="Koyu zemin üzerinde birden fazla tane içeren fotoğraf")
+    parser.add_argument("--model", default=MODEL_PATH, help="Model paketi (.pirinc), Keras (.h5) veya TFLite (.tflite) modeli")
+    parser.add_argument("--siniflar", default=SINIF_DOSYASI, help="Model paket değilse sınıf isimleri dosyası")
+    parser.add_argument("--en-kucuk-alan", type=int, default=EN_KUCUK_ALAN, help="Tane sayılacak en küçük alan (piksel)")
+    parser.add_argument("--kenar-payi", type=float, default=KENAR_PAYI)
+    parser.add_argument("--isaretli", help="Kutuların çizildiği görüntünün kaydedileceği dosya")
+    parser.add_argument("--cikti", help="Sonuçların yazılacağı JSON dosyası")
+    arka_uc_argumanlari(parser)
+    args = parser.parse_args()
+
+    arka_uc = arka_uc_argumanlardan(args)
+    sinif_isimleri = sinif_isimleri_yukle(args.model, args.siniflar)
+    with Image.open(args.goruntu) as img:
+        img.load()
+    sonuc = tepsi_siniflandir(arka_uc, img, sinif_isimleri, args.en_kucuk_alan, args.kenar_payi)
+
+    print(f"{len(sonuc['taneler'])} tane bulundu", file=sys.stderr)
+    for sinif, sayi in sorted(sonuc['sayilar'].items(), key=lambda x: -x[1]):
+        print(f"{sinif:<12}{sayi:>6}")
+    if args.isaretli:
+        cv2.imwrite(args.isaretli, isaretle(img, sonuc['taneler']))
+        print(f"İşaretli görüntü kaydedildi: {args.isaretli}", file=sys.stderr)
+    if args.cikti:
+        with open(args.cikti, 'w', encoding='utf-8') as f:
+            json.dump(sonuc, f, ensure_ascii=False, indent=2)
+        print(f"Sonuçlar kaydedildi: {args.cikti}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import itertools
+import subprocess
+import numpy as np
+
+# Sabit değişkenler - model_egitimi.py ile aynı olmalı
+DATASET_PATH = "Rice_Image_Dataset"
+ONBELLEK_DIZINI = "veri_onbellegi"
+TARAMA_DIZINI = "tarama"
+
+# Denenecek değerler; --uzay ile JSON dosyasından değiştirilebilir
+ARAMA_UZAYI = {
+    'img_size': [64, 96, 150],
+    'batch_size': [32, 64],
+    'epochs': [5],
+    'conv1': [8, 16, 32],
+    'conv2': [16, 32, 64],
+    'dense': [32, 64, 128],
+    'dropout': [0.2, 0.3, 0.5],
+}
+
+# Budama: bu epoch'tan itibaren, aynı epoch'a ulaşmış en az EN_AZ_KOMSU denemenin
+# val_accuracy medyanının altında kalan deneme durdurulur
+BUDAMA_BASLANGIC_EPOCH = 2
+EN_AZ_KOMSU = 3
+
+
+def denemeleri_sec(uzay, adet, seed=0):
+    """Arama uzayından tekrarsız rastgele deneme yapılandırmaları seç"""
+    anahtarlar = sorted(uzay)
+    tumu = list(itertools.product(*(uzay[a] for a in anahtarlar)))
+    rng = np.random.default_rng(seed)
+    secilen = rng.choice(len(tumu), size=min(adet, len(tumu)), replace=False)
+    return [dict(zip(anahtarlar, tumu[i])) for i in secilen]
+
+
+def _ara_sonuclari_oku(dizin, haric):
+    """Diğer denemelerin epoch başına val_accuracy değerlerini oku"""
+    sonuclar = {}
+    for yol in glob.glob(os.path.join(dizin, "deneme_*.epoch.jsonl")):
+        if yol.endswith(f"deneme_{haric}.epoch.jsonl"):
+            continue
+        with open(yol, encoding='utf-8') as f:
+            for satir in f:
+                try:
+                    kayit = json.loads(satir)
+                except ValueError:
+                    continue  # henüz yazılmakta olan satır
+                sonuclar.setdefault(kayit['epoch'], []).append(kayit['val_accuracy'])
+    return sonuclar
+
+
+def denemeyi_calistir(deneme_no, yapilandirma, dizin, onbellek_dizini, is_parcacigi=None):
+    """Tek bir denemeyi eğit, ara sonuçlara göre budanabilir; sonucu JSON dosyasına yaz (alt süreçte)"""
+    import tensorflow as tf
+
+    if is_parcacigi:
+        tf.config.threading.set_intra_op_parallelism_threads(is_parcacigi)
+        tf.config.threading.set_inter_op_parallelism_threads(2)
+
+    from tensorflow.keras.preprocessing.image import ImageDataGenerator
+    import veri_onbellegi
+    from model_mimarisi import model_olustur
+
+    boyut = yapilandirma['img_size']
+    veri_seti = veri_onbellegi.OnbellekVeriSeti(onbellek_dizini, boyut, boyut)
+    # model_egitimi.py'deki veri artırma ayarları
+    datagen = ImageDataGenerator(
+        rotation_range=20, width_shift_range=0.1, height_shift_range=0.1,
+        shear_range=0.1, zoom_range=0.1, horizontal_flip=True
+    )
+    egitim = veri_seti.sequence('training', yapilandirma['batch_size'], datagen=datagen, seed=deneme_no)
+    dogrulama = veri_seti.sequence('validation', yapilandirma['batch_size'], shuffle=False)
+
+    model = model_olustur(
+        len(veri_seti.sinif_isimleri), boyut, boyut, yapilandirma['conv1'], yapilandirma['conv2'],
+        yapilandirma['dense'], yapilandirma['dropout']
+    )
+    model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
+    epoch_yolu = os.path.join(dizin, f"deneme_{deneme_no}.epoch.jsonl")
+
+    class Budayici(tf.keras.callbacks.Callback):
+        """val_accuracy'yi paylaşılan dosyaya yazar ve medyanın altında kalırsa eğitimi durdurur"""
+
+        budandi = False
+
+        def on_epoch_end(self, epoch, logs=None):
+            val_accuracy = float(logs['val_accuracy'])
+            with open(epoch_yolu, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'epoch': epoch, 'val_accuracy': val_accuracy}) + '\n')
+            if epoch + 1 < BUDAMA_BASLANGIC_EPOCH:
+                return
+            komsular = _ara_sonuclari_oku(dizin, deneme_no).get(epoch, [])
+            if len(komsular) >= EN_AZ_KOMSU and val_accuracy < np.median(komsular):
+                print(f"Deneme {deneme_no} epoch {epoch + 1}'de budandı "
+                      f"({val_accuracy:.4f} < medyan {np.median(komsular):.4f})")
+                Budayici.budandi = True
+                self.model.stop_training = True
+
+    baslangic = time.perf_counter()
+    gecmis = model.fit(
+        egitim, validation_data=dogrulama, epochs=yapilandirma['epochs'], callbacks=[Budayici()], verbose=0
+    ).history
+    egitim_suresi = time.perf_counter() - baslangic
+
+    # Tek görüntü çıkarım gecikmesi (arayüz senaryosu)
+    x = np.zeros((1, boyut, boyut, 3), dtype=np.float32)
+    for _ in range(3):
+        model.predict_on_batch(x)
+    sureler = []
+    for _ in range(50):
+        t = time.perf_counter()
+        model.predict_on_batch(x)
+        sureler.append(time.perf_counter() - t)
+
+    sonuc = {
+        'deneme': deneme_no,
+        'yapilandirma': yapilandirma,
+        'val_accuracy': max(gecmis['val_accuracy']),
+        'epoch': len(gecmis['val_accuracy']),
+        'budandi': Budayici.budandi,
+        'parametre_sayisi': int(model.count_params()),
+        'gecikme_ms': float(np.median(sureler) * 1000),
+        'egitim_suresi_sn': egitim_suresi,
+    }
+    with open(os.path.join(dizin, f"deneme_{deneme_no}.json"), 'w', encoding='utf-8') as f:
+        json.dump(sonuc, f, ensure_ascii=False, indent=2)
+
+
+def pareto_on_yuzu(sonuclar):
+    """Doğrulukta daha yüksek, gecikme ve parametre sayısında daha düşük başka denemenin baskılamadığı sonuçlar"""
+    def baskilar(a, b):
+        en_az_esit = (a['val_accuracy'] >= b['val_accuracy'] and a['gecikme_ms'] <= b['gecikme_ms']
+                      and a['parametre_sayisi'] <= b['parametre_sayisi'])
+        daha_iyi = (a['val_accuracy'] > b['val_accuracy'] or a['gecikme_ms'] < b['gecikme_ms']
+                    or a['parametre_sayisi'] < b['parametre_sayisi'])
+        return en_az_esit and daha_iyi
+
+    return [s for s in sonuclar if not any(baskilar(d, s) for d in sonuclar if d is not s)]
+
+
+def tablo_yazdir(sonuclar, pareto):
+    pareto_no = {s['deneme'] for s in pareto}
+    print(f"\n{'#':>4} {'Boyut':>6}{'Batch':>6}{'Conv':>9}{'Dense':>6}{'Drop':>6}"
+          f"{'val_acc':>9}{'ms':>8}{'Parametre':>11}{'Epoch':>6}  Not")
+    for s in sorted(sonuclar, key=lambda s: -s['val_accuracy']):
+        y = s['yapilandirma']
+        conv = f"{y['conv1']}/{y['conv2']}"
+        notlar = []
+        if s['deneme'] in pareto_no:
+            notlar.append("pareto")
+        if s['budandi']:
+            notlar.append("budandı")
+        print(f"{s['deneme']:>4} {y['img_size']:>6}{y['batch_size']:>6}{conv:>9}"
+              f"{y['dense']:>6}{y['dropout']:>6.2f}{s['val_accuracy']:>9.4f}{s['gecikme_ms']:>8.2f}"
+              f"{s['parametre_sayisi']:>11,}{s['epoch']:>6}  {', '.join(notlar)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hiperparametre / mimari taraması (paralel denemeler, erken budama)")
+    parser.add_argument("--deneme-sayisi", type=int, default=12)
+    parser.add_argument("--paralel", type=int, default=2, help="Aynı anda çalışan deneme sayısı")
+    parser.add_argument("--uzay", help="Arama uzayını tanımlayan JSON dosyası")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--veri", default=DATASET_PATH)
+    parser.add_argument("--onbellek-dizini", default=ONBELLEK_DIZINI)
+    parser.add_argument("--dizin", default=TARAMA_DIZINI, help="Deneme sonuçlarının yazılacağı dizin")
+    parser.add_argument("--deneme", help=argparse.SUPPRESS)
+    parser.add_argument("--yapilandirma", help=argparse.SUPPRESS)
+    parser.add_argument("--is-parcacigi", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.deneme is not None:
+        denemeyi_calistir(int(args.deneme), json.loads(args.yapilandirma), args.dizin, args.onbellek_dizini,
+                          args.is_parcacigi)
+        return
+
+    uzay = ARAMA_UZAYI
+    if args.uzay:
+        with open(args.uzay, encoding='utf-8') as f:
+            uzay = json.load(f)
+    denemeler = denemeleri_sec(uzay, args.deneme_sayisi, args.seed)
+    os.makedirs(args.dizin, exist_ok=True)
+    for yol in glob.glob(os.path.join(args.dizin, "deneme_*")):
+        os.remove(yol)
+
+    # Görüntüler her boyut için bir kez çözülür; denemeler aynı memmap önbelleğini paylaşır
+    import veri_onbellegi
+
+    for boyut in sorted({d['img_size'] for d in denemeler}):
+        veri_onbellegi.onbellegi_olustur(args.veri, args.onbellek_dizini, boyut, boyut)
+
+    # Çekirdekler eşzamanlı denemeler arasında paylaştırılır
+    is_parcacigi = max(1, (os.cpu_count() or 1) // args.paralel)
+
+    bekleyen = list(enumerate(denemeler))
+    calisan = []
+    while bekleyen or calisan:
+        while bekleyen and len(calisan) < args.paralel:
+            deneme_no, yapilandirma = bekleyen.pop(0)
+            print(f"Deneme {deneme_no} başladı: {yapilandirma}")
+            calisan.append((deneme_no, subprocess.Popen(
+                [sys.executable, __file__, "--deneme", str(deneme_no), "--yapilandirma", json.dumps(yapilandirma),
+                 "--dizin", args.dizin, "--onbellek-dizini", args.onbellek_dizini,
+                 "--is-parcacigi", str(is_parcacigi)]
+            )))
+        time.sleep(1)
+        for deneme_no, surec in list(calisan):
+            if surec.poll() is not None:
+                calisan.remove((deneme_no, surec))
+                if surec.returncode:
+                    print(f"Deneme {deneme_no} hata ile bitti (kod {surec.returncode})", file=sys.stderr)
+
+    sonuclar = []
+    for yol in glob.glob(os.path.join(args.dizin, "deneme_*.json")):
+        with open(yol, encoding='utf-8') as f:
+            sonuclar.append(json.load(f))
+    if not sonuclar:
+        print("Tamamlanan deneme yok", file=sys.stderr)
+        sys.exit(1)
+
+    pareto = pareto_on_yuzu(sonuclar)
+    tablo_yazdir(sonuclar, pareto)
+    rapor_yolu = os.path.join(args.dizin, "tarama_sonuclari.json")
+    with open(rapor_yolu, 'w', encoding='utf-8') as f:
+        json.dump({'sonuclar': sonuclar, 'pareto': [s['deneme'] for s in pareto]}, f, ensure_ascii=False, indent=2)
+    print(f"\nSonuçlar kaydedildi: {rapor_yolu}")
+
+
+if __name__ == "__main__":
+    main()
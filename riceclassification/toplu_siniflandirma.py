@@ -0,0 +1,260 @@
+import io
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image
+from onisleme import goruntu_dizisi, normalize, IMG_WIDTH, IMG_HEIGHT
+from cikarim import arka_uc_argumanlari, arka_uc_argumanlardan, onbellek_eki, sinif_isimleri_yukle
+from tahmin_onbellegi import icerik_ozeti, onbellek_ac
+from model_paketi import varsayilan_model
+
+# Sabit değişkenler - model_egitimi.py ile aynı olmalı
+MODEL_PATH = varsayilan_model()
+SINIF_DOSYASI = "sinif_isimleri.npy"
+
+GECERLI_UZANTILAR = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def dosyalari_topla(girdiler, liste_dosyasi=None):
+    """Dizin, dosya ve liste dosyası girdilerinden görüntü yollarını sırayla üret"""
+    if liste_dosyasi:
+        with open(liste_dosyasi, encoding='utf-8') as f:
+            for satir in f:
+                satir = satir.strip()
+                if satir:
+                    yield os.path.normpath(satir)
+    for girdi in girdiler:
+        if os.path.isdir(girdi):
+            for kok, dizinler, dosyalar in os.walk(girdi):
+                dizinler.sort()
+                for dosya in sorted(dosyalar):
+                    if dosya.lower().endswith(GECERLI_UZANTILAR):
+                        yield os.path.normpath(os.path.join(kok, dosya))
+        else:
+            yield os.path.normpath(girdi)
+
+
+def _hazirla(yol, img_width, img_height, onbellek=None):
+    """Görüntüyü aç ve boyutlandır; hata varsa mesajını döndür
+
+    Önbellek verilirse dosya bir kez okunup özeti alınır; önbellekte bulunan görüntüler
+    çözülmez, dördüncü öğe (özet, olasılıklar) olur.
+    """
+    try:
+        if onbellek is None:
+            with Image.open(yol) as img:
+                return yol, goruntu_dizisi(img, img_width, img_height), None, None
+        with open(yol, 'rb') as f:
+            veri = f.read()
+        ozet = icerik_ozeti(veri)
+        olasiliklar = onbellek.al(ozet)
+        if olasiliklar is not None:
+            return yol, None, None, (ozet, olasiliklar)
+        with Image.open(io.BytesIO(veri)) as img:
+            return yol, goruntu_dizisi(img, img_width, img_height), None, (ozet, None)
+    except Exception as e:
+        return yol, None, str(e), None
+
+
+def sirali_hazirla(havuz, yollar, img_width, img_height, en_fazla, onbellek=None):
+    """Görüntüleri arka plan havuzunda hazırla, sonuçları girdi sırasıyla üret"""
+    bekleyen = deque()
+    for yol in yollar:
+        bekleyen.append(havuz.submit(_hazirla, yol, img_width, img_height, onbellek))
+        if len(bekleyen) >= en_fazla:
+            yield bekleyen.popleft().result()
+    while bekleyen:
+        yield bekleyen.popleft().result()
+
+
+def _yarim_satiri_kes(yol):
+    """Yarıda kesilmiş bir çalışmadan kalan tamamlanmamış son satırı sil"""
+    with open(yol, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        boyut = f.tell()
+        if boyut == 0:
+            return
+        f.seek(max(0, boyut - 65536))
+        son = f.read()
+        if son.endswith(b'\n'):
+            return
+        konum = son.rfind(b'\n')
+        f.truncate(boyut - len(son) + konum + 1 if konum >= 0 else 0)
+
+
+def islenmis_dosyalar(yol, bicim):
+    """Önceki çalışmada çıktıya yazılmış dosya yollarını döndür"""
+    if not os.path.exists(yol):
+        return set()
+    _yarim_satiri_kes(yol)
+    islenmis = set()
+    with open(yol, encoding='utf-8', newline='') as f:
+        if bicim == 'csv':
+            for satir in csv.DictReader(f):
+                if satir.get('dosya'):
+                    islenmis.add(satir['dosya'])
+        else:
+            for satir in f:
+                try:
+                    islenmis.add(json.loads(satir)['dosya'])
+                except (ValueError, KeyError):
+                    continue
+    return islenmis
+
+
+class SonucYazici:
+    """Sonuçları CSV veya JSONL olarak satır satır yazar"""
+
+    def __init__(self, yol, bicim, sinif_isimleri):
+        self.bicim = bicim
+        self.sinif_isimleri = list(sinif_isimleri)
+        yeni = yol == '-' or not os.path.exists(yol) or os.path.getsize(yol) == 0
+        self.dosya = sys.stdout if yol == '-' else open(yol, 'a', encoding='utf-8', newline='')
+        if bicim == 'csv':
+            self.csv = csv.writer(self.dosya)
+            if yeni:
+                self.csv.writerow(['dosya', 'sinif', 'guven'] + self.sinif_isimleri + ['hata'])
+
+    def yaz(self, yol, olasiliklar=None, hata=None):
+        if self.bicim == 'csv':
+            if hata is not None:
+                self.csv.writerow([yol, '', ''] + [''] * len(self.sinif_isimleri) + [hata])
+            else:
+                idx = int(np.argmax(olasiliklar))
+                self.csv.writerow(
+                    [yol, self.sinif_isimleri[idx], f"{olasiliklar[idx]:.6f}"]
+                    + [f"{p:.6f}" for p in olasiliklar] + ['']
+                )
+        else:
+            if hata is not None:
+                kayit = {'dosya': yol, 'hata': hata}
+            else:
+                idx = int(np.argmax(olasiliklar))
+                kayit = {
+                    'dosya': yol,
+                    'sinif': self.sinif_isimleri[idx],
+                    'guven': float(olasiliklar[idx]),
+                    'olasiliklar': {s: float(p) for s, p in zip(self.sinif_isimleri, olasiliklar)},
+                }
+            self.dosya.write(json.dumps(kayit, ensure_ascii=False) + '\n')
+
+    def flush(self):
+        self.dosya.flush()
+
+    def close(self):
+        if self.dosya is not sys.stdout:
+            self.dosya.close()
+
+
+def siniflandir(yollar, arka_uc, yazici, batch_size=256, workers=None, img_width=IMG_WIDTH,
+                img_height=IMG_HEIGHT, rapor_araligi=5.0, onbellek=None):
+    """Görüntüleri büyük batch'ler halinde modelden geçirip sonuçları akış halinde yaz"""
+    tampon = np.empty((batch_size, img_height, img_width, 3), dtype=np.float32)
+    batch_yollari = []
+    batch_ozetleri = []
+    toplam = 0
+    onbellekten = 0
+    hatali = 0
+    baslangic = time.perf_counter()
+    son_rapor = baslangic
+
+    def batch_isle():
+        n = len(batch_yollari)
+        olasiliklar = arka_uc.tahmin(tampon[:n])
+        for yol, p in zip(batch_yollari, olasiliklar):
+            yazici.yaz(yol, p)
+        yazici.flush()
+        if onbellek is not None:
+            onbellek.koy_coklu(zip(batch_ozetleri, olasiliklar))
+        batch_yollari.clear()
+        batch_ozetleri.clear()
+        return n
+
+    with ThreadPoolExecutor(workers) as havuz:
+        for yol, dizi, hata, bilgi in sirali_hazirla(havuz, yollar, img_width, img_height, batch_size * 2,
+                                                      onbellek):
+            if hata is not None:
+                yazici.yaz(yol, hata=hata)
+                hatali += 1
+                continue
+            if bilgi is not None and bilgi[1] is not None:
+                # Önbellekten gelen sonuç modelden geçirilmeden yazılır
+                yazici.yaz(yol, bilgi[1])
+                toplam += 1
+                onbellekten += 1
+                continue
+            normalize(dizi, out=tampon[len(batch_yollari)])
+            batch_yollari.append(yol)
+            if bilgi is not None:
+                batch_ozetleri.append(bilgi[0])
+            if len(batch_yollari) == batch_size:
+                toplam += batch_isle()
+
+            simdi = time.perf_counter()
+            if simdi - son_rapor >= rapor_araligi:
+                print(f"{toplam} görüntü sınıflandırıldı, {toplam / (simdi - baslangic):.1f} görüntü/sn",
+                      file=sys.stderr)
+                son_rapor = simdi
+
+    if batch_yollari:
+        toplam += batch_isle()
+    yazici.flush()
+
+    sure = time.perf_counter() - baslangic
+    print(f"Tamamlandı: {toplam} görüntü ({onbellekten} önbellekten), {hatali} hata, {sure:.1f} sn, "
+          f"{toplam / sure if sure > 0 else 0.0:.1f} görüntü/sn", file=sys.stderr)
+    return toplam, hatali
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Görüntüleri toplu halde sınıflandır")
+    parser.add_argument("girdiler", nargs='*', help="Görüntü dosyaları veya dizinler")
+    parser.add_argument("--liste", help="Her satırında bir görüntü yolu olan dosya")
+    parser.add_argument("--cikti", default='-', help="Çıktı dosyası ('-' = standart çıktı)")
+    parser.add_argument("--bicim", choices=['csv', 'jsonl'], default=None,
+                        help="Çıktı biçimi (varsayılan: dosya uzantısından, yoksa jsonl)")
+    parser.add_argument("--model", default=MODEL_PATH, help="Model paketi (.pirinc), Keras (.h5) veya TFLite (.tflite) modeli")
+    parser.add_argument("--siniflar", default=SINIF_DOSYASI, help="Model paket değilse sınıf isimleri dosyası")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--is-parcacigi", type=int, default=None, help="Ön işleme iş parçacığı sayısı")
+    parser.add_argument("--devam", action='store_true', help="Çıktıda bulunan dosyaları atlayarak devam et")
+    parser.add_argument("--onbellek", default="", help="Görüntü içeriğine göre tahmin önbelleği (SQLite dosyası)")
+    arka_uc_argumanlari(parser)
+    args = parser.parse_args()
+
+    if not args.girdiler and not args.liste:
+        parser.error("En az bir girdi veya --liste gerekli")
+    bicim = args.bicim or ('csv' if args.cikti.lower().endswith('.csv') else 'jsonl')
+    if args.devam and args.cikti == '-':
+        parser.error("--devam için --cikti ile bir dosya belirtilmeli")
+
+    arka_uc = arka_uc_argumanlardan(args)
+    img_height, img_width = arka_uc.girdi_boyutu
+    sinif_isimleri = sinif_isimleri_yukle(args.model, args.siniflar)
+
+    yollar = dosyalari_topla(args.girdiler, args.liste)
+    if args.devam:
+        islenmis = islenmis_dosyalar(args.cikti, bicim)
+        if islenmis:
+            print(f"{len(islenmis)} dosya daha önce işlenmiş, atlanıyor", file=sys.stderr)
+        yollar = (yol for yol in yollar if yol not in islenmis)
+
+    onbellek = onbellek_ac(args.onbellek, args.model, ek=onbellek_eki(arka_uc))
+    yazici = SonucYazici(args.cikti, bicim, sinif_isimleri)
+    try:
+        siniflandir(yollar, arka_uc, yazici, args.batch_size, args.is_parcacigi, img_width, img_height,
+                    onbellek=onbellek)
+    finally:
+        yazici.close()
+        if onbellek is not None:
+            onbellek.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import numpy as np
+
+# Sabit değişkenler - model_egitimi.py ile aynı olmalı
+BATCH_SIZE = 32
+EPOCHS = 5
+DATASET_PATH = "Rice_Image_Dataset"
+ONBELLEK_DIZINI = "veri_onbellegi"
+VARYANT_DIZINI = "varyantlar"
+RAPOR_DOSYASI = "varyant_raporu.json"
+
+
+def varyanti_egit(ad, dizin, onbellek_dizini, epochs, batch_size):
+    """Varyantı memmap önbelleğiyle eğit, doğrulama F1'ini ve CPU gecikmesini ölç (alt süreçte)"""
+    from tensorflow.keras.preprocessing.image import ImageDataGenerator
+    from tensorflow.keras.callbacks import EarlyStopping
+    import veri_onbellegi
+    from model_mimarisi import varyant_olustur, VARYANTLAR
+    from degerlendirme import KarisiklikMatrisi
+
+    boyut = VARYANTLAR[ad]['img_size']
+    veri_seti = veri_onbellegi.OnbellekVeriSeti(onbellek_dizini, boyut, boyut)
+    # model_egitimi.py'deki veri artırma ayarları
+    datagen = ImageDataGenerator(
+        rotation_range=20, width_shift_range=0.1, height_shift_range=0.1,
+        shear_range=0.1, zoom_range=0.1, horizontal_flip=True
+    )
+    egitim = veri_seti.sequence('training', batch_size, datagen=datagen, seed=0)
+    dogrulama = veri_seti.sequence('validation', batch_size, shuffle=False)
+
+    model = varyant_olustur(ad, len(veri_seti.sinif_isimleri))
+    model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
+    baslangic = time.perf_counter()
+    model.fit(
+        egitim, validation_data=dogrulama, epochs=epochs, verbose=2,
+        callbacks=[EarlyStopping(monitor='val_loss', patience=3, restore_best_weights=True)]
+    )
+    egitim_suresi = time.perf_counter() - baslangic
+
+    model_yolu = os.path.join(dizin, f"{ad}.h5")
+    model.save(model_yolu, include_optimizer=False)
+
+    # Doğrulama bölümü artırmasız, önbellekten tek geçişte değerlendirilir
+    matris = KarisiklikMatrisi(len(veri_seti.sinif_isimleri))
+    for i in range(len(dogrulama)):
+        x, y = dogrulama[i]
+        matris.guncelle(np.argmax(y, axis=1), np.argmax(model.predict_on_batch(x), axis=1))
+
+    def sure_olc(x, tekrar):
+        for _ in range(3):
+            model.predict_on_batch(x)
+        sureler = []
+        for _ in range(tekrar):
+            t = time.perf_counter()
+            model.predict_on_batch(x)
+            sureler.append(time.perf_counter() - t)
+        return float(np.median(sureler))
+
+    x = np.zeros((BATCH_SIZE, boyut, boyut, 3), dtype=np.float32)
+    tekli = sure_olc(x[:1], 100)
+    toplu = sure_olc(x, 20)
+    return {
+        'varyant': ad,
+        **VARYANTLAR[ad],
+        'parametre_sayisi': int(model.count_params()),
+        'boyut_kb': os.path.getsize(model_yolu) / 1024,
+        'agirlikli_f1': matris.agirlikli_f1(),
+        'dogruluk': matris.dogruluk(),
+        'gecikme_ms': tekli * 1000,
+        'verim_goruntu_sn': BATCH_SIZE / toplu,
+        'egitim_suresi_sn': egitim_suresi,
+        'model': model_yolu,
+    }
+
+
+def rapor_yazdir(sonuclar, f1_esigi):
+    print(f"\n{'Varyant':<22}{'Girdi':>6}{'Parametre':>12}{'Boyut KB':>10}{'F1':>8}{'Doğruluk':>10}"
+          f"{'ms (1)':>9}{'görüntü/sn':>12}")
+    for s in sorted(sonuclar, key=lambda s: s['gecikme_ms']):
+        print(f"{s['varyant']:<22}{s['img_size']:>6}{s['parametre_sayisi']:>12,}{s['boyut_kb']:>10.1f}"
+              f"{s['agirlikli_f1']:>8.4f}{s['dogruluk']:>10.4f}{s['gecikme_ms']:>9.2f}{s['verim_goruntu_sn']:>12.1f}")
+
+    uygun = [s for s in sonuclar if s['agirlikli_f1'] >= f1_esigi]
+    if uygun:
+        en_ucuz = min(uygun, key=lambda s: (s['gecikme_ms'], s['parametre_sayisi']))
+        print(f"\nF1 >= {f1_esigi} olan en hızlı varyant: {en_ucuz['varyant']} ({en_ucuz['model']})")
+        return en_ucuz['varyant']
+    print(f"\nF1 >= {f1_esigi} olan varyant yok")
+    return None
+
+
+def main():
+    from model_mimarisi import VARYANTLAR
+
+    parser = argparse.ArgumentParser(description="Küçük girdili / GAP / ayrılabilir konvolüsyonlu model varyantlarını karşılaştır")
+    parser.add_argument("--varyantlar", default=",".join(VARYANTLAR), help="Virgülle ayrılmış varyant adları")
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--f1-esigi", type=float, default=0.95, help="Dağıtım için gereken en düşük ağırlıklı F1")
+    parser.add_argument("--veri", default=DATASET_PATH)
+    parser.add_argument("--onbellek-dizini", default=ONBELLEK_DIZINI)
+    parser.add_argument("--dizin", default=VARYANT_DIZINI, help="Eğitilen modellerin kaydedileceği dizin")
+    parser.add_argument("--rapor", default=RAPOR_DOSYASI)
+    parser.add_argument("--egit", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.egit:
+        # Alt süreç: tek varyantı eğit ve sonucu JSON olarak yazdır
+        print(json.dumps(varyanti_egit(args.egit, args.dizin, args.onbellek_dizini, args.epochs, args.batch_size)))
+        return
+
+    adlar = [ad for ad in args.varyantlar.split(',') if ad]
+    for ad in adlar:
+        if ad not in VARYANTLAR:
+            parser.error(f"Bilinmeyen varyant: {ad} (seçenekler: {', '.join(VARYANTLAR)})")
+    os.makedirs(args.dizin, exist_ok=True)
+
+    # Her girdi boyutu bir kez çözülür; aynı boyuttaki varyantlar önbelleği paylaşır
+    import veri_onbellegi
+
+    for boyut in sorted({VARYANTLAR[ad]['img_size'] for ad in adlar}):
+        veri_onbellegi.onbellegi_olustur(args.veri, args.onbellek_dizini, boyut, boyut)
+
+    sonuclar = []
+    for ad in adlar:
+        print(f"\n=== {ad} ===", file=sys.stderr)
+        cikti = subprocess.run(
+            [sys.executable, __file__, "--egit", ad, "--dizin", args.dizin, "--onbellek-dizini", args.onbellek_dizini,
+             "--epochs", str(args.epochs), "--batch-size", str(args.batch_size)],
+            check=True, stdout=subprocess.PIPE, text=True
+        ).stdout
+        sonuclar.append(json.loads(cikti.strip().splitlines()[-1]))
+
+    secilen = rapor_yazdir(sonuclar, args.f1_esigi)
+    with open(args.rapor, 'w', encoding='utf-8') as f:
+        json.dump({'f1_esigi': args.f1_esigi, 'secilen': secilen, 'sonuclar': sonuclar}, f, ensure_ascii=False, indent=2)
+    print(f"Rapor kaydedildi: {args.rapor}")
+
+
+if __name__ == "__main__":
+    main()
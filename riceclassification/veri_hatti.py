@@ -0,0 +1,290 @@
+import os
+import re
+import glob
+import json
+import math
+import time
+import hashlib
+import numpy as np
+import tensorflow as tf
+import veri_onbellegi
+import olcum
+
+# Sabit değişkenler - model_egitimi.py ile aynı olmalı
+IMG_WIDTH = 150
+IMG_HEIGHT = 150
+DATASET_PATH = "Rice_Image_Dataset"
+
+# model_egitimi.py'deki ImageDataGenerator ile aynı artırma ayarları
+ROTATION_RANGE = 20  # derece
+WIDTH_SHIFT_RANGE = 0.1
+HEIGHT_SHIFT_RANGE = 0.1
+SHEAR_RANGE = 0.1  # derece (Keras shear_range birimi)
+ZOOM_RANGE = 0.1
+HORIZONTAL_FLIP = True
+
+KARISTIRMA_TAMPONU = 4096
+
+# Çözülmüş görüntüler varsayılan olarak diskte önbelleğe alınır (150x150'de eğitim bölümü ~4 GB uint8);
+# bellekte tutmak için onbellek="" verilir, önbelleği kapatmak için None
+DOSYA_ONBELLEGI = "dosya"
+
+
+def _goruntu_oku(yol, etiket, img_width, img_height, num_classes):
+    """Dosyayı oku, çöz ve load_img ile aynı şekilde (nearest) boyutlandır"""
+    veri = tf.io.read_file(yol)
+    img = tf.io.decode_image(veri, channels=3, expand_animations=False)
+    img = tf.image.resize(img, (img_height, img_width), method='nearest')
+    img.set_shape((img_height, img_width, 3))
+    return img, tf.one_hot(etiket, num_classes)
+
+
+# Süreç boyunca tutulan önbellek sahipliği kilitleri (yol -> açık dosya)
+_SAHIPLIKLER = {}
+
+
+def _sahiplen(yol):
+    """Dosyada özel kilit almayı dene; alınırsa süreç bitene (veya _birak çağrılana) kadar tutulur
+
+    Kilit işletim sistemi tarafından süreç ölünce bırakıldığı için, alınabiliyorsa
+    önbelleği yazan başka canlı bir süreç yoktur.
+    """
+    if yol in _SAHIPLIKLER:
+        return True
+    f = open(yol, 'a+')
+    try:
+        if os.name == 'nt':
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return False
+    _SAHIPLIKLER[yol] = f
+    return True
+
+
+def _birak(yol):
+    f = _SAHIPLIKLER.pop(yol, None)
+    if f is not None:
+        f.close()
+
+
+def _onbellek_dosyalari(on_ek):
+    """tf.data önbelleğinin on_ek ile başlayan dosyaları (.index, .data-*, _0.*, .lockfile, .sahip)"""
+    return glob.glob(glob.escape(on_ek) + ".*") + glob.glob(glob.escape(on_ek) + "_*")
+
+
+def _icerik_ozetleri(dataset_path, yollar, dizin):
+    """Dosyaların içerik özetlerini döndür; özetler dizindeki manifest'te saklanıp yeniden kullanılır"""
+    manifest_yolu = os.path.join(dizin, veri_onbellegi.MANIFEST_DOSYASI)
+    try:
+        with open(manifest_yolu, encoding='utf-8') as f:
+            eski = {k['yol']: k for k in json.load(f)['kayitlar']}
+    except (OSError, ValueError, KeyError):
+        eski = {}
+    kayitlar = veri_onbellegi.dosya_kayitlari(yollar, dataset_path, eski)
+    gecici = f"{manifest_yolu}.{os.getpid()}.tmp"
+    with open(gecici, 'w', encoding='utf-8') as f:
+        # Eğitim ve doğrulama bölümleri aynı manifest'i paylaşır; diğer bölümün kayıtları korunur
+        eski.update((k['yol'], k) for k in kayitlar)
+        json.dump({'kayitlar': list(eski.values())}, f, ensure_ascii=False)
+    os.replace(gecici, manifest_yolu)
+    return [k['sha1'] for k in kayitlar]
+
+
+def tfdata_onbellek_yolu(dataset_path, yollar, subset, img_width, img_height, validation_split, parca=None,
+                         seed=None, onbellek_dizini=veri_onbellegi.ONBELLEK_DIZINI):
+    """Dosya içerikleri, bölüm, boyut, parça ve seed'e özgü tf.data önbellek dosyasının yolunu döndür
+
+    Anahtar veri_onbellegi'ndeki gibi dosya içerik özetlerinden üretilir; aynı yolda değişen
+    bir görüntü yeni bir önbellek oluşturur. Aynı bölüm / parça için eski anahtarlı önbellekler
+    (onları kullanan canlı bir süreç yoksa) silinir. Önbellek başka bir canlı süreç tarafından
+    yazılıyorsa bu çalışma kendi önbelleğini kullanır.
+    """
+    dizin = os.path.join(veri_onbellegi.onbellek_yolu(onbellek_dizini, img_width, img_height), "tfdata")
+    os.makedirs(dizin, exist_ok=True)
+    ozet = hashlib.sha1()
+    for yol, icerik in zip(yollar, _icerik_ozetleri(dataset_path, yollar, dizin)):
+        ozet.update(f"{os.path.relpath(yol, dataset_path)}|{icerik}\n".encode('utf-8'))
+    ozet.update(f"{validation_split}|{parca}|{seed}".encode('utf-8'))
+    grup = f"{subset}_{'tam' if parca is None else f'{parca[1]}of{parca[0]}'}"
+    on_ek = os.path.join(dizin, f"{grup}_{ozet.hexdigest()[:12]}")
+
+    if _sahiplen(on_ek + ".sahip"):
+        # Sahibi olmayan kilit dosyası yarıda kesilmiş bir çalışmadan kalmıştır; kalırsa tf.data yazmayı reddeder
+        for kilit in glob.glob(glob.escape(on_ek) + "*.lockfile"):
+            os.remove(kilit)
+    elif glob.glob(glob.escape(on_ek) + "*.lockfile"):
+        # Başka bir süreç aynı önbelleği hâlâ yazıyor: bu çalışma kendi kopyasını kullanır
+        on_ek = f"{on_ek}-{os.getpid()}"
+        _sahiplen(on_ek + ".sahip")
+
+    # Aynı bölüm / parçanın eski anahtarlı (veya başka çalışmalara ait) önbellekleri silinir
+    desen = re.compile(re.escape(grup) + r"_[0-9a-f]{12}(-\d+)?")
+    eskiler = {m.group(0) for m in (desen.match(ad) for ad in os.listdir(dizin)) if m}
+    for ad in eskiler - {os.path.basename(on_ek)}:
+        eski = os.path.join(dizin, ad)
+        if not _sahiplen(eski + ".sahip"):
+            continue  # canlı bir süreç kullanıyor
+        _birak(eski + ".sahip")
+        for dosya in _onbellek_dosyalari(eski):
+            try:
+                os.remove(dosya)
+            except OSError:
+                pass
+    return on_ek
+
+
+def _matris(satirlar):
+    """[n] boyutlu tensör satırlarından [n, 3, 3] matris oluştur"""
+    return tf.stack([tf.stack(satir, axis=-1) for satir in satirlar], axis=1)
+
+
+def _donusum_matrisleri(n, img_width, img_height):
+    """Batch'teki her görüntü için rastgele afin dönüşüm (çıktı -> girdi koordinatı) üret"""
+    sifir = tf.zeros([n])
+    bir = tf.ones([n])
+
+    aci = tf.random.uniform([n], -ROTATION_RANGE, ROTATION_RANGE) * (math.pi / 180)
+    tx = tf.random.uniform([n], -WIDTH_SHIFT_RANGE, WIDTH_SHIFT_RANGE) * img_width
+    ty = tf.random.uniform([n], -HEIGHT_SHIFT_RANGE, HEIGHT_SHIFT_RANGE) * img_height
+    kayma = tf.random.uniform([n], -SHEAR_RANGE, SHEAR_RANGE) * (math.pi / 180)
+    zx = tf.random.uniform([n], 1 - ZOOM_RANGE, 1 + ZOOM_RANGE)
+    zy = tf.random.uniform([n], 1 - ZOOM_RANGE, 1 + ZOOM_RANGE)
+    if HORIZONTAL_FLIP:
+        cevir = tf.cast(tf.random.uniform([n]) < 0.5, tf.float32)
+    else:
+        cevir = sifir
+
+    cx = (img_width - 1) / 2
+    cy = (img_height - 1) / 2
+    merkezden = _matris([[bir, sifir, bir * cx], [sifir, bir, bir * cy], [sifir, sifir, bir]])
+    merkeze = _matris([[bir, sifir, -bir * cx], [sifir, bir, -bir * cy], [sifir, sifir, bir]])
+    dondurme = _matris([[tf.cos(aci), -tf.sin(aci), sifir], [tf.sin(aci), tf.cos(aci), sifir], [sifir, sifir, bir]])
+    kaydirma = _matris([[bir, sifir, tx], [sifir, bir, ty], [sifir, sifir, bir]])
+    egme = _matris([[bir, -tf.sin(kayma), sifir], [sifir, tf.cos(kayma), sifir], [sifir, sifir, bir]])
+    yakinlastirma = _matris([[zx, sifir, sifir], [sifir, zy, sifir], [sifir, sifir, bir]])
+    yansitma = _matris([[1 - 2 * cevir, sifir, cevir * (img_width - 1)], [sifir, bir, sifir], [sifir, sifir, bir]])
+
+    m = merkezden @ dondurme @ kaydirma @ egme @ yakinlastirma @ merkeze @ yansitma
+    return tf.reshape(m, [n, 9])[:, :8]
+
+
+def rastgele_artir(x):
+    """Döndürme, kaydırma, eğme, yakınlaştırma ve yatay çevirmeyi tek bir batch işlemiyle uygula"""
+    boyut = tf.shape(x)
+    donusumler = _donusum_matrisleri(boyut[0], tf.cast(boyut[2], tf.float32), tf.cast(boyut[1], tf.float32))
+    return tf.raw_ops.ImageProjectiveTransformV3(
+        images=x,
+        transforms=donusumler,
+        output_shape=boyut[1:3],
+        fill_value=0.0,
+        interpolation="BILINEAR",
+        fill_mode="NEAREST"
+    )
+
+
+def veri_seti_olustur(subset, batch_size, dataset_path=DATASET_PATH, validation_split=0.2,
+                      img_width=IMG_WIDTH, img_height=IMG_HEIGHT, artirma=None, shuffle=None,
+                      onbellek=DOSYA_ONBELLEGI, seed=None, parca=None):
+    """flow_from_directory ile aynı bölmeyi kullanan tf.data veri seti oluştur
+
+    parca: (parça sayısı, parça indeksi) verilirse dosyalar çözülmeden önce bölünür ve
+    yalnızca bu parçaya düşen örnekler okunur; tüm parçalarda aynı seed kullanılmalıdır.
+    onbellek: DOSYA_ONBELLEGI (veri_onbellegi dizininde dosya), "" (bellek), None (kapalı) veya dosya yolu.
+    """
+    egitim = subset == 'training'
+    artirma = egitim if artirma is None else artirma
+    shuffle = egitim if shuffle is None else shuffle
+
+    yollar, etiketler, sinif_isimleri = veri_onbellegi.veri_setini_listele(dataset_path)
+    indeksler = veri_onbellegi.bolum_indeksleri(etiketler, validation_split, subset)
+    ornek_sayisi = len(indeksler)
+    num_classes = len(sinif_isimleri)
+
+    ds = tf.data.Dataset.from_tensor_slices((np.array(yollar)[indeksler], etiketler[indeksler]))
+    if shuffle:
+        # Dosyalar sınıf sırasında listelendiği için çözmeden önce tamamı bir kez karıştırılır
+        ds = ds.shuffle(ornek_sayisi, seed=seed, reshuffle_each_iteration=False)
+    if parca is not None:
+        parca_sayisi, parca_indeksi = parca
+        ds = ds.shard(parca_sayisi, parca_indeksi)
+        ornek_sayisi = len(range(parca_indeksi, ornek_sayisi, parca_sayisi))
+    ds = ds.map(
+        lambda yol, etiket: _goruntu_oku(yol, etiket, img_width, img_height, num_classes),
+        num_parallel_calls=tf.data.AUTOTUNE,
+        deterministic=not shuffle
+    )
+    if onbellek == DOSYA_ONBELLEGI:
+        onbellek = tfdata_onbellek_yolu(dataset_path, [yollar[i] for i in indeksler], subset, img_width, img_height,
+                                        validation_split, parca, seed)
+    if onbellek is not None:
+        ds = ds.cache(onbellek)
+    if shuffle:
+        ds = ds.shuffle(min(ornek_sayisi, KARISTIRMA_TAMPONU), seed=seed)
+    ds = ds.batch(batch_size)
+
+    def hazirla(x, y):
+        x = tf.cast(x, tf.float32)
+        if artirma:
+            x = rastgele_artir(x)
+        return x * (1.0 / 255), y
+
+    ds = ds.map(hazirla, num_parallel_calls=tf.data.AUTOTUNE)
+    ds = ds.prefetch(tf.data.AUTOTUNE)
+    return ds, ornek_sayisi, sinif_isimleri
+
+
+class GoruntuHizi(tf.keras.callbacks.Callback):
+    """Her epoch sonunda eğitimde saniyede işlenen görüntü sayısını yazdır"""
+
+    def __init__(self, batch_size):
+        super().__init__()
+        self.batch_size = batch_size
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.baslangic = time.perf_counter()
+        self.epoch_baslangic = self.baslangic
+        self.bitis = self.baslangic
+        self.adim = 0
+
+    def on_train_batch_end(self, batch, logs=None):
+        self.adim += 1
+        self.bitis = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        sure = self.bitis - self.baslangic
+        if sure > 0:
+            # Epoch/saat doğrulama dahil toplam süreden hesaplanır
+            epoch_suresi = time.perf_counter() - self.epoch_baslangic
+            print(f"\nEpoch {epoch + 1}: {self.adim * self.batch_size / sure:.1f} görüntü/sn, "
+                  f"{3600 / epoch_suresi:.1f} epoch/saat")
+
+
+class AdimOlcer(tf.keras.callbacks.Callback):
+    """Ölçüm açıkken eğitim adımlarını, doğrulamayı ve epoch'ları iz dosyasına aralık olarak kaydet"""
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._epoch = time.perf_counter_ns()
+
+    def on_epoch_end(self, epoch, logs=None):
+        olcum.olay_ekle(f"epoch {epoch + 1}", self._epoch, time.perf_counter_ns(), "egitim")
+
+    def on_train_batch_begin(self, batch, logs=None):
+        self._adim = time.perf_counter_ns()
+
+    def on_train_batch_end(self, batch, logs=None):
+        # Veri hazır değilse adım beklemeyi de içerir; veri.batch aralıklarıyla karşılaştırılır
+        olcum.olay_ekle("egitim.adim", self._adim, time.perf_counter_ns(), "egitim")
+
+    def on_test_begin(self, logs=None):
+        self._dogrulama = time.perf_counter_ns()
+
+    def on_test_end(self, logs=None):
+        olcum.olay_ekle("dogrulama", self._dogrulama, time.perf_counter_ns(), "egitim")
@@ -0,0 +1,299 @@
+import os
+import json
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import tensorflow as tf
+from PIL import Image
+from onisleme import goruntu_dizisi, normalize
+from olcum import bolum
+
+# Sabit değişkenler - model_egitimi.py ile aynı olmalı
+IMG_WIDTH = 150
+IMG_HEIGHT = 150
+DATASET_PATH = "Rice_Image_Dataset"
+ONBELLEK_DIZINI = "veri_onbellegi"
+
+GORUNTU_DOSYASI = "goruntuler.npy"
+ETIKET_DOSYASI = "etiketler.npy"
+MANIFEST_DOSYASI = "manifest.json"
+MANIFEST_SURUMU = 1
+
+# flow_from_directory'nin kabul ettiği uzantılar
+GECERLI_UZANTILAR = ('.png', '.jpg', '.jpeg', '.bmp', '.ppm', '.tif', '.tiff')
+
+
+def veri_setini_listele(dataset_path=DATASET_PATH):
+    """Veri setindeki dosyaları flow_from_directory ile aynı sırada listele"""
+    sinif_isimleri = sorted(
+        d for d in os.listdir(dataset_path) if os.path.isdir(os.path.join(dataset_path, d))
+    )
+    yollar = []
+    etiketler = []
+    for etiket, sinif in enumerate(sinif_isimleri):
+        sinif_dizini = os.path.join(dataset_path, sinif)
+        for kok, _, dosyalar in sorted(os.walk(sinif_dizini), key=lambda x: x[0]):
+            for dosya in sorted(dosyalar):
+                if dosya.lower().endswith(GECERLI_UZANTILAR):
+                    yollar.append(os.path.join(kok, dosya))
+                    etiketler.append(etiket)
+    return yollar, np.array(etiketler, dtype=np.int32), sinif_isimleri
+
+
+def bolum_indeksleri(etiketler, validation_split, subset):
+    """ImageDataGenerator'ın validation_split bölmesini taklit eden indeksleri döndür"""
+    # Keras her sınıfın sıralı dosyalarının ilk %split kadarını doğrulamaya ayırır
+    indeksler = []
+    for etiket in np.unique(etiketler):
+        sinif_indeksleri = np.flatnonzero(etiketler == etiket)
+        sinir = int(validation_split * len(sinif_indeksleri))
+        if subset == 'validation':
+            indeksler.append(sinif_indeksleri[:sinir])
+        elif subset == 'training':
+            indeksler.append(sinif_indeksleri[sinir:])
+        else:
+            raise ValueError(f"Geçersiz subset: {subset}")
+    if not indeksler:
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate(indeksler)
+
+
+def onbellek_yolu(onbellek_dizini=ONBELLEK_DIZINI, img_width=IMG_WIDTH, img_height=IMG_HEIGHT):
+    """Belirli bir görüntü boyutu için önbellek dizinini döndür"""
+    return os.path.join(onbellek_dizini, f"{img_width}x{img_height}")
+
+
+def _dosya_ozeti(yol):
+    """Dosya içeriğinin SHA-1 özetini hesapla"""
+    ozet = hashlib.sha1()
+    with open(yol, 'rb') as f:
+        for parca in iter(lambda: f.read(1 << 20), b''):
+            ozet.update(parca)
+    return ozet.hexdigest()
+
+
+def _goruntu_coz(yol, img_width, img_height):
+    """Görüntüyü uygulama ve eğitimle aynı şekilde çözüp boyutlandır"""
+    with Image.open(yol) as img:
+        return goruntu_dizisi(img, img_width, img_height)
+
+
+def _manifest_oku(dizin, img_width, img_height):
+    """Uyumlu bir manifest varsa oku, yoksa None döndür"""
+    manifest_yolu = os.path.join(dizin, MANIFEST_DOSYASI)
+    if not (os.path.exists(manifest_yolu) and os.path.exists(os.path.join(dizin, GORUNTU_DOSYASI))):
+        return None
+    try:
+        with open(manifest_yolu, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('surum') != MANIFEST_SURUMU or manifest.get('boyut') != [img_width, img_height]:
+        return None
+    return manifest
+
+
+def _json_yaz(yol, veri):
+    """JSON dosyasını yarım kalmayacak şekilde yaz"""
+    gecici = yol + ".tmp"
+    with open(gecici, 'w', encoding='utf-8') as f:
+        json.dump(veri, f, ensure_ascii=False)
+    os.replace(gecici, yol)
+
+
+def dosya_kayitlari(yollar, dataset_path=DATASET_PATH, eski_kayitlar=None, workers=None):
+    """Her dosya için göreli yol, SHA-1 içerik özeti, boyut ve değişiklik zamanı kaydı döndür
+
+    eski_kayitlar (göreli yol -> kayıt) verilirse boyutu ve değişiklik zamanı aynı kalan
+    dosyalar yeniden okunmaz, eski özetleri kullanılır.
+    """
+    eski_kayitlar = eski_kayitlar or {}
+
+    def kontrol_et(yol):
+        st = os.stat(yol)
+        goreli = os.path.relpath(yol, dataset_path).replace(os.sep, '/')
+        onceki = eski_kayitlar.get(goreli)
+        if onceki and onceki['boyut'] == st.st_size and onceki['mtime_ns'] == st.st_mtime_ns:
+            ozet = onceki['sha1']
+        else:
+            ozet = _dosya_ozeti(yol)
+        return {'yol': goreli, 'sha1': ozet, 'boyut': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+    with ThreadPoolExecutor(workers) as havuz:
+        return list(havuz.map(kontrol_et, yollar))
+
+
+def onbellegi_olustur(dataset_path=DATASET_PATH, onbellek_dizini=ONBELLEK_DIZINI,
+                      img_width=IMG_WIDTH, img_height=IMG_HEIGHT, workers=None, verbose=1):
+    """Veri setini bir kez çözüp memmap önbelleğine yaz; yalnızca değişen dosyaları yeniden çöz"""
+    dizin = onbellek_yolu(onbellek_dizini, img_width, img_height)
+    os.makedirs(dizin, exist_ok=True)
+    goruntu_yolu = os.path.join(dizin, GORUNTU_DOSYASI)
+
+    yollar, etiketler, sinif_isimleri = veri_setini_listele(dataset_path)
+    n = len(yollar)
+
+    eski = _manifest_oku(dizin, img_width, img_height)
+    eski_kayitlar = {}
+    eski_ozetler = {}
+    if eski is not None:
+        for i, kayit in enumerate(eski['kayitlar']):
+            eski_kayitlar[kayit['yol']] = kayit
+            eski_ozetler.setdefault(kayit['sha1'], i)
+
+    # Boyut ve değişiklik zamanı aynıysa dosya yeniden okunmadan eski özet kullanılır
+    kayitlar = dosya_kayitlari(yollar, dataset_path, eski_kayitlar, workers)
+    for kayit, etiket in zip(kayitlar, etiketler):
+        kayit['etiket'] = int(etiket)
+
+    # Her görüntü için eski dizideki satırı bul (-1: yeniden çözülecek)
+    kaynak = np.array([eski_ozetler.get(k['sha1'], -1) for k in kayitlar], dtype=np.int64)
+    cozulecek = np.flatnonzero(kaynak < 0)
+    ayni_duzen = (
+        eski is not None
+        and len(eski['kayitlar']) == n
+        and all(k['yol'] == e['yol'] for k, e in zip(kayitlar, eski['kayitlar']))
+    )
+
+    if ayni_duzen:
+        # Dosya düzeni değişmediyse yalnızca değişen satırları yerinde güncelle
+        cozulecek = np.array(
+            [i for i, (k, e) in enumerate(zip(kayitlar, eski['kayitlar'])) if k['sha1'] != e['sha1']],
+            dtype=np.int64
+        )
+        hedef = np.load(goruntu_yolu, mmap_mode='r+') if len(cozulecek) else None
+        gecici_yol = None
+    else:
+        gecici_yol = goruntu_yolu + ".tmp"
+        hedef = np.lib.format.open_memmap(
+            gecici_yol, mode='w+', dtype=np.uint8, shape=(n, img_height, img_width, 3)
+        )
+        if eski is not None:
+            eski_goruntuler = np.load(goruntu_yolu, mmap_mode='r')
+            for i in np.flatnonzero(kaynak >= 0):
+                hedef[i] = eski_goruntuler[kaynak[i]]
+            del eski_goruntuler
+
+    if len(cozulecek):
+        def coz(i):
+            hedef[i] = _goruntu_coz(yollar[i], img_width, img_height)
+
+        with ThreadPoolExecutor(workers) as havuz:
+            list(havuz.map(coz, cozulecek))
+
+    if hedef is not None:
+        hedef.flush()
+        del hedef
+    if gecici_yol is not None:
+        os.replace(gecici_yol, goruntu_yolu)
+
+    np.save(os.path.join(dizin, ETIKET_DOSYASI), etiketler)
+    _json_yaz(os.path.join(dizin, MANIFEST_DOSYASI), {
+        'surum': MANIFEST_SURUMU,
+        'boyut': [img_width, img_height],
+        'sinif_isimleri': sinif_isimleri,
+        'kayitlar': kayitlar,
+    })
+
+    if verbose:
+        print(f"Önbellek: {n} görüntü, {len(cozulecek)} yeniden çözüldü, "
+              f"{n - len(cozulecek)} yeniden kullanıldı ({dizin})")
+    return dizin
+
+
+class OnbellekVeriSeti:
+    """Önbelleği salt okunur memmap olarak açar"""
+
+    def __init__(self, onbellek_dizini=ONBELLEK_DIZINI, img_width=IMG_WIDTH, img_height=IMG_HEIGHT):
+        self.dizin = onbellek_yolu(onbellek_dizini, img_width, img_height)
+        manifest = _manifest_oku(self.dizin, img_width, img_height)
+        if manifest is None:
+            raise FileNotFoundError(f"Geçerli önbellek bulunamadı: {self.dizin}")
+        self.manifest = manifest
+        self.goruntuler = np.load(os.path.join(self.dizin, GORUNTU_DOSYASI), mmap_mode='r')
+        self.etiketler = np.load(os.path.join(self.dizin, ETIKET_DOSYASI))
+        self.sinif_isimleri = manifest['sinif_isimleri']
+        self.class_indices = {sinif: i for i, sinif in enumerate(self.sinif_isimleri)}
+
+    def __len__(self):
+        return len(self.etiketler)
+
+    def bolum(self, subset, validation_split=0.2):
+        """Eğitim veya doğrulama bölümünün indekslerini döndür"""
+        return bolum_indeksleri(self.etiketler, validation_split, subset)
+
+    def sequence(self, subset, batch_size, validation_split=0.2, datagen=None, shuffle=True, seed=None):
+        """Bir bölüm için Keras Sequence oluştur"""
+        return OnbellekSequence(
+            self, self.bolum(subset, validation_split), batch_size,
+            datagen=datagen, shuffle=shuffle, seed=seed
+        )
+
+
+class OnbellekSequence(tf.keras.utils.Sequence):
+    """Memmap önbelleğinden batch üreten, DirectoryIterator ile uyumlu Sequence"""
+
+    def __init__(self, veri_seti, indeksler, batch_size, datagen=None, shuffle=True, seed=None):
+        self.goruntuler = veri_seti.goruntuler
+        self.etiketler = veri_seti.etiketler
+        self.class_indices = veri_seti.class_indices
+        self.num_classes = len(self.class_indices)
+        self.indeksler = np.sort(np.asarray(indeksler))
+        self.samples = len(self.indeksler)
+        self.batch_size = batch_size
+        self.datagen = datagen
+        self.shuffle = shuffle
+        self.rng = np.random.default_rng(seed)
+        self.sira = self.indeksler.copy()
+        self._sonraki = 0
+        if self.shuffle:
+            self.rng.shuffle(self.sira)
+
+    def __len__(self):
+        return (self.samples + self.batch_size - 1) // self.batch_size
+
+    def __getitem__(self, idx):
+        with bolum("veri.batch", "egitim"):
+            return self._batch(idx)
+
+    def _batch(self, idx):
+        secim = np.sort(self.sira[idx * self.batch_size:(idx + 1) * self.batch_size])
+        if secim[-1] - secim[0] == len(secim) - 1:
+            # Ardışık satırlar kopyalanmadan memmap üzerinden dilimlenir
+            ham = self.goruntuler[secim[0]:secim[-1] + 1]
+        else:
+            ham = self.goruntuler[secim]
+
+        x = normalize(ham)
+        if self.datagen is not None:
+            for i in range(len(x)):
+                x[i] = self.datagen.random_transform(x[i])
+
+        y = np.zeros((len(secim), self.num_classes), dtype=np.float32)
+        y[np.arange(len(secim)), self.etiketler[secim]] = 1.0
+        return x, y
+
+    def on_epoch_end(self):
+        if self.shuffle:
+            self.rng.shuffle(self.sira)
+
+    def reset(self):
+        self._sonraki = 0
+
+    def __next__(self):
+        batch = self[self._sonraki % len(self)]
+        self._sonraki += 1
+        return batch
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rice_Image_Dataset için memmap önbelleği oluştur")
+    parser.add_argument("--veri", default=DATASET_PATH, help="Veri seti dizini")
+    parser.add_argument("--dizin", default=ONBELLEK_DIZINI, help="Önbellek dizini")
+    parser.add_argument("--genislik", type=int, default=IMG_WIDTH)
+    parser.add_argument("--yukseklik", type=int, default=IMG_HEIGHT)
+    parser.add_argument("--is-parcacigi", type=int, default=None, help="Paralel çözme iş parçacığı sayısı")
+    args = parser.parse_args()
+
+    onbellegi_olustur(args.veri, args.dizin, args.genislik, args.yukseklik, workers=args.is_parcacigi)